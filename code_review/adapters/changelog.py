@@ -7,12 +7,17 @@ from code_review.schemas import SemanticVersion
 logger = logging.getLogger(__name__)
 
 
-def parse_changelog(changelog_file: Path, app_name: str, min_count: int = 2) -> list[SemanticVersion]:
+def parse_changelog(
+    changelog_file: Path, app_name: str, min_count: int = 2, content: str | None = None
+) -> list[SemanticVersion]:
     """Parses a markdown changelog and returns a list of dictionaries
     with the version and date for each entry.
 
     Args:
-        changelog_content (str): The content of the changelog file.
+        changelog_file (Path): Path of the changelog file. It is used as the source of the versions.
+        app_name (str): Name of the application.
+        min_count (int): Maximum number of versions to return.
+        content (str | None): Content of the changelog, e.g. read from git. If given the file is not read.
 
     Returns:
         list: A list of dictionaries, where each dictionary contains
@@ -20,12 +25,14 @@ def parse_changelog(changelog_file: Path, app_name: str, min_count: int = 2) ->
     """
     # Regex to find lines like "## [11.4.0] - 2025-08-28"
     # It captures the version string inside the brackets and the date
-    if not changelog_file.exists():
+    if content is not None:
+        changelog_content = content
+    elif not changelog_file.exists():
         logger.error("File %s does not exist", changelog_file)
         return []
-
-    with open(changelog_file, encoding="utf-8") as f:
-        changelog_content = f.read()
+    else:
+        with open(changelog_file, encoding="utf-8") as f:
+            changelog_content = f.read()
 
     pattern = re.compile(r"^##\s*\[(.*?)\]\s*-\s*(.*)$", re.MULTILINE)
 
@@ -6,7 +6,7 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 
-def setup_to_dict(file_path: Path, raise_error: bool = False) -> dict[str, Any]:
+def setup_to_dict(file_path: Path, raise_error: bool = False, content: str | None = None) -> dict[str, Any]:
     """Parses a .cfg file and extracts all sections and their key-value pairs
     into a nested dictionary.
 
@@ -14,19 +14,23 @@ def setup_to_dict(file_path: Path, raise_error: bool = False) -> dict[str, Any]:
         file_path (Path): The path to the .cfg file.
         raise_error (bool): Whether to raise an error if the file is not found.
                             Defaults to False.
+        content (str | None): Content of the file, e.g. read from git. If given the file is not read.
 
     Returns:
         Dict[str, Any]: A dictionary containing the parsed configuration.
                         Returns an empty dictionary if the file doesn't exist.
     """
-    if not file_path.exists():
+    if content is None and not file_path.exists():
         logger.error("File %s was not found.", file_path)
         if raise_error:
             raise FileNotFoundError(f"Error: The file '{file_path}' was not found.")
 
     config = configparser.ConfigParser()
     try:
-        config.read(file_path)
+        if content is None:
+            config.read(file_path)
+        else:
+            config.read_string(content, source=str(file_path))
     except configparser.MissingSectionHeaderError as e:
         raise ValueError(f"Error: The file '{file_path}' is not a valid INI-style file.") from e
 
@@ -23,6 +23,9 @@ DEFAULT_CONFIG = {
         "postgres": {"name": "postgres", "version": "16.10", "operating_system": "bookworm"},
     },
     "default_branches": ["master", "develop"],
+    "fetch_ttl_seconds": 120,
+    "lint_scope": "project",
+    "ruff_backend": "cli",
     "vetted_requirements": {
         "services": [
             {
@@ -541,6 +544,9 @@ class TomlConfigManager:
                         "max_lines_to_display",
                         self.config_data["max_lines_to_display"],
                     ),
+                    "fetch_ttl_seconds": app_settings.get("fetch_ttl_seconds", self.config_data["fetch_ttl_seconds"]),
+                    "lint_scope": app_settings.get("lint_scope", self.config_data["lint_scope"]),
+                    "ruff_backend": app_settings.get("ruff_backend", self.config_data["ruff_backend"]),
                     "docker_images": docker_images_dict,
                 }
             )
@@ -37,8 +37,43 @@ class RuleCategory(str, Enum):
     COMPLEXITY = "complexity"
     GENERAL = "general"
 
+class RuleResource(str, Enum):
+    """External resources a review rule may use while it runs."""
+
+    FILESYSTEM = "filesystem"
+    GIT = "git"
+    NETWORK = "network"
+    CONFIG = "config"
+
+
 class EnvironmentType(str, Enum):
     """Types of deployment environments."""
     DEVELOPMENT = "DEVELOPMENT"
     STAGING = "STAGING"
-    PRODUCTION = "PRODUCTION"
\ No newline at end of file
+    PRODUCTION = "PRODUCTION"
+
+
+class BranchSyncStatus(str, Enum):
+    """Outcome of syncing a local branch with its remote-tracking branch."""
+
+    UP_TO_DATE = "up-to-date"
+    UPDATED = "updated"
+    CREATED = "created"
+    AHEAD = "ahead"
+    DIVERGED = "diverged"
+    MISSING = "missing"
+    FAILED = "failed"
+
+
+class LintScope(str, Enum):
+    """Files linted and format-checked by a code review."""
+
+    PROJECT = "project"
+    CHANGED = "changed"
+
+
+class RuffBackend(str, Enum):
+    """How a batch review runs ruff check."""
+
+    CLI = "cli"
+    SERVER = "server"
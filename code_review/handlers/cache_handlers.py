@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def hash_key(*parts: object) -> str:
+    """Builds a stable cache key from JSON serializable parts.
+
+    Args:
+        *parts: Values that identify the cached item. Dictionaries are hashed with sorted keys.
+
+    Returns:
+        The SHA-256 hex digest of the parts.
+    """
+    content = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """A persistent cache that stores JSON values as files in a folder.
+
+    Reading an entry refreshes its modification time, so the least recently used entries are the first ones
+    removed when the cache grows beyond ``max_entries`` or ``max_size`` bytes. Evicting lists the whole folder,
+    so it only runs after ``evict_every`` writes or once a tenth of ``max_size`` has been written since the last
+    eviction, and the cache may briefly hold that much more than its limits.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        max_entries: int = 500,
+        max_size: int = 100 * 1024 * 1024,
+        evict_every: int | None = None,
+    ) -> None:
+        """Initializes the DiskCache.
+
+        Args:
+            folder: Folder where the entries are stored. It is created when the first entry is saved.
+            max_entries: Maximum number of entries to keep.
+            max_size: Maximum total size of the entries in bytes.
+            evict_every: Number of writes between evictions. Defaults to a tenth of max_entries.
+        """
+        self.folder = folder
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.evict_every = evict_every or max(1, max_entries // 10)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._written_size = 0
+
+    def _file(self, key: str) -> Path:
+        return self.folder / f"{key}.json"
+
+    def get(self, key: str) -> object | None:
+        """Returns the value stored for the key or None if there is no entry.
+
+        Args:
+            key: The cache key, usually built with `hash_key`.
+        """
+        file = self._file(key)
+        try:
+            with open(file, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", file, e)
+            file.unlink(missing_ok=True)
+            return None
+        return value
+
+    def set(self, key: str, value: object) -> None:
+        """Stores a JSON serializable value for the key and evicts old entries when an eviction is due.
+
+        Args:
+            key: The cache key, usually built with `hash_key`.
+            value: The value to store.
+        """
+        self.set_many({key: value})
+
+    def set_many(self, items: dict[str, object]) -> None:
+        """Stores several JSON serializable values and evicts old entries at most once, after all of them are written.
+
+        Args:
+            items: The values to store by cache key.
+        """
+        if not items:
+            return
+        self.folder.mkdir(parents=True, exist_ok=True)
+        written_size = sum(self._write(key, value) for key, value in items.items())
+        with self._lock:
+            self._writes += len(items)
+            self._written_size += written_size
+            eviction_due = self._writes >= self.evict_every or self._written_size >= self.max_size // 10
+        if eviction_due:
+            self.evict()
+
+    def _write(self, key: str, value: object) -> int:
+        # Write to a temporary file first so a concurrent reader never sees a partial entry.
+        file_descriptor, temp_name = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+                json.dump(value, f, default=str)
+                size = f.tell()
+            os.replace(temp_name, self._file(key))
+        except (OSError, TypeError) as e:
+            logger.error("Could not write cache entry %s: %s", key, e)
+            Path(temp_name).unlink(missing_ok=True)
+            return 0
+        return size
+
+    def delete(self, key: str) -> None:
+        """Removes the entry stored for the key, if any."""
+        self._file(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Removes every entry of the cache."""
+        for file in self.folder.glob("*.json"):
+            file.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the cache is within its limits."""
+        with self._lock:
+            self._writes = 0
+            self._written_size = 0
+            entries = []
+            for file in self.folder.glob("*.json"):
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, file))
+            entries.sort(key=lambda entry: entry[0])
+            total_size = sum(entry[1] for entry in entries)
+            while entries and (len(entries) > self.max_entries or total_size > self.max_size):
+                _, size, file = entries.pop(0)
+                file.unlink(missing_ok=True)
+                total_size -= size
+                logger.debug("Evicted cache entry %s", file)
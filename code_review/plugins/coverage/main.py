@@ -3,12 +3,14 @@ import re
 from pathlib import Path
 
 
-def get_minimum_coverage(file_path: Path, raise_error: bool = False) -> float:
+def get_minimum_coverage(file_path: Path, raise_error: bool = False, content: str | None = None) -> float:
     """Parses a Makefile from a given file path and extracts the value for the
     MINIMUM_COVERAGE variable.
 
     Args:
         file_path: A pathlib.Path object pointing to the Makefile.
+        raise_error: Raise a ValueError if MINIMUM_COVERAGE is not found.
+        content: Content of the Makefile, e.g. read from git. If given the file is not read.
 
     Returns:
         The float value of the MINIMUM_COVERAGE variable.
@@ -19,7 +21,7 @@ def get_minimum_coverage(file_path: Path, raise_error: bool = False) -> float:
     """
     try:
         # Read the entire content of the file
-        makefile_content = file_path.read_text()
+        makefile_content = file_path.read_text() if content is None else content
     except FileNotFoundError:
         raise FileNotFoundError(f"Makefile not found at path: {file_path}")
 
@@ -1,3 +1,4 @@
+import io
 import logging
 import re
 from pathlib import Path
@@ -11,18 +12,19 @@ from code_review.plugins.dependencies.pip.schemas import PackageRequirement
 logger = logging.getLogger(__name__)
 
 
-def parser_requirement_file(requirement_file: Path) -> str:
+def parser_requirement_file(requirement_file: Path, content: str | None = None) -> str:
     """Parses a pip requirements file and returns a list of requirement lines.
 
     Args:
         requirement_file (Path): The path to the requirements file.
+        content (str | None): Content of the requirements file, e.g. read from git. If given the file is not read.
 
     Returns:
         str: A string containing all non-comment, non-empty lines from the requirements file,
     """
     requirements = []
     try:
-        with requirement_file.open("r") as file:
+        with requirement_file.open("r") if content is None else io.StringIO(content) as file:
             for line_number, line in enumerate(file, 1):
                 stripped_line = line.strip()
                 if stripped_line and not stripped_line.startswith("#"):
@@ -1,5 +1,6 @@
 import logging
 import subprocess
+from importlib import metadata
 from pathlib import Path
 
 from code_review.plugins.dependencies.pip.adapters import parse_requirements, parser_requirement_file, get_environment
@@ -8,6 +9,15 @@ from code_review.plugins.dependencies.pip.schemas import PackageRequirement, Req
 logger = logging.getLogger(__name__)
 
 
+def get_pur_version() -> str | None:
+    """Returns the installed version of `pur`, or None if it is not installed."""
+    try:
+        return metadata.version("pur")
+    except metadata.PackageNotFoundError:
+        logger.error("Could not get the pur version. Is it installed?")
+        return None
+
+
 def find_requirements_to_update(folder: Path, level: str = "minor") -> list[RequirementInfo]:
     """Updates minor version dependencies in requirement files within a specified folder
     and returns a list of updated packages.
@@ -84,11 +94,27 @@ def get_requirements(folder: Path) -> list[PackageRequirement]:
         logger.error("Could not find requirements folder at %s", requirements_folder)
         return packages
     for req_file in requirements_folder.glob("*.txt"):
-        try:
-            requirement_content = parser_requirement_file(req_file)
-            environment = get_environment(req_file)
-            parsed_packages = parse_requirements(requirement_content, environment, req_file)
-            packages.extend(parsed_packages)
-        except Exception as e:  # noqa: BLE001
-            logger.error("An unexpected error occurred: %s", e)
+        packages.extend(_parse_requirement_file(req_file))
     return packages
+
+
+def get_requirements_from_contents(contents: dict[Path, str]) -> list[PackageRequirement]:
+    """Parses requirement files whose contents were already read, e.g. from git.
+
+    Args:
+        contents: Content of each requirements file by its path.
+    """
+    packages = []
+    for req_file, content in contents.items():
+        packages.extend(_parse_requirement_file(req_file, content))
+    return packages
+
+
+def _parse_requirement_file(req_file: Path, content: str | None = None) -> list[PackageRequirement]:
+    try:
+        requirement_content = parser_requirement_file(req_file, content=content)
+        environment = get_environment(req_file)
+        return parse_requirements(requirement_content, environment, req_file)
+    except Exception as e:  # noqa: BLE001
+        logger.error("An unexpected error occurred: %s", e)
+        return []
@@ -30,18 +30,22 @@ def get_image_info_from_dockerfile_content(
     return None
 
 
-def parse_dockerfile(dockerfile_path: Path, raise_error: bool = False) -> DockerfileSchema | None:
+def parse_dockerfile(
+    dockerfile_path: Path, raise_error: bool = False, content: str | None = None
+) -> DockerfileSchema | None:
     """Reads a Dockerfile and extracts version information.
 
     Args:
         dockerfile_path (Path): The file path to the Dockerfile.
         raise_error (bool, optional): Whether to raise an exception when parsing errors.
+        content (str | None, optional): Content of the Dockerfile, e.g. read from git. If given the file is not read.
 
     Returns:
         DockerfileSchema: Dockerfile schema with extracted version information.
     """
     try:
-        content = dockerfile_path.read_text()
+        if content is None:
+            content = dockerfile_path.read_text()
         version_info = {"file": dockerfile_path}
         docker_image_schema = get_image_info_from_dockerfile_content(content, parsers=content_to_image_adapters)
         if docker_image_schema:
@@ -65,3 +69,19 @@ def parse_dockerfile(dockerfile_path: Path, raise_error: bool = False) -> Docker
         if raise_error:
             raise e
         return None
+
+
+def apply_expected_image(dockerfile: DockerfileSchema) -> DockerfileSchema:
+    """Sets the expected image of an already parsed Dockerfile from the current configuration.
+
+    Args:
+        dockerfile: The parsed Dockerfile schema. It is updated in place.
+
+    Returns:
+        The same Dockerfile schema.
+    """
+    images = CURRENT_CONFIGURATION.get("docker_images", {})
+    image = images.get(dockerfile.product, None)
+    dockerfile.expected_version = image.version if image else None
+    dockerfile.expected_image = image
+    return dockerfile
@@ -4,6 +4,8 @@ import subprocess
 from datetime import datetime
 
 from code_review.exceptions import CodeReviewError
+from code_review.plugins.git.object_store import get_object_store
+from code_review.plugins.git.runner import GIT_RUNNER
 from code_review.schemas import BranchSchema
 
 logger = logging.getLogger(__name__)
@@ -86,17 +88,22 @@ def is_rebased(target_branch_name: str, source_branch_name: str) -> bool:
             f"To check if a branch is rebased, both target and source branch names must be provided."
             f" Got target: {target_branch_name}, source: {source_branch_name}"
         )
+    store = get_object_store()
+    if store is not None:
+        target_hash = store.resolve(f"{target_branch_name}^{{commit}}")
+        source_hash = store.resolve(f"{source_branch_name}^{{commit}}")
+        merge_base_hash = store.merge_base(target_hash, source_hash) if target_hash and source_hash else None
+        if merge_base_hash:
+            return merge_base_hash == source_hash
     try:
         # Get the commit hash of the merge base between the two branches.
         # This is the most recent common ancestor.
-        merge_base_cmd = ["git", "merge-base", target_branch_name, source_branch_name]
-        merge_base_result = subprocess.run(merge_base_cmd, capture_output=True, text=True, check=True)
+        merge_base_cmd = ["merge-base", target_branch_name, source_branch_name]
+        merge_base_result = GIT_RUNNER.run(merge_base_cmd, check=True)
         merge_base_hash = merge_base_result.stdout.strip()
 
         # Get the commit hash of the head of the base branch.
-        base_branch_head_result = subprocess.run(
-            ["git", "rev-parse", source_branch_name], capture_output=True, text=True, check=True
-        )
+        base_branch_head_result = GIT_RUNNER.run(["rev-parse", source_branch_name], check=True)
         base_branch_head_hash = base_branch_head_result.stdout.strip()
 
         # The branch is considered rebased if the merge base is the same as
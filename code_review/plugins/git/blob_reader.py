@@ -0,0 +1,188 @@
+import logging
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Self
+
+from code_review.exceptions import SimpleGitToolError
+from code_review.plugins.git.object_store import GitObjectStore, get_object_store
+
+logger = logging.getLogger(__name__)
+
+
+class CatFileReader:
+    """Reads file contents at any revision from a long-lived `git cat-file --batch` process.
+
+    Requests are pipelined: a batch of '<rev>:<path>' names is written to the process while the answers are
+    read, so reading many files costs a single process spawn and no checkout. Blobs are kept in a cache bounded
+    by ``max_cache_size`` bytes and shared between revisions that have the same file content.
+
+    When the repository can be read by the in-process object store, files are read from it and the git process
+    is only started for revisions the store cannot resolve.
+
+    The mapping from '<rev>:<path>' to blobs is kept for the life of the reader, so a reader should not outlive
+    the review it is used for.
+    """
+
+    def __init__(
+        self, cwd: Path | None = None, max_cache_size: int = 32 * 1024 * 1024, use_object_store: bool = True
+    ) -> None:
+        """Initializes the CatFileReader.
+
+        Args:
+            cwd: Folder of the repository. Defaults to the current working directory.
+            max_cache_size: Maximum total size in bytes of the cached blobs.
+            use_object_store: Whether to read objects in process before falling back to `git cat-file`.
+        """
+        self.cwd = cwd
+        self.max_cache_size = max_cache_size
+        self.use_object_store = use_object_store
+        self._process: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+        self._object_names: dict[str, str | None] = {}
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._cache_size = 0
+
+    def __enter__(self) -> Self:
+        """Returns the reader. The git process starts on the first read."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Stops the git process."""
+        self.close()
+
+    def _start(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            try:
+                self._process = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    cwd=self.cwd,
+                )
+            except FileNotFoundError as e:
+                raise SimpleGitToolError("Git is not installed or not in the system's PATH.") from e
+        return self._process
+
+    def close(self) -> None:
+        """Stops the git process. The reader starts a new one if it is used again."""
+        with self._lock:
+            if self._process is not None:
+                self._process.stdin.close()
+                self._process.wait()
+                self._process.stdout.close()
+                self._process = None
+
+    def _cache_blob(self, object_name: str, content: bytes) -> None:
+        if len(content) > self.max_cache_size:
+            return
+        self._blobs[object_name] = content
+        self._cache_size += len(content)
+        while self._cache_size > self.max_cache_size:
+            _, evicted = self._blobs.popitem(last=False)
+            self._cache_size -= len(evicted)
+
+    def _get_cached(self, name: str) -> tuple[bool, bytes | None]:
+        if name not in self._object_names:
+            return False, None
+        object_name = self._object_names[name]
+        if object_name is None:
+            return True, None
+        content = self._blobs.get(object_name)
+        if content is None:
+            return False, None
+        self._blobs.move_to_end(object_name)
+        return True, content
+
+    @staticmethod
+    def _write_requests(stdin: IO[bytes], names: list[str]) -> None:
+        stdin.write("".join(f"{name}\n" for name in names).encode("utf-8"))
+        stdin.flush()
+
+    def read_blobs(self, requests: list[tuple[str, str]]) -> list[bytes | None]:
+        """Reads several files in one pipelined round trip.
+
+        Args:
+            requests: Pairs of revision and path relative to the root of the repository.
+
+        Returns:
+            The content of each file in the order of the requests, or None for files that do not exist at the
+            revision or are not regular files.
+        """
+        names = [f"{rev}:{path}" for rev, path in requests]
+        with self._lock:
+            contents: dict[str, bytes | None] = {}
+            missing = []
+            for name in dict.fromkeys(names):
+                found, content = self._get_cached(name)
+                if found:
+                    contents[name] = content
+                else:
+                    missing.append(name)
+
+            store = get_object_store(self.cwd) if self.use_object_store and missing else None
+            if store is not None:
+                missing = [name for name in missing if not self._read_from_store(store, name, contents)]
+
+            if missing:
+                process = self._start()
+                # Write from another thread so a large answer cannot block git while requests are still pending.
+                writer = threading.Thread(target=self._write_requests, args=(process.stdin, missing))
+                writer.start()
+                try:
+                    for name in missing:
+                        contents[name] = self._read_answer(process.stdout, name)
+                finally:
+                    writer.join()
+        return [contents[name] for name in names]
+
+    def _read_from_store(self, store: GitObjectStore, name: str, contents: dict[str, bytes | None]) -> bool:
+        rev, path = name.split(":", 1)
+        if store.resolve(f"{rev}^{{tree}}") is None:
+            return False
+        entry = store.lookup_path(rev, path)
+        obj = store.read_object(entry[1]) if entry else None
+        if obj is None or obj[0] != "blob":
+            self._object_names[name] = None
+            contents[name] = None
+            return True
+        self._object_names[name] = entry[1]
+        self._cache_blob(entry[1], obj[1])
+        contents[name] = obj[1]
+        return True
+
+    def _read_answer(self, stdout: IO[bytes], name: str) -> bytes | None:
+        header = stdout.readline().decode("utf-8").split()
+        if not header:
+            raise SimpleGitToolError(f"git cat-file stopped while reading '{name}'")
+        if header[-1] in {"missing", "ambiguous"}:
+            self._object_names[name] = None
+            return None
+        object_name, object_type, size = header
+        content = stdout.read(int(size))
+        stdout.read(1)  # Trailing newline
+        if object_type != "blob":
+            self._object_names[name] = None
+            return None
+        self._object_names[name] = object_name
+        self._cache_blob(object_name, content)
+        return content
+
+    def read_blob(self, rev: str, path: str) -> bytes | None:
+        """Reads a file at a revision.
+
+        Args:
+            rev: Branch, remote-tracking ref or commit.
+            path: Path relative to the root of the repository.
+
+        Returns:
+            The content of the file or None if it does not exist at the revision.
+        """
+        return self.read_blobs([(rev, path)])[0]
+
+    def read_text(self, rev: str, path: str) -> str | None:
+        """Reads a text file at a revision. See `read_blob`."""
+        content = self.read_blob(rev, path)
+        return content.decode("utf-8", errors="replace") if content is not None else None
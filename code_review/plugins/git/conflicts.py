@@ -0,0 +1,158 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from code_review.exceptions import SimpleGitToolError
+from code_review.handlers.cache_handlers import DiskCache, hash_key
+from code_review.plugins.git.adapters import get_git_flow_source_branch
+from code_review.plugins.git.handlers import (
+    _compare_versions,
+    _get_commit_hashes,
+    _get_git_version,
+    resolve_branch_ref,
+)
+from code_review.plugins.git.runner import GIT_RUNNER
+from code_review.plugins.git.schemas import MergeConflictSchema
+from code_review.schemas import BranchSchema
+from code_review.settings import CACHE_FOLDER
+
+logger = logging.getLogger(__name__)
+
+# git merge-tree --write-tree, which merges without a working tree, was added in git 2.38.
+MERGE_TREE_GIT_VERSION = "2.38.0"
+
+# Predictions only depend on the two commits, so they are cached by their hashes.
+CONFLICT_CACHE = DiskCache(CACHE_FOLDER / "conflicts", max_entries=5000, max_size=20 * 1024 * 1024)
+
+
+def _parse_merge_tree_output(output: str) -> list[tuple[bool, list[str]]]:
+    """Parses the output of `git merge-tree --write-tree --stdin -z --name-only --no-messages`.
+
+    Each merge is written as its status (1 if clean), the hash of the merged tree and the conflicted files, followed
+    by an empty field.
+
+    Returns:
+        Whether each merge has conflicts and the conflicted files.
+    """
+    results = []
+    for record in output.split("\0\0"):
+        if not record:
+            continue
+        status, _, *files = record.split("\0")
+        results.append((status != "1", files))
+    return results
+
+
+def _merge_tree(pairs: list[tuple[str, str]]) -> list[tuple[bool, list[str]] | None]:
+    """Merges pairs of commits in one `git merge-tree --stdin` process, without touching the working tree.
+
+    Args:
+        pairs: Hashes of the base and branch commits.
+
+    Returns:
+        Whether each merge has conflicts and the conflicted files, or None if it could not be made.
+    """
+    result = GIT_RUNNER.run(
+        ["merge-tree", "--write-tree", "--stdin", "-z", "--name-only", "--no-messages"],
+        input="".join(f"{base_hash} {branch_hash}\n" for base_hash, branch_hash in pairs),
+    )
+    merges = _parse_merge_tree_output(result.stdout) if result.returncode == 0 else []
+    if len(merges) == len(pairs):
+        return merges
+    if len(pairs) == 1:
+        logger.warning("Could not merge %s into %s: %s", pairs[0][1], pairs[0][0], result.stderr.strip())
+        return [None]
+    # One merge failed (e.g. unrelated histories) and stopped the batch, so the merges are made one by one.
+    return [merge for pair in pairs for merge in _merge_tree([pair])]
+
+
+def predict_conflicts(
+    pairs: list[tuple[str, str]], max_workers: int = 4, use_cache: bool = True
+) -> list[MergeConflictSchema]:
+    """Predicts which branches would have conflicts if they were merged into their base branches.
+
+    Merges are made with `git merge-tree --write-tree`, which does not touch the working tree. Uncached merges are
+    split between up to ``max_workers`` git processes that run at the same time.
+
+    Args:
+        pairs: Refs of the branch and of the base branch to merge it into.
+        max_workers: Number of git processes that run at the same time.
+        use_cache: Whether to read and write the conflict cache.
+
+    Returns:
+        The prediction of each pair, in the order of the pairs.
+
+    Raises:
+        SimpleGitToolError: If the installed git is older than 2.38.
+    """
+    if not _compare_versions(_get_git_version(), MERGE_TREE_GIT_VERSION):
+        raise SimpleGitToolError(f"Predicting conflicts requires git {MERGE_TREE_GIT_VERSION} or newer.")
+
+    hashes = _get_commit_hashes([ref for pair in pairs for ref in pair])
+    predictions = []
+    pending = []
+    for branch, base in pairs:
+        prediction = MergeConflictSchema(
+            branch=branch, base=base, branch_hash=hashes.get(branch, ""), base_hash=hashes.get(base, "")
+        )
+        predictions.append(prediction)
+        if not prediction.branch_hash or not prediction.base_hash:
+            prediction.error = f"Could not find '{branch if not prediction.branch_hash else base}'"
+            continue
+        cached = CONFLICT_CACHE.get(_get_cache_key(prediction)) if use_cache else None
+        if cached is not None:
+            prediction.has_conflicts = cached["has_conflicts"]
+            prediction.conflicted_files = cached["conflicted_files"]
+        else:
+            pending.append(prediction)
+
+    if pending:
+        workers = max(1, min(max_workers, len(pending)))
+        chunks = [pending[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            merges = executor.map(
+                _merge_tree, [[(item.base_hash, item.branch_hash) for item in chunk] for chunk in chunks]
+            )
+            for chunk, chunk_merges in zip(chunks, merges, strict=True):
+                for prediction, merge in zip(chunk, chunk_merges, strict=True):
+                    _set_prediction(prediction, merge, use_cache)
+    return predictions
+
+
+def _get_cache_key(prediction: MergeConflictSchema) -> str:
+    return hash_key({"branch": prediction.branch_hash, "base": prediction.base_hash})
+
+
+def _set_prediction(prediction: MergeConflictSchema, merge: tuple[bool, list[str]] | None, use_cache: bool) -> None:
+    if merge is None:
+        prediction.error = f"Could not merge '{prediction.branch}' into '{prediction.base}'"
+        return
+    prediction.has_conflicts, prediction.conflicted_files = merge
+    if use_cache:
+        CONFLICT_CACHE.set(
+            _get_cache_key(prediction),
+            {"has_conflicts": prediction.has_conflicts, "conflicted_files": prediction.conflicted_files},
+        )
+
+
+def predict_branch_conflicts(
+    branches: list[BranchSchema], max_workers: int = 4, use_cache: bool = True
+) -> list[MergeConflictSchema]:
+    """Predicts conflicts of branches with their git flow source branches, e.g. 'develop' for feature branches.
+
+    Branches that do not follow the git flow naming are left out.
+
+    Args:
+        branches: Branches from `list_branches`.
+        max_workers: Number of git processes that run at the same time.
+        use_cache: Whether to read and write the conflict cache.
+    """
+    sources = {}
+    pairs = []
+    for branch in branches:
+        source = get_git_flow_source_branch(branch.name)
+        if source is None:
+            continue
+        if source not in sources:
+            sources[source] = resolve_branch_ref(source)
+        pairs.append((branch.ref or resolve_branch_ref(branch.name), sources[source]))
+    return predict_conflicts(pairs, max_workers=max_workers, use_cache=use_cache) if pairs else []
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import subprocess
+import time
+from pathlib import Path
+
+from code_review.exceptions import SimpleGitToolError
+from code_review.plugins.git.object_store import find_git_dirs
+from code_review.plugins.git.runner import GIT_RUNNER
+from code_review.settings import CURRENT_CONFIGURATION
+
+logger = logging.getLogger(__name__)
+
+# Stored in the common git directory so every worktree and every run of the tool shares it.
+FETCH_STATE_FILE = "code_review_fetch.json"
+
+
+class FetchCoordinator:
+    """Fetches from remotes at most once per freshness window.
+
+    The time of the last fetch of each remote, and of each branch fetched on its own, is kept in the repository's
+    git directory. A fetch requested again within ``ttl`` seconds, in the same run or in a later one, is skipped.
+    A full fetch also counts as a fresh fetch of every branch.
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        """Initializes the FetchCoordinator.
+
+        Args:
+            ttl: Seconds a fetch stays fresh. Defaults to the 'fetch_ttl_seconds' setting.
+        """
+        self.ttl = CURRENT_CONFIGURATION.get("fetch_ttl_seconds", 120) if ttl is None else ttl
+        self.fetched = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _get_state_file(cwd: Path | None) -> Path | None:
+        git_dirs = find_git_dirs(Path(cwd or os.getcwd()).resolve())
+        return git_dirs[1] / FETCH_STATE_FILE if git_dirs else None
+
+    @staticmethod
+    def _load_state(state_file: Path | None) -> dict:
+        if state_file is None or not state_file.exists():
+            return {}
+        try:
+            return json.loads(state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable fetch state %s: %s", state_file, e)
+            return {}
+
+    @staticmethod
+    def _save_state(state_file: Path | None, state: dict) -> None:
+        if state_file is None:
+            return
+        temporary_file = state_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            temporary_file.write_text(json.dumps(state), encoding="utf-8")
+            temporary_file.replace(state_file)
+        except OSError as e:
+            logger.debug("Could not save the fetch state %s: %s", state_file, e)
+
+    def is_fresh(self, remote: str = "origin", branches: list[str] | None = None, cwd: Path | None = None) -> bool:
+        """Checks if a fetch of the remote, or of some of its branches, was made within the freshness window.
+
+        Args:
+            remote: Name of the remote.
+            branches: Branches to check. If not given, only a full fetch of the remote counts.
+            cwd: Folder of the repository. Defaults to the current working directory.
+        """
+        remote_state = self._load_state(self._get_state_file(cwd)).get(remote, {})
+        now = time.time()
+        if now - remote_state.get("all", 0) < self.ttl:
+            return True
+        if not branches:
+            return False
+        fetched_branches = remote_state.get("branches", {})
+        return all(now - fetched_branches.get(branch, 0) < self.ttl for branch in branches)
+
+    def fetch(
+        self,
+        remote: str = "origin",
+        branches: list[str] | None = None,
+        force: bool = False,
+        cwd: Path | None = None,
+    ) -> bool:
+        """Fetches from a remote with --prune unless it was fetched within the freshness window.
+
+        Args:
+            remote: Name of the remote.
+            branches: If given, only these branches are fetched into their remote-tracking refs, e.g. the
+                configured default branches plus the branch being reviewed. A full fetch is made if one of them
+                does not exist in the remote.
+            force: Fetch even if the last fetch is still fresh.
+            cwd: Folder of the repository. Defaults to the current working directory.
+
+        Returns:
+            True if git fetch ran, False if it was skipped.
+
+        Raises:
+            SimpleGitToolError: If the fetch fails.
+        """
+        branches = list(dict.fromkeys(branches)) if branches else None
+        if not force and self.is_fresh(remote, branches, cwd):
+            self.skipped += 1
+            logger.info("Skipping fetch from '%s': fetched less than %s seconds ago", remote, self.ttl)
+            return False
+
+        started = time.time()
+        fetched_all = branches is None
+        if branches:
+            refspecs = [f"+refs/heads/{branch}:refs/remotes/{remote}/{branch}" for branch in branches]
+            result = GIT_RUNNER.run(["fetch", "--prune", remote, *refspecs], cwd=cwd)
+            if result.returncode != 0:
+                logger.debug("Fetching %s from '%s' failed, fetching everything: %s", branches, remote, result.stderr)
+                fetched_all = True
+        if fetched_all:
+            try:
+                GIT_RUNNER.run(["fetch", "--prune", remote], check=True, cwd=cwd)
+            except subprocess.CalledProcessError as e:
+                raise SimpleGitToolError(f"Could not refresh from remote '{remote}'") from e
+        self.fetched += 1
+        logger.info("Fetched from '%s' in %.1f seconds", remote, time.time() - started)
+
+        state_file = self._get_state_file(cwd)
+        state = self._load_state(state_file)
+        remote_state = state.setdefault(remote, {})
+        if fetched_all:
+            remote_state["all"] = started
+        else:
+            remote_state.setdefault("branches", {}).update(dict.fromkeys(branches, started))
+        self._save_state(state_file, state)
+        return True
+
+
+FETCH_COORDINATOR = FetchCoordinator()
@@ -1,13 +1,24 @@
+import functools
 import json
 import logging
 import re
+import shutil
 import subprocess
-from typing import Any
-
-from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn, TimeElapsedColumn
-
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Self
+
+from code_review.enums import BranchSyncStatus
 from code_review.exceptions import SimpleGitToolError
-from code_review.plugins.git.adapters import parse_git_date
+from code_review.plugins.git.adapters import get_git_flow_source_branch, parse_git_date
+from code_review.plugins.git.fetch import FETCH_COORDINATOR
+from code_review.plugins.git.history import count_ahead_behind
+from code_review.plugins.git.object_store import get_object_store
+from code_review.plugins.git.reachability import REACHABILITY_INDEX
+from code_review.plugins.git.runner import GIT_RUNNER
 from code_review.schemas import BranchSchema
 from code_review.settings import CLI_CONSOLE
 
@@ -22,12 +33,7 @@ def _are_there_uncommited_changes() -> bool:
     """
     try:
         # Run the git log command to check for commits
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        result = GIT_RUNNER.run(["status", "--porcelain"], check=True)
         # If the output is not empty, there are committed changes
         return bool(result.stdout.strip())
     except subprocess.CalledProcessError:
@@ -46,7 +52,7 @@ def _get_git_version() -> str:
     """
     try:
         # Run the git --version command and capture its output
-        result = subprocess.run(["git", "--version"], capture_output=True, text=True, check=True)
+        result = GIT_RUNNER.run(["--version"], check=True)
         # The output is typically "git version X.Y.Z", so we split to get the version number
         return result.stdout.strip().split()[-1]
     except FileNotFoundError:
@@ -80,15 +86,10 @@ def _compare_versions(current_version: str, min_version: str) -> bool:
     return tuple(current_parts) >= tuple(min_parts)
 
 
-def _get_latest_tag() -> str:
+def _get_latest_tag(ref: str = "HEAD") -> str:
     latest_tag = "No tags found"
     try:
-        result = subprocess.run(
-            ["git", "describe", "--tags", "--abbrev=0"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        result = GIT_RUNNER.run(["describe", "--tags", "--abbrev=0", ref], check=True)
         latest_tag = result.stdout.strip()
         # console.print(f"Latest tag: [bold cyan]{latest_tag}[/bold cyan]")
 
@@ -111,19 +112,10 @@ def get_current_git_branch() -> str:
     """
     try:
         # Check if we are inside a git repository
-        subprocess.run(["git", "rev-parse", "--is-inside-work-tree"], check=True, capture_output=True, text=True)
+        GIT_RUNNER.run(["rev-parse", "--is-inside-work-tree"], check=True)
 
         # Get the branch name
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            check=True,
-            capture_output=True,
-            text=True,
-            # The shell=True argument can be a security risk if the command
-            # string comes from untrusted user input, but here it's
-            # a hardcoded command so it's safe.
-            shell=False,
-        )
+        result = GIT_RUNNER.run(["rev-parse", "--abbrev-ref", "HEAD"], check=True)
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
         print(f"An error occurred: {e}")
@@ -139,25 +131,13 @@ def get_branch_info(branch_name: str) -> str:
     try:
         # Step 1: Check if the branch exists and get its latest commit hash.
         # `check=True` will raise an exception if the command fails (e.g., branch not found).
-        # `capture_output=True` captures stdout and stderr.
-        # `text=True` decodes the output as a string.
-        commit_hash_result = subprocess.run(
-            ["git", "rev-parse", branch_name],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        commit_hash_result = GIT_RUNNER.run(["rev-parse", branch_name], check=True)
         commit_hash = commit_hash_result.stdout.strip()
 
         # Step 2: Get the author of the commit.
         # The `--pretty=format:'%an'` flag formats the output to just the author's name.
         formatting = '{"hash": "%h", "author": "%an", "email": "%ce", "date": "%ad"}'
-        author_result = subprocess.run(
-            ["git", "log", "-1", f"--pretty=format:{formatting}", commit_hash],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        author_result = GIT_RUNNER.run(["log", "-1", f"--pretty=format:{formatting}", commit_hash], check=True)
         return author_result.stdout.strip()
 
     except subprocess.CalledProcessError as e:
@@ -190,24 +170,12 @@ def get_author(branch_name: str) -> str:
     try:
         # Step 1: Check if the branch exists and get its latest commit hash.
         # `check=True` will raise an exception if the command fails (e.g., branch not found).
-        # `capture_output=True` captures stdout and stderr.
-        # `text=True` decodes the output as a string.
-        commit_hash_result = subprocess.run(
-            ["git", "rev-parse", branch_name],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        commit_hash_result = GIT_RUNNER.run(["rev-parse", branch_name], check=True)
         commit_hash = commit_hash_result.stdout.strip()
 
         # Step 2: Get the author of the commit.
         # The `--pretty=format:'%an'` flag formats the output to just the author's name.
-        author_result = subprocess.run(
-            ["git", "log", "-1", "--pretty=format:%an", commit_hash],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        author_result = GIT_RUNNER.run(["log", "-1", "--pretty=format:%an", commit_hash], check=True)
         return author_result.stdout.strip()
 
     except subprocess.CalledProcessError as e:
@@ -220,62 +188,597 @@ def get_author(branch_name: str) -> str:
 
 
 def check_out_and_pull(branch: str, check: bool = True) -> None:
-    subprocess.run(["git", "checkout", branch], check=check, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    subprocess.run(["git", "pull", "origin", branch], check=check, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    GIT_RUNNER.run(["checkout", branch], check=check)
+    GIT_RUNNER.run(["pull", "origin", branch], check=check)
+
+
+def resolve_branch_ref(branch_name: str, remote: str = "origin") -> str:
+    """Resolves a branch name to the freshest ref available for it.
+
+    The remote-tracking ref (e.g. ``origin/master``) is preferred because it is updated by a fetch without having
+    to check out and pull the local branch. The local branch name is returned when no remote-tracking ref exists.
+
+    Args:
+        branch_name: Name of the branch (e.g. 'master' or 'feature/my-branch').
+        remote: Name of the remote to look for the remote-tracking ref.
+
+    Returns:
+        The ref that should be used to read the branch.
+    """
+    if branch_name.startswith(f"{remote}/"):
+        return branch_name
+    store = get_object_store()
+    if store is not None:
+        return f"{remote}/{branch_name}" if store.read_ref(f"refs/remotes/{remote}/{branch_name}") else branch_name
+    result = GIT_RUNNER.run(["rev-parse", "--verify", "--quiet", f"refs/remotes/{remote}/{branch_name}"])
+    if result.returncode == 0:
+        return f"{remote}/{branch_name}"
+    return branch_name
+
+
+def get_commit_hash(ref: str) -> str | None:
+    """Returns the full commit hash a ref points to, or None if the ref does not exist.
+
+    Args:
+        ref: Branch, remote-tracking ref, tag or commit.
+    """
+    store = get_object_store()
+    commit_hash = store.resolve(f"{ref}^{{commit}}") if store else None
+    if commit_hash:
+        return commit_hash
+    result = GIT_RUNNER.run(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"])
+    if result.returncode != 0:
+        logger.debug("Ref %s does not exist", ref)
+        return None
+    return result.stdout.strip()
+
+
+def get_object_hashes(ref: str, paths: list[str]) -> dict[str, str | None]:
+    """Returns the object hashes (blob or tree) of paths at a ref without checking it out.
+
+    Args:
+        ref: Branch, remote-tracking ref or commit.
+        paths: Paths relative to the root of the repository. An empty string stands for the root tree.
+
+    Returns:
+        A dictionary with the hash of each path, or None for paths that do not exist at the ref.
+    """
+    hashes: dict[str, str | None] = dict.fromkeys(paths)
+    store = get_object_store()
+    if store is not None and store.resolve(f"{ref}^{{tree}}"):
+        for path in paths:
+            entry = store.lookup_path(ref, path)
+            hashes[path] = entry[1] if entry else None
+        return hashes
+    if "" in hashes:
+        hashes[""] = get_tree_hash(ref)
+    paths_to_list = [path for path in paths if path]
+    if not paths_to_list:
+        return hashes
+    result = GIT_RUNNER.run(["ls-tree", "-z", "--full-tree", ref, "--", *paths_to_list])
+    if result.returncode != 0:
+        logger.error("Error listing %s at %s: %s", paths_to_list, ref, result.stderr.strip())
+        return hashes
+    for entry in result.stdout.split("\0"):
+        if not entry:
+            continue
+        info, path = entry.split("\t", 1)
+        hashes[path] = info.split()[2]
+    return hashes
+
+
+def get_changed_files(target_ref: str, source_ref: str, suffixes: tuple[str, ...] = (".py", ".pyi")) -> list[str]:
+    """Lists the files changed on a branch since it forked from its source branch.
+
+    Files are compared between the target and its merge base with the source (`git diff source...target`), so
+    commits added to the source after the fork are not included.
+
+    Args:
+        target_ref: Ref of the branch, e.g. 'origin/feature/x'.
+        source_ref: Ref of the branch it was created from, e.g. 'origin/develop'.
+        suffixes: Only files with these suffixes are listed. Deleted files are included.
+
+    Returns:
+        Paths relative to the root of the repository, sorted.
+    """
+    result = GIT_RUNNER.run(["diff", "--name-only", "-z", f"{source_ref}...{target_ref}"], check=True)
+    return sorted(path for path in result.stdout.split("\0") if path.endswith(suffixes))
+
+
+# Header of a hunk of a unified diff, e.g. '@@ -10,2 +12,3 @@ def view():'. Counts of 1 are left out.
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def get_changed_lines(
+    target_ref: str, source_ref: str, suffixes: tuple[str, ...] = (".py", ".pyi")
+) -> dict[str, set[int]]:
+    """Lists the lines added or modified on a branch since it forked from its source branch.
+
+    Args:
+        target_ref: Ref of the branch, e.g. 'origin/feature/x'.
+        source_ref: Ref of the branch it was created from, e.g. 'origin/develop'.
+        suffixes: Only files with these suffixes are listed.
+
+    Returns:
+        The numbers of the changed lines in the target branch, starting at 1, by path relative to the root of
+        the repository. Deleted files and files where lines were only removed are left out.
+    """
+    pathspecs = [f"*{suffix}" for suffix in suffixes]
+    result = GIT_RUNNER.run(
+        ["diff", "-U0", "--no-color", "--no-ext-diff", f"{source_ref}...{target_ref}", "--", *pathspecs], check=True
+    )
+    changed_lines = {}
+    lines = None
+    for line in result.stdout.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:]
+            lines = None if path == "/dev/null" else changed_lines.setdefault(_unquote_path(path)[2:], set())
+        elif lines is not None and (match := _HUNK_HEADER.match(line)):
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            lines.update(range(start, start + count))
+    return {path: lines for path, lines in sorted(changed_lines.items()) if lines}
+
+
+def _unquote_path(path: str) -> str:
+    r"""Decodes a path git quoted because it has special characters, e.g. '"b/caf\303\251.py"'."""
+    if not path.startswith('"'):
+        return path
+    return path[1:-1].encode("latin-1").decode("unicode_escape").encode("latin-1").decode("utf-8")
+
+
+def list_files_by_name(ref: str, file_name: str) -> dict[str, str]:
+    """Lists the files with a given name in a ref without checking it out.
+
+    Args:
+        ref: Branch, remote-tracking ref or commit.
+        file_name: Name of the files to find, e.g. 'Dockerfile'.
+
+    Returns:
+        A dictionary with the path of each file relative to the root of the repository and its blob hash.
+    """
+    return _list_files(ref, lambda path, mode: Path(path).name == file_name and mode != "160000")
+
+
+def list_files_by_names(ref: str, file_names: tuple[str, ...]) -> dict[str, str]:
+    """Lists the files with one of several names in a ref without checking it out.
+
+    Args:
+        ref: Branch, remote-tracking ref or commit.
+        file_names: Names of the files to find, e.g. ('pyproject.toml', 'ruff.toml').
+
+    Returns:
+        A dictionary with the path of each file relative to the root of the repository and its blob hash.
+    """
+    return _list_files(ref, lambda path, mode: Path(path).name in file_names and mode != "160000")
+
+
+def list_files_by_suffix(ref: str, suffixes: tuple[str, ...]) -> dict[str, str]:
+    """Lists the regular files whose names end with one of the suffixes in a ref without checking it out.
+
+    Args:
+        ref: Branch, remote-tracking ref or commit.
+        suffixes: Endings of the files to find, e.g. ('.py', '.pyi').
+
+    Returns:
+        A dictionary with the path of each file relative to the root of the repository and its blob hash.
+    """
+    return _list_files(ref, lambda path, mode: path.endswith(suffixes) and mode in {"100644", "100755"})
+
+
+def _list_files(ref: str, predicate: Callable[[str, str], bool]) -> dict[str, str]:
+    """Lists the files of a ref for which ``predicate(path, mode)`` is true, with their object hashes."""
+    store = get_object_store()
+    tree_hash = store.resolve(f"{ref}^{{tree}}") if store else None
+    if tree_hash:
+        return {
+            path: object_hash
+            for path, mode, object_hash in store.walk_tree(tree_hash)
+            if predicate(path, mode.decode().zfill(6))
+        }
+    result = GIT_RUNNER.run(["ls-tree", "-r", "-z", "--full-tree", ref])
+    if result.returncode != 0:
+        logger.error("Error listing files at %s: %s", ref, result.stderr.strip())
+        return {}
+    files = {}
+    for entry in result.stdout.split("\0"):
+        if not entry:
+            continue
+        info, path = entry.split("\t", 1)
+        mode, _, object_hash = info.split()
+        if predicate(path, mode):
+            files[path] = object_hash
+    return files
+
+
+def list_folder(ref: str, folder: str) -> dict[str, str]:
+    """Lists the files directly inside a folder of a ref without checking it out.
+
+    Args:
+        ref: Branch, remote-tracking ref or commit.
+        folder: Folder relative to the root of the repository, e.g. 'requirements'.
+
+    Returns:
+        A dictionary with the path of each file relative to the root of the repository and its blob hash.
+    """
+    folder = folder.rstrip("/")
+    store = get_object_store()
+    if store is not None and store.resolve(f"{ref}^{{tree}}"):
+        entry = store.lookup_path(ref, folder)
+        if entry is None or entry[0] != b"40000":
+            return {}
+        return {
+            f"{folder}/{name}": object_hash
+            for mode, name, object_hash in store.read_tree(entry[1]) or []
+            if mode not in {b"40000", b"160000"}
+        }
+    result = GIT_RUNNER.run(["ls-tree", "-z", "--full-tree", ref, "--", f"{folder}/"])
+    if result.returncode != 0:
+        logger.error("Error listing %s at %s: %s", folder, ref, result.stderr.strip())
+        return {}
+    files = {}
+    for entry in result.stdout.split("\0"):
+        if not entry:
+            continue
+        info, path = entry.split("\t", 1)
+        object_type, object_name = info.split()[1:3]
+        if object_type == "blob":
+            files[path] = object_name
+    return files
+
+
+_WORKTREE_LOCK = threading.Lock()
+
+
+def add_worktree(ref: str, folder: Path) -> Path:
+    """Creates a detached git worktree for a ref without touching the current checkout.
+
+    Args:
+        ref: Branch, remote-tracking ref or commit to check out in the worktree.
+        folder: Folder where the worktree will be created. It must not exist.
+
+    Returns:
+        The folder of the new worktree.
+
+    Raises:
+        SimpleGitToolError: If git could not create the worktree.
+    """
+    try:
+        with _WORKTREE_LOCK:
+            GIT_RUNNER.run(["worktree", "add", "--detach", "--force", str(folder), ref], check=True)
+    except subprocess.CalledProcessError as e:
+        raise SimpleGitToolError(f"Could not create worktree for '{ref}': {e.stderr.strip()}") from e
+    logger.debug("Created worktree for %s at %s", ref, folder)
+    return folder
+
+
+def remove_worktree(folder: Path) -> None:
+    """Removes a worktree created with `add_worktree` and prunes its administrative files.
+
+    Args:
+        folder: Folder of the worktree to remove.
+    """
+    result = GIT_RUNNER.run(["worktree", "remove", "--force", str(folder)])
+    if result.returncode != 0:
+        logger.warning("Could not remove worktree %s: %s", folder, result.stderr.strip())
+        shutil.rmtree(folder, ignore_errors=True)
+        GIT_RUNNER.run(["worktree", "prune"])
+    logger.debug("Removed worktree at %s", folder)
+
+
+@contextmanager
+def temporary_worktree(ref: str, name: str) -> Iterator[Path]:
+    """Context manager that checks out a ref in a throwaway worktree.
 
+    The worktree folder is named after the project so tools that derive the application name from the folder
+    (changelog and version parsing) behave the same as in the user's checkout.
 
-def _get_merged_branches(base: str) -> list:
-    result = subprocess.run(
-        ["git", "branch", "-r", "--merged", base],
-        capture_output=True,
-        text=True,
-        check=True,
+    Args:
+        ref: Branch, remote-tracking ref or commit to check out.
+        name: Name of the worktree folder, usually the project folder name.
+
+    Yields:
+        The folder of the worktree. It is removed when the context exits.
+    """
+    temp_folder = Path(tempfile.mkdtemp(prefix="code_review_"))
+    worktree = temp_folder / name
+    try:
+        add_worktree(ref, worktree)
+        yield worktree
+    finally:
+        if worktree.exists():
+            remove_worktree(worktree)
+        shutil.rmtree(temp_folder, ignore_errors=True)
+
+
+class LazyWorktree:
+    """Context manager for a temporary worktree that is only created the first time its folder is used.
+
+    It lets a review skip the checkout of a branch whose data is already cached.
+    """
+
+    def __init__(self, ref: str, name: str) -> None:
+        """Initializes the LazyWorktree.
+
+        Args:
+            ref: Branch, remote-tracking ref or commit to check out.
+            name: Name of the worktree folder, usually the project folder name.
+        """
+        self.ref = ref
+        self.name = name
+        self._folder: Path | None = None
+        self._temp_folder: Path | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        """Whether the worktree has been created."""
+        return self._folder is not None
+
+    @property
+    def folder(self) -> Path:
+        """The folder of the worktree. It is created on first access."""
+        with self._lock:
+            if self._folder is None:
+                self._temp_folder = Path(tempfile.mkdtemp(prefix="code_review_"))
+                self._folder = add_worktree(self.ref, self._temp_folder / self.name)
+        return self._folder
+
+    def __enter__(self) -> Self:
+        """Returns the worktree. It is checked out on first use."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Removes the worktree if it was checked out."""
+        if self._folder is not None and self._folder.exists():
+            remove_worktree(self._folder)
+        if self._temp_folder is not None:
+            shutil.rmtree(self._temp_folder, ignore_errors=True)
+
+
+def get_merge_status(bases: list[str], ref_pattern: str = "refs/remotes/") -> dict[str, dict[str, bool]]:
+    """Checks whether every branch is merged into each base, using the reachability index.
+
+    Args:
+        bases: Refs of the base branches, e.g. ['origin/master', 'origin/develop'].
+        ref_pattern: Refs of the branches to check.
+
+    Returns:
+        For every base that exists, whether each branch is merged into it. Symbolic refs such as 'origin/HEAD'
+        are skipped.
+    """
+    result = GIT_RUNNER.run(
+        ["for-each-ref", "--format=%(refname:short)%00%(objectname)%00%(symref)", ref_pattern], check=True
     )
-    # Process and display merged branches
+    tips = {}
+    for line in result.stdout.splitlines():
+        if line:
+            name, sha, symref = line.split("\0")
+            if not symref:
+                tips[name] = sha
+    return REACHABILITY_INDEX.get_merged(tips, _get_commit_hashes(bases))
+
+
+def _get_merged_branches(base: str | list[str]) -> list[str]:
+    """Lists the remote branches merged into every base, without the 'origin/' prefix.
+
+    The bases themselves are left out.
+    """
+    bases = [base] if isinstance(base, str) else list(base)
+    status = get_merge_status(bases)
+    base_names = {name.replace("origin/", "", 1) for name in bases}
     merged_branches = []
-    for line in result.stdout.strip().split("\n"):
-        branch_name = line.strip()
-        if branch_name and not branch_name.startswith("*") and f"origin/{base}" not in branch_name:
-            # Remove the asterisk from the current branch if present
-            branch_name = branch_name.replace("* ", "")
-            branch_name = branch_name.replace("origin/", "")
+    for ref in sorted(set().union(*(merged for merged in status.values()))):
+        branch_name = ref.replace("origin/", "", 1)
+        if branch_name not in base_names and all(merged.get(ref) for merged in status.values()):
             merged_branches.append(branch_name)
     return merged_branches
 
 
-def _get_unmerged_branches(base: str, author_pattern: str = None) -> list[BranchSchema]:
-    unmerged_branches = []
+# Branches deleted by one `git push`, which keeps the command line well under the OS limit.
+DELETE_CHUNK_SIZE = 100
 
-    refresh_from_remote("origin")
+# git refuses the whole push when one of the refs to delete does not exist on the remote.
+_MISSING_REMOTE_REF = re.compile(r"unable to delete '([^']+)': remote ref does not exist")
+_PUSH_PORCELAIN_LINE = re.compile(r"^([^\t]*)\t[^\t:]*:([^\t]+)\t([^\t]*)$")
+
+
+def _parse_push_porcelain(output: str) -> dict[str, tuple[str, str]]:
+    r"""Parses the output of `git push --porcelain`.
+
+    Each ref is written as '<flag>\t<from>:<to>\t<summary>', e.g. '-\t:refs/heads/feature/x\t[deleted]'.
+
+    Returns:
+        The flag and summary of each pushed branch.
+    """
+    statuses = {}
+    for line in output.splitlines():
+        match = _PUSH_PORCELAIN_LINE.match(line)
+        if match:
+            flag, branch, summary = match.groups()
+            statuses[branch.removeprefix("refs/heads/")] = (flag, summary)
+    return statuses
+
+
+def delete_remote_branches(
+    branches: list[str], remote: str = "origin", chunk_size: int = DELETE_CHUNK_SIZE
+) -> dict[str, str | None]:
+    """Deletes branches from the remote with one `git push --delete` per chunk of branches.
+
+    Each push is one connection to the remote, so deleting many branches takes a few pushes instead of one per
+    branch. Branches that no longer exist on the remote are reported and the rest of their chunk is pushed again.
+
+    Args:
+        branches: Names of the branches on the remote, e.g. 'feature/x'.
+        remote: Name of the remote.
+        chunk_size: Maximum number of branches deleted by one push.
+
+    Returns:
+        The error of each branch, or None if it was deleted.
+    """
+    results: dict[str, str | None] = {}
+    for start in range(0, len(branches), chunk_size):
+        pending = branches[start : start + chunk_size]
+        while pending:
+            result = GIT_RUNNER.run(["push", "--porcelain", remote, "--delete", *pending])
+            statuses = _parse_push_porcelain(result.stdout)
+            if statuses:
+                for branch in pending:
+                    flag, summary = statuses.get(branch, ("!", result.stderr.strip() or "not pushed"))
+                    results[branch] = None if flag == "-" else summary
+                break
+            missing = [branch for branch in _MISSING_REMOTE_REF.findall(result.stderr) if branch in pending]
+            if not missing:
+                for branch in pending:
+                    results[branch] = result.stderr.strip() or "push failed"
+                break
+            for branch in missing:
+                results[branch] = "remote ref does not exist"
+            pending = [branch for branch in pending if branch not in missing]
+        logger.debug(
+            "Pushed %d of %d branch deletions to %s", min(start + chunk_size, len(branches)), len(branches), remote
+        )
+    return results
+
+
+# Fields read by `list_branches`, separated by NUL characters. The keys match the fields of BranchSchema.
+_BRANCH_REF_FORMAT = {
+    "name": "%(refname:short)",
+    "hash": "%(objectname:short)",
+    "author": "%(authorname)",
+    "email": "%(committeremail:trim)",
+    "date": "%(committerdate)",
+    "symref": "%(symref)",
+    "commit": "%(objectname)",
+}
+
+
+def list_branches(
+    ref_pattern: str = "refs/remotes/",
+    no_merged: str | list[str] | None = None,
+    author_pattern: str | None = None,
+    base: str | None = None,
+) -> list[BranchSchema]:
+    """Lists branches with their last commit information using a single `git for-each-ref` call.
+
+    Args:
+        ref_pattern: Refs to list, e.g. 'refs/remotes/' for the remote-tracking branches.
+        no_merged: If given, only branches not merged into this ref, or into at least one of these refs, are
+            listed. A single ref is passed to `git for-each-ref --no-merged`. git only lists the branches merged
+            into none of several refs, so the branches merged into every one of them are found with the
+            reachability index instead, see `ReachabilityIndex`.
+        author_pattern: If given, only branches whose author contains this text (case-insensitive) are listed.
+        base: If given, the commits each branch is ahead and behind of this ref and whether it is rebased onto
+            its git flow source branch are added, see `count_ahead_behind`.
+
+    Returns:
+        The branches sorted from the most recent to the oldest. Symbolic refs such as 'origin/HEAD' are skipped.
+    """
+    ref_format = dict(_BRANCH_REF_FORMAT)
+    sources = {source: resolve_branch_ref(source) for source in _GIT_FLOW_SOURCES} if base else {}
+    bases = _get_commit_hashes([base, *sources.values()]) if base else {}
+    use_ahead_behind_atom = bool(bases) and _supports_ahead_behind_atom()
+    if use_ahead_behind_atom:
+        ref_format.update({f"ahead_behind:{name}": f"%(ahead-behind:{sha})" for name, sha in bases.items()})
+
+    merge_bases = [no_merged] if isinstance(no_merged, str) else list(no_merged or [])
+    command_list = ["for-each-ref", f"--format={'%00'.join(ref_format.values())}"]
+    if len(merge_bases) == 1:
+        command_list.append(f"--no-merged={merge_bases[0]}")
+    command_list.append(ref_pattern)
+    logger.debug("Running command: git %s", " ".join(command_list))
+    result = GIT_RUNNER.run(command_list, check=True)
+
+    branches = []
+    tips = {}
+    status: dict[str, dict[str, tuple[int, int]]] = {name: {} for name in bases}
+    for line in result.stdout.splitlines():
+        if not line:
+            continue
+        branch_dict = dict(zip(ref_format, line.split("\0"), strict=True))
+        if branch_dict.pop("symref"):
+            continue
+        if author_pattern and author_pattern.lower() not in branch_dict["author"].lower():
+            continue
+        ref_name = branch_dict["name"]
+        tips[ref_name] = branch_dict.pop("commit")
+        for name in bases:
+            if use_ahead_behind_atom:
+                ahead, behind = branch_dict.pop(f"ahead_behind:{name}").split()
+                status[name][ref_name] = (int(ahead), int(behind))
+        branch_dict["name"] = branch_dict["name"].replace("origin/", "")
+        branch_dict["date"] = parse_git_date(branch_dict["date"])
+        branches.append(BranchSchema(ref=ref_name, **branch_dict))
+
+    if len(merge_bases) > 1:
+        branches, tips = _exclude_merged_branches(branches, tips, merge_bases)
+    if bases and not use_ahead_behind_atom:
+        status = count_ahead_behind(tips, bases)
+    for branch in branches:
+        _set_branch_status(
+            branch, status.get(base, {}), status.get(sources.get(get_git_flow_source_branch(branch.name)))
+        )
+    return sorted(branches, reverse=True)
 
-    command_list = ["git", "branch", "-r", "--no-merged", base]
-    logger.debug("Running command: %s", " ".join(command_list))
-    result = subprocess.run(
-        command_list,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
 
-    # Process and display unmerged branches
+def _exclude_merged_branches(
+    branches: list[BranchSchema], tips: dict[str, str], merge_bases: list[str]
+) -> tuple[list[BranchSchema], dict[str, str]]:
+    """Keeps the branches that are not merged into at least one of the bases."""
+    merge_base_hashes = _get_commit_hashes(merge_bases)
+    missing = [ref for ref in merge_bases if ref not in merge_base_hashes]
+    if missing:
+        raise SimpleGitToolError(f"Could not find '{missing[0]}'")
+    status = REACHABILITY_INDEX.get_merged(tips, merge_base_hashes)
+    branches = [branch for branch in branches if not all(merged[branch.ref] for merged in status.values())]
+    return branches, {branch.ref: tips[branch.ref] for branch in branches}
+
+
+def _get_unmerged_branches(base: str | list[str], author_pattern: str = None, fetch: bool = True) -> list[BranchSchema]:
+    """Lists the remote branches not merged into the base, or into at least one of the bases.
+
+    Ahead and behind counts are relative to the first base.
+
+    Args:
+        base: Base ref, or several bases.
+        author_pattern: If given, only branches whose author contains this text (case-insensitive) are listed.
+        fetch: Fetch every branch from origin first, see `refresh_from_remote`. Callers that just fetched pass False.
+    """
+    if fetch:
+        refresh_from_remote("origin")
+    first_base = base if isinstance(base, str) else base[0]
+    return list_branches("refs/remotes/", no_merged=base, author_pattern=author_pattern, base=first_base)
+
+
+# The %(ahead-behind:<ref>) atom of for-each-ref counts every branch in one pass.
+_AHEAD_BEHIND_GIT_VERSION = "2.41.0"
+
+
+@functools.cache
+def _supports_ahead_behind_atom() -> bool:
     try:
-        for line in result.stdout.strip().split("\n"):
-            clean_line = line.strip()
-            logger.debug("Clean line: %s", clean_line)
-            if "->" in clean_line:
-                logger.warning("Found '->' in unmerged branches from '%s'", clean_line)
-                continue
-            branch_dict = branch_line_to_dict(clean_line)
-
-            branch_schema = BranchSchema(**branch_dict)
-            if author_pattern:
-                if author_pattern.lower() in branch_schema.author.lower():
-                    unmerged_branches.append(branch_schema)
-            else:
-                unmerged_branches.append(branch_schema)
-    except ValueError as e:
-        logger.error("Branch not found: %s", e)
-    return sorted(unmerged_branches, reverse=True)
+        return _compare_versions(_get_git_version(), _AHEAD_BEHIND_GIT_VERSION)
+    except SimpleGitToolError:
+        return False
+
+
+_GIT_FLOW_SOURCES = ["develop", "master"]
+
+
+def _get_commit_hashes(refs: list[str]) -> dict[str, str]:
+    """Returns the commit hashes of the refs that exist."""
+    hashes = {ref: get_commit_hash(ref) for ref in dict.fromkeys(refs)}
+    return {ref: commit_hash for ref, commit_hash in hashes.items() if commit_hash}
+
+
+def _set_branch_status(
+    branch: BranchSchema,
+    base_status: dict[str, tuple[int, int]],
+    source_status: dict[str, tuple[int, int]] | None,
+) -> None:
+    if branch.ref in base_status:
+        branch.ahead, branch.behind = base_status[branch.ref]
+    if source_status and branch.ref in source_status:
+        branch.rebased = source_status[branch.ref][1] == 0
 
 
 def branch_line_to_dict(branch_name: str) -> dict[str, Any]:
@@ -289,20 +792,30 @@ def branch_line_to_dict(branch_name: str) -> dict[str, Any]:
     return branch_dict
 
 
-def display_branches(branches: list[BranchSchema], page_size: int) -> None:
+def display_branches(branches: list[BranchSchema], page_size: int = 0) -> None:
     if page_size:
         branches = branches[:page_size]
     for i, branch in enumerate(branches, 1):
-        CLI_CONSOLE.print(f" {i} [yellow]{branch.name}[/yellow] {branch.date}(by [blue]{branch.author}[/blue])")
+        status = ""
+        if branch.ahead is not None:
+            status += f" [green]+{branch.ahead}[/green]/[red]-{branch.behind}[/red]"
+        if branch.rebased is not None:
+            status += " [green]rebased[/green]" if branch.rebased else " [red]not rebased[/red]"
+        CLI_CONSOLE.print(f" {i} [yellow]{branch.name}[/yellow] {branch.date}(by [blue]{branch.author}[/blue]){status}")
 
 
-def refresh_from_remote(remote_source: str) -> None:
-    try:
-        subprocess.run(
-            ["git", "fetch", remote_source], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
-    except subprocess.CalledProcessError:
-        raise SimpleGitToolError(f"Could not refresh from remote '{remote_source}'")
+def refresh_from_remote(remote_source: str, branches: list[str] | None = None, force: bool = False) -> bool:
+    """Fetches from a remote unless it was fetched recently, see `FetchCoordinator.fetch`.
+
+    Args:
+        remote_source: Name of the remote.
+        branches: If given, only these branches are fetched.
+        force: Fetch even if the last fetch is still fresh.
+
+    Returns:
+        True if git fetch ran, False if it was skipped.
+    """
+    return FETCH_COORDINATOR.fetch(remote_source, branches=branches, force=force)
 
 
 def compare_branches_deprecated(base: str, target: str, raise_error: bool = False) -> dict[str, int]:
@@ -315,18 +828,13 @@ def compare_branches_deprecated(base: str, target: str, raise_error: bool = Fals
     """
     status = {"ahead": -1, "behind": -1}
     try:
-        command = ["git", "rev-list", "--left-right", "--count", f"{base}...{target}"]
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        command = ["rev-list", "--left-right", "--count", f"{base}...{target}"]
+        result = GIT_RUNNER.run(command, check=True)
         behind_ahead = result.stdout.strip()
         behind, ahead = map(int, behind_ahead.split())
         status["ahead"] = ahead
         status["behind"] = behind
-        logger.info(f"Comparing {base} and {target}: {behind} != {ahead}. Command: {' '.join(command)}")
+        logger.info(f"Comparing {base} and {target}: {behind} != {ahead}. Command: git {' '.join(command)}")
         return status
     except subprocess.CalledProcessError as e:
         logger.error("Error comparing branches: %s", e.stderr.strip())
@@ -339,7 +847,7 @@ def sync_branches_legacy(branches: list[str], verbose: bool = True) -> None:
     if verbose:
         CLI_CONSOLE.print("[bold blue]Syncing branches...[/bold blue]")
 
-    refresh_from_remote("origin")
+    refresh_from_remote("origin", branches=branches)
     if verbose:
         CLI_CONSOLE.print("Refreshed from remote 'origin'.")
     for branch in branches:
@@ -348,70 +856,116 @@ def sync_branches_legacy(branches: list[str], verbose: bool = True) -> None:
         check_out_and_pull(branch, check=False)
 
 
-def sync_branches(branches: list[str], verbose: bool = True) -> None:
-    """Syncs branches with a single progress bar for both remote fetch and branch processing."""
-    if verbose:
-        CLI_CONSOLE.print("[bold blue]Starting unified branch sync process...[/bold blue]")
-
-    # --- 1. Estimate Total Work ---
-    # Give the refresh a "weight" of 1 unit of work.
-    FETCH_WORK_UNIT = 1
-    # Each branch sync is 1 unit of work.
-    BRANCH_WORK_UNIT = 1
-
-    total_branches = len(branches)
-
-    # The total will be (1 unit for the fetch) + (N branches * 1 unit/branch)
-    total_work = FETCH_WORK_UNIT + (total_branches * BRANCH_WORK_UNIT)
-
-    with Progress(
-        SpinnerColumn(),  # Use a spinner column for dynamic status updates
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        TimeElapsedColumn(),
-        console=CLI_CONSOLE,
-        transient=True,
-    ) as progress:
-        # Add a single task that covers the entire process
-        main_task = progress.add_task("[cyan]Total Sync Progress[/cyan]", total=total_work)
-
-        # ----------------------------------------------------
-        # 2. Execute Refresh from Remote (The first unit of work)
-        # ----------------------------------------------------
-        progress.update(main_task, description="[yellow]Fetching remote changes from 'origin'[/yellow]")
-        refresh_from_remote("origin")
-
-        # Advance the progress bar by the fetch work unit (1)
-        progress.update(
-            main_task, advance=FETCH_WORK_UNIT, description="[green]Refreshed from remote 'origin'.[/green]"
-        )
+def sync_branches(
+    branches: list[str], remote: str = "origin", force_fetch: bool = False
+) -> dict[str, BranchSyncStatus]:
+    """Fast-forwards local branches to their remote-tracking branches without checking them out.
 
-        # ----------------------------------------------------
-        # 3. Iterate and Sync Branches
-        # ----------------------------------------------------
-        for branch in branches:
-            # Update the description to show the current branch being processed
-            progress.update(main_task, description=f"[cyan]Syncing branch: [yellow]{branch}[/yellow][/cyan]")
+    The branches are fetched once (see `refresh_from_remote`) and the local branches are then updated with a local
+    `git fetch . refs/remotes/<remote>/<branch>:refs/heads/<branch>`, which only accepts fast-forwards and does
+    not touch the working tree. The checked-out branch cannot be updated that way, so it is fast-forwarded with
+    `git merge --ff-only`. Branches that have local commits are reported and left as they are.
 
-            # Perform the sync action
-            check_out_and_pull(branch, check=False)
+    Args:
+        branches: Names of the local branches, e.g. the configured default branches.
+        remote: Name of the remote.
+        force_fetch: Fetch even if the remote was fetched recently.
 
-            # Advance the progress bar by the branch work unit (1)
-            progress.advance(main_task)
+    Returns:
+        The sync status of each branch.
+    """
+    refresh_from_remote(remote, branches=branches, force=force_fetch)
+    remote_hashes = _get_commit_hashes([f"refs/remotes/{remote}/{branch}" for branch in branches])
+    local_hashes = _get_commit_hashes([f"refs/heads/{branch}" for branch in branches])
+    current_branch = get_current_git_branch()
 
-    if verbose:
-        CLI_CONSOLE.print("🎉 [bold green]All branches synced successfully![/bold green]")
+    statuses = {}
+    to_update = {}
+    for branch in branches:
+        remote_hash = remote_hashes.get(f"refs/remotes/{remote}/{branch}")
+        local_hash = local_hashes.get(f"refs/heads/{branch}")
+        if remote_hash is None:
+            statuses[branch] = BranchSyncStatus.MISSING
+        elif local_hash == remote_hash:
+            statuses[branch] = BranchSyncStatus.UP_TO_DATE
+        else:
+            to_update[branch] = remote_hash
+
+    tips = {
+        branch: local_hashes[f"refs/heads/{branch}"] for branch in to_update if f"refs/heads/{branch}" in local_hashes
+    }
+    status = count_ahead_behind(tips, {f"{remote}/{branch}": to_update[branch] for branch in tips}) if tips else {}
+    for branch in tips:
+        ahead, behind = status.get(f"{remote}/{branch}", {}).get(branch, (0, 0))
+        if ahead:
+            statuses[branch] = BranchSyncStatus.DIVERGED if behind else BranchSyncStatus.AHEAD
+            del to_update[branch]
+
+    _fast_forward_branches(list(to_update), remote, current_branch)
+    updated_hashes = _get_commit_hashes([f"refs/heads/{branch}" for branch in to_update])
+    for branch, remote_hash in to_update.items():
+        if updated_hashes.get(f"refs/heads/{branch}") != remote_hash:
+            statuses[branch] = BranchSyncStatus.FAILED
+        elif f"refs/heads/{branch}" in local_hashes:
+            statuses[branch] = BranchSyncStatus.UPDATED
+        else:
+            statuses[branch] = BranchSyncStatus.CREATED
+    return {branch: statuses[branch] for branch in branches}
+
+
+def _fast_forward_branches(branches: list[str], remote: str, current_branch: str) -> None:
+    refspecs = [
+        f"refs/remotes/{remote}/{branch}:refs/heads/{branch}" for branch in branches if branch != current_branch
+    ]
+    if refspecs:
+        # A fetch from the repository itself moves the refs without touching the working tree and rejects
+        # updates that are not fast-forwards.
+        result = GIT_RUNNER.run(["fetch", ".", *refspecs])
+        if result.returncode != 0:
+            logger.warning("Could not update every branch: %s", result.stderr.strip())
+    if current_branch in branches:
+        result = GIT_RUNNER.run(["merge", "--ff-only", "--quiet", f"refs/remotes/{remote}/{current_branch}"])
+        if result.returncode != 0:
+            logger.warning("Could not fast-forward %s: %s", current_branch, result.stderr.strip())
+
+
+def display_sync_statuses(statuses: dict[str, BranchSyncStatus]) -> None:
+    """Prints the sync status of each branch, in red when it needs attention."""
+    colors = {
+        BranchSyncStatus.UP_TO_DATE: "green",
+        BranchSyncStatus.UPDATED: "green",
+        BranchSyncStatus.CREATED: "green",
+    }
+    for branch, status in statuses.items():
+        color = colors.get(status, "red")
+        CLI_CONSOLE.print(f" [yellow]{branch}[/yellow]: [{color}]{status.value}[/{color}]")
 
 
 def get_tree_hash(branch_name: str) -> str | None:
     """Fetches the Tree Object Hash for a given branch."""
+    store = get_object_store()
+    tree_hash = store.resolve(f"{branch_name}^{{tree}}") if store else None
+    if tree_hash:
+        return tree_hash
     try:
         # Get the SHA-1 of the directory tree associated with the branch's tip commit
-        result = subprocess.run(
-            ["git", "rev-parse", f"{branch_name}^{{tree}}"], capture_output=True, text=True, check=True
-        )
+        result = GIT_RUNNER.run(["rev-parse", f"{branch_name}^{{tree}}"], check=True)
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
         logger.error("Error fetching tree hash for %s. Error: %s", branch_name, e)
         return None
+
+
+def get_sync_status(master_branch: str, develop_branch: str) -> tuple[bool, str | None, str | None]:
+    """Checks whether master and develop have the same tree, as they do right after a release.
+
+    Args:
+        master_branch: Ref of the master branch, e.g. 'origin/master'.
+        develop_branch: Ref of the develop branch.
+
+    Returns:
+        Whether the trees are the same, and the tree hashes of master and develop.
+    """
+    master_hash = get_tree_hash(master_branch)
+    develop_hash = get_tree_hash(develop_branch)
+    return develop_hash == master_hash, master_hash, develop_hash
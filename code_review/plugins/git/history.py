@@ -0,0 +1,139 @@
+import heapq
+import logging
+from collections import Counter
+from collections.abc import Callable
+
+from code_review.plugins.git.object_store import get_object_store
+from code_review.plugins.git.runner import GIT_RUNNER
+
+logger = logging.getLogger(__name__)
+
+
+def count_ahead_behind(tips: dict[str, str], bases: dict[str, str]) -> dict[str, dict[str, tuple[int, int]]]:
+    """Counts the commits every ref is ahead and behind of every base in a single walk of the history.
+
+    Each tip paints the commits it reaches with its own bit while the history is walked newest first. The walk
+    stops once every pending commit is reached by all the tips, so only the commits that differ are visited.
+    Commits are read in process when the object store can read the repository, otherwise they come from one
+    `git rev-list` call that stops at the merge base of all the tips, see `_read_history`.
+
+    Args:
+        tips: Names of the refs to compare and the hashes of the commits they point to.
+        bases: Names of the bases and the hashes of the commits they point to, e.g. {'origin/master': '1a2b...'}.
+
+    Returns:
+        For every base, the number of commits each ref is ahead and behind of it, e.g.
+        {'origin/master': {'origin/feature/x': (3, 0)}}.
+    """
+    commits = dict.fromkeys([*bases, *tips])
+    tip_hashes = {**bases, **tips}
+    store = get_object_store()
+    read_parents: Callable[[str], tuple[int, list[str]]]
+    common = set()
+    if store is not None:
+        read_parents = store.read_parents
+    else:
+        history, common = _read_history(list(dict.fromkeys(tip_hashes.values())))
+        read_parents = history.__getitem__
+
+    try:
+        flags = _paint_history({name: tip_hashes[name] for name in commits}, read_parents)
+    except (LookupError, TypeError, ValueError) as e:
+        logger.warning("Could not count the commits ahead and behind: %s", e)
+        return {}
+
+    bits = {name: 1 << i for i, name in enumerate(commits)}
+    flag_counts = Counter(flag for sha, flag in flags.items() if sha not in common)
+    status = {}
+    for base in bases:
+        status[base] = {}
+        for ref in tips:
+            ahead = sum(count for flag, count in flag_counts.items() if flag & bits[ref] and not flag & bits[base])
+            behind = sum(count for flag, count in flag_counts.items() if flag & bits[base] and not flag & bits[ref])
+            status[base][ref] = (ahead, behind)
+    return status
+
+
+def _read_history(tips: list[str]) -> tuple[dict[str, tuple[int, list[str]]], set[str]]:
+    """Reads the commit dates and parents of the history of some tips with one `git rev-list` call.
+
+    Commits below the merge base of all the tips are reached by every tip, so they are left out. The boundary
+    commits, the parents of the listed commits that are left out, are returned without parents.
+
+    Returns:
+        The date and parents of each commit, and the boundary commits.
+    """
+    merge_bases = GIT_RUNNER.run(["merge-base", "--octopus", *tips]).stdout.split()
+    exclusions = ["--not", *(f"{sha}^@" for sha in merge_bases)] if merge_bases else []
+    result = GIT_RUNNER.run(["rev-list", "--timestamp", "--parents", "--boundary", *tips, *exclusions])
+    history = {}
+    boundary = set()
+    for line in result.stdout.splitlines():
+        timestamp, sha, *parents = line.split()
+        if sha.startswith("-"):
+            sha = sha[1:]
+            boundary.add(sha)
+            parents = []
+        history[sha] = (int(timestamp), parents)
+    return history, boundary
+
+
+def _is_painted(
+    queue: list[tuple[int, str]],
+    queued_partial: int,
+    partial: list[tuple[int, str]],
+    flags: dict[str, int],
+    all_bits: int,
+) -> bool:
+    """Checks if the walk can stop.
+
+    It can stop when every pending commit is reached by all the tips and is older than the commits that are not, so
+    it cannot reach them. Commits made in the same second are not assumed to be ordered.
+    """
+    if queued_partial:
+        return False
+    while partial and flags[partial[0][1]] == all_bits:
+        heapq.heappop(partial)
+    return not partial or -queue[0][0] < partial[0][0]
+
+
+def _paint_history(tips: dict[str, str], read_parents: Callable[[str], tuple[int, list[str]]]) -> dict[str, int]:
+    """Marks each commit with a bit for every tip that reaches it, see `count_ahead_behind`."""
+    all_bits = (1 << len(tips)) - 1
+    flags: dict[str, int] = {}
+    for i, sha in enumerate(tips.values()):
+        flags[sha] = flags.get(sha, 0) | 1 << i
+    dates = {sha: read_parents(sha)[0] for sha in flags}
+    queue = [(-date, sha) for sha, date in dates.items()]
+    heapq.heapify(queue)
+    queued = set(flags)
+    # The commits not reached by every tip, oldest first, and how many of them are queued. Commits that every tip
+    # reaches later are only dropped from the heap when they get to its top.
+    partial = [(dates[sha], sha) for sha, flag in flags.items() if flag != all_bits]
+    heapq.heapify(partial)
+    queued_partial = len(partial)
+    while queue and not _is_painted(queue, queued_partial, partial, flags, all_bits):
+        _, sha = heapq.heappop(queue)
+        queued.discard(sha)
+        if flags[sha] != all_bits:
+            queued_partial -= 1
+        for parent in read_parents(sha)[1]:
+            old_flags = flags.get(parent, 0)
+            parent_flags = old_flags | flags[sha]
+            if parent_flags == old_flags:
+                continue
+            flags[parent] = parent_flags
+            if parent not in dates:
+                dates[parent], _ = read_parents(parent)
+            if not old_flags and parent_flags != all_bits:
+                heapq.heappush(partial, (dates[parent], parent))
+            if parent in queued:
+                if parent_flags == all_bits:
+                    queued_partial -= 1
+                continue
+            # A commit painted again after it was walked (clock skew) is walked again with its new bits.
+            heapq.heappush(queue, (-dates[parent], parent))
+            queued.add(parent)
+            if parent_flags != all_bits:
+                queued_partial += 1
+    return flags
@@ -7,8 +7,10 @@ from pathlib import Path
 import click
 
 from code_review.cli import cli
+from code_review.enums import BranchSyncStatus
 from code_review.exceptions import SimpleGitToolError
 from code_review.handlers.file_handlers import change_directory
+from code_review.plugins.git.conflicts import predict_branch_conflicts
 from code_review.plugins.git.handlers import (
     _are_there_uncommited_changes,
     _compare_versions,
@@ -17,14 +19,22 @@ from code_review.plugins.git.handlers import (
     _get_merged_branches,
     _get_unmerged_branches,
     check_out_and_pull,
+    delete_remote_branches,
     display_branches,
+    display_sync_statuses,
     get_current_git_branch,
     refresh_from_remote,
+    resolve_branch_ref,
+    sync_branches,
 )
-from code_review.settings import CLI_CONSOLE
+from code_review.plugins.git.runner import GIT_RUNNER
+from code_review.plugins.git.sync_all import display_sync_summary, sync_all_repositories
+from code_review.settings import CLI_CONSOLE, CURRENT_CONFIGURATION
 
 logger = logging.getLogger(__name__)
 
+SYNC_FAILURES = {BranchSyncStatus.DIVERGED, BranchSyncStatus.MISSING, BranchSyncStatus.FAILED}
+
 
 @cli.group()
 def git() -> None:
@@ -55,16 +65,62 @@ def check(min_version: str) -> None:
         sys.exit(1)
 
 
+def _sync_all(base_folder: Path | None, jobs: int, exclude: tuple[str, ...]) -> None:
+    """Syncs every project in a base folder and prints the summary. Exits with an error if any project fails."""
+    if base_folder is None:
+        CLI_CONSOLE.print("[bold red]Error:[/bold red] --all requires --base-folder")
+        sys.exit(1)
+    branches = CURRENT_CONFIGURATION.get("default_branches", ["master", "develop"])
+    results = sync_all_repositories(base_folder.expanduser(), branches, max_workers=jobs, exclusion_list=list(exclude))
+    if not results:
+        CLI_CONSOLE.print(f"No projects found in {base_folder}.")
+        return
+    display_sync_summary(results, branches)
+    failed = [
+        result
+        for result in results
+        if result.error or result.in_sync is False or SYNC_FAILURES & set(result.statuses.values())
+    ]
+    if failed:
+        sys.exit(1)
+
+
 @git.command()
 @click.option("--folder", "-f", type=Path, help="Path to the git repository", default=None)
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed diff information", default=False)
-def sync(folder: Path, verbose: bool) -> None:
+@click.option(
+    "--checkout", is_flag=True, help="Check out and pull each branch instead of fast-forwarding it", default=False
+)
+@click.option("--all", "sync_all", is_flag=True, help="Sync every git project in --base-folder", default=False)
+@click.option("--base-folder", "-b", type=Path, help="Folder that contains the git projects", default=None)
+@click.option("--jobs", "-j", type=int, help="Number of projects synced at the same time (with --all)", default=8)
+@click.option("--exclude", "-e", multiple=True, help="Project folder names to leave out (with --all)", default=())
+# click passes one argument per option.
+def sync(  # noqa: PLR0913, PLR0917
+    folder: Path,
+    verbose: bool,
+    checkout: bool,
+    sync_all: bool,
+    base_folder: Path | None,
+    jobs: int,
+    exclude: tuple[str, ...],
+) -> None:
     """Syncs the master and develop branches, ensuring consistency.
 
+    By default the branches are fast-forwarded from a single fetch without checking them out, see `sync_branches`.
+
     Args:
         folder: Path to the git repository. If not provided, uses current directory.
         verbose: If True, shows detailed diff information.
+        checkout: If True, checks out and pulls each branch like earlier versions did.
+        sync_all: If True, syncs the default branches of every project in base_folder concurrently.
+        base_folder: Folder that contains the git projects (used with sync_all).
+        jobs: Number of projects synced at the same time (used with sync_all).
+        exclude: Names of project folders to leave out (used with sync_all).
     """
+    if sync_all:
+        _sync_all(base_folder, jobs, exclude)
+        return
     # Store original directory to return to it later
     original_dir = os.getcwd()
 
@@ -72,55 +128,37 @@ def sync(folder: Path, verbose: bool) -> None:
     try:
         CLI_CONSOLE.print("[bold cyan]Starting branch synchronization...[/bold cyan]")
         # Change to the specified directory if provided
+        change_directory(folder)
         if folder:
-            if not folder.exists():
-                raise SimpleGitToolError(f"Directory does not exist: {folder}")
-            if not folder.is_dir():
-                raise SimpleGitToolError(f"Not a directory: {folder}")
-
             CLI_CONSOLE.print(f"Changing to directory: [cyan]{folder}[/cyan]")
-            os.chdir(folder)
-
-        uncommited_changes = _are_there_uncommited_changes()
-        if uncommited_changes:
-            CLI_CONSOLE.print("[bold red]ERROR: There are uncommitted changes in the repository.[/bold red]")
-            sys.exit(1)
 
         # Define the branches to sync
         master_branch = "master"
         develop_branch = "develop"
 
-        original_branch = get_current_git_branch()
-        # 1. Checkout master and pull
-        CLI_CONSOLE.print(
-            f"[bold]Checking out and pulling [green]{master_branch}[/green] from [green]{original_branch}[/green]...[/bold]"
-        )
-        check_out_and_pull(master_branch)
-
-        latest_tag = _get_latest_tag()
-        # 2. Checkout develop and pull
-        CLI_CONSOLE.print(f"[bold]Checking out and pulling [green]{develop_branch}[/green]...[/bold]")
-        check_out_and_pull(develop_branch)
+        if checkout:
+            uncommited_changes = _are_there_uncommited_changes()
+            if uncommited_changes:
+                CLI_CONSOLE.print("[bold red]ERROR: There are uncommitted changes in the repository.[/bold red]")
+                sys.exit(1)
+
+            original_branch = get_current_git_branch()
+            # 1. Checkout master and pull
+            CLI_CONSOLE.print(
+                f"[bold]Checking out and pulling [green]{master_branch}[/green] from "
+                f"[green]{original_branch}[/green]...[/bold]"
+            )
+            check_out_and_pull(master_branch)
+            # 2. Checkout develop and pull
+            CLI_CONSOLE.print(f"[bold]Checking out and pulling [green]{develop_branch}[/green]...[/bold]")
+            check_out_and_pull(develop_branch)
+        else:
+            # 1 and 2. Fast-forward master and develop from one fetch
+            _fast_forward_default_branches(master_branch, develop_branch)
+        latest_tag = _get_latest_tag(master_branch)
 
         # 3. Do a git diff and check for differences
-        CLI_CONSOLE.print("[bold]Checking for differences between develop and master...[/bold]")
-        result = subprocess.run(
-            ["git", "diff", "--name-only", master_branch, develop_branch],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        if result.stdout.strip():
-            # If the diff command returns any output, it means there are differences.
-            diff_files = result.stdout.strip().split("\n")
-            CLI_CONSOLE.print("[bold red]ERROR: Differences found between develop and master.[/bold red]")
-            if verbose:
-                for file in diff_files:
-                    CLI_CONSOLE.print(f" - [yellow]{file}[/yellow]")
-            raise SimpleGitToolError("Please merge changes from master into develop before syncing.")
-
-        CLI_CONSOLE.print("[bold green]develop and master branches are in sync.[/bold green]")
+        _check_branches_in_sync(master_branch, develop_branch, verbose)
 
         # 4. Get the latest tag
         # console.print("[bold]Getting the latest tag...[/bold]")
@@ -142,34 +180,83 @@ def sync(folder: Path, verbose: bool) -> None:
         if folder:
             os.chdir(original_dir)
         if original_branch:
-            current_branch = get_current_git_branch()
-            logger.debug(f"Current branch: {current_branch} | Original branch: {original_branch}")
-            if current_branch != original_branch:
-                CLI_CONSOLE.print(
-                    f"[bold cyan]Returning to original branch: [green]{original_branch}[/green][/bold cyan]"
-                )
-                # Ensure we check out the original branch at the end
-                check_out_and_pull(original_branch, check=False)
+            _return_to_branch(original_branch)
+
+
+def _fast_forward_default_branches(master_branch: str, develop_branch: str) -> None:
+    """Fast-forwards master and develop from one fetch, see `sync_branches`.
+
+    Raises:
+        SimpleGitToolError: If a branch could not be fast-forwarded.
+    """
+    CLI_CONSOLE.print(
+        f"[bold]Fast-forwarding [green]{master_branch}[/green] and [green]{develop_branch}[/green]...[/bold]"
+    )
+    statuses = sync_branches([master_branch, develop_branch])
+    display_sync_statuses(statuses)
+    if any(status in SYNC_FAILURES for status in statuses.values()):
+        raise SimpleGitToolError("Some branches could not be fast-forwarded from the remote.")
+
+
+def _check_branches_in_sync(master_branch: str, develop_branch: str, verbose: bool) -> None:
+    """Checks that develop has no changes that are not in master.
+
+    Raises:
+        SimpleGitToolError: If the branches differ. The files that differ are printed when verbose is True.
+    """
+    CLI_CONSOLE.print("[bold]Checking for differences between develop and master...[/bold]")
+    result = GIT_RUNNER.run(["diff", "--name-only", master_branch, develop_branch], check=True)
+
+    if result.stdout.strip():
+        # If the diff command returns any output, it means there are differences.
+        diff_files = result.stdout.strip().split("\n")
+        CLI_CONSOLE.print("[bold red]ERROR: Differences found between develop and master.[/bold red]")
+        if verbose:
+            for file in diff_files:
+                CLI_CONSOLE.print(f" - [yellow]{file}[/yellow]")
+        raise SimpleGitToolError("Please merge changes from master into develop before syncing.")
+
+    CLI_CONSOLE.print("[bold green]develop and master branches are in sync.[/bold green]")
+
+
+def _return_to_branch(original_branch: str) -> None:
+    """Checks out the branch that was checked out before syncing, if syncing left another one checked out."""
+    current_branch = get_current_git_branch()
+    logger.debug(f"Current branch: {current_branch} | Original branch: {original_branch}")
+    if current_branch != original_branch:
+        CLI_CONSOLE.print(f"[bold cyan]Returning to original branch: [green]{original_branch}[/green][/bold cyan]")
+        # Ensure we check out the original branch at the end
+        check_out_and_pull(original_branch, check=False)
 
 
 @git.command()
 @click.option("--folder", "-f", type=Path, help="Path to the git repository", default=None)
-@click.option("--merged", is_flag=True, help="List branches that are merged into master", default=False)
-@click.option("--un-merged", is_flag=True, help="List branches that are not merged into master", default=False)
+@click.option("--merged", is_flag=True, help="List branches that are merged into every base", default=False)
+@click.option("--un-merged", is_flag=True, help="List branches not merged into at least one base", default=False)
 @click.option("--delete", is_flag=True, help="Delete merged branches (use with --merged)", default=False)
 @click.option("--interactive", is_flag=True, help="Ask before deleting (use with --merged --delete)", default=False)
-@click.option("--base", help="Base branch to compare against", default="master")
-def branch(folder: Path, merged: bool, un_merged: bool, delete: bool, base: str, interactive: bool) -> None:
-    """Lists merged or unmerged branches relative to a base branch (default: master).
+@click.option("--base", multiple=True, help="Base branch to compare against (repeatable)", default=("master",))
+@click.option("--force-fetch", is_flag=True, help="Fetch even if the remote was fetched recently", default=False)
+def branch(  # noqa: PLR0913, PLR0917
+    folder: Path,
+    merged: bool,
+    un_merged: bool,
+    delete: bool,
+    base: tuple[str, ...],
+    interactive: bool,
+    force_fetch: bool,
+) -> None:
+    """Lists merged or unmerged branches relative to one or more base branches (default: master).
     Can also delete merged branches.
 
     Args:
         folder: Path to the git repository. If not provided, uses current directory.
-        merged: List branches that are merged into the base branch.
+        merged: List branches that are merged into every base branch.
         interactive: Ask before deleting branches (only works with --merged and --delete).
-        un_merged: List branches that are not merged into the base branch.
+        un_merged: List branches that are not merged into at least one base branch.
         delete: Delete merged branches (only works with --merged flag).
-        base: Base branch to compare against (default: master).
+        base: Base branches to compare against (default: master).
+        force_fetch: Fetch from the remote even if it was fetched within the 'fetch_ttl_seconds' setting.
     """
     # Store original directory to return to it later
     original_dir = os.getcwd()
@@ -185,59 +272,34 @@ def branch(folder: Path, merged: bool, un_merged: bool, delete: bool, base: str,
         change_directory(folder)
         CLI_CONSOLE.print(f"Changing to directory: [cyan]{folder}[/cyan]")
 
-        refresh_from_remote("origin")
-        # Check if the base branch exists
-        try:
-            subprocess.run(
-                ["git", "rev-parse", "--verify", base], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
-        except subprocess.CalledProcessError:
-            raise SimpleGitToolError(f"Base branch '{base}' does not exist")
+        # Branches are only deleted from a fresh view of the remote, so a branch that received commits since the
+        # last fetch is not taken for merged.
+        refresh_from_remote("origin", force=force_fetch or delete)
+        # Check if the base branches exist
+        _check_base_branches(base)
+        bases = ", ".join(base)
 
         # Get current branch to restore it later
-        current_branch = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True, check=True
-        ).stdout.strip()
+        current_branch = GIT_RUNNER.run(["rev-parse", "--abbrev-ref", "HEAD"], check=True).stdout.strip()
 
         # Handle merged branches
         if merged:
-            CLI_CONSOLE.print(f"[bold cyan]Listing branches merged into [green]{base}[/green]:[/bold cyan]")
-            merged_branches = _get_merged_branches(base)
+            CLI_CONSOLE.print(f"[bold cyan]Listing branches merged into [green]{bases}[/green]:[/bold cyan]")
+            merged_branches = _get_merged_branches(list(base))
             for i, branch_name in enumerate(merged_branches, 1):
                 CLI_CONSOLE.print(f" {i}  [yellow]{branch_name}[/yellow]")
 
             # Delete merged branches if requested
             if delete and merged_branches:
-                CLI_CONSOLE.print("[bold]Deleting merged branches...[/bold]")
-                for branch in merged_branches:
-                    # Don't delete the current branch or protected branches
-                    if branch not in (current_branch, "master", "develop"):
-                        try:
-                            do_delete = True
-                            if interactive:
-                                do_delete = click.confirm(f"Do you want to delete branch {branch}?", default=True)
-                            if do_delete:
-                                CLI_CONSOLE.print(f"Deleting branch: [red]{branch}[/red]")
-                                subprocess.run(
-                                    ["git", "push", "origin", "--delete", branch],
-                                    check=True,
-                                    stdout=subprocess.DEVNULL,
-                                    stderr=subprocess.DEVNULL,
-                                )
-                        except subprocess.CalledProcessError:
-                            CLI_CONSOLE.print(f"[yellow]Warning: Could not delete branch {branch}[/yellow]")
-                    elif branch == current_branch:
-                        CLI_CONSOLE.print(f"[yellow]Skipping current branch: {branch}[/yellow]")
-                    else:
-                        CLI_CONSOLE.print(f"[yellow]Skipping protected branch: {branch}[/yellow]")
+                _delete_merged_branches(merged_branches, current_branch, interactive)
 
             if not merged_branches:
                 CLI_CONSOLE.print("[bold green]No merged branches found.[/bold green]")
 
         if un_merged:
-            CLI_CONSOLE.print(f"[bold cyan]Listing branches not merged into [green]{base}[/green]:[/bold cyan]")
+            CLI_CONSOLE.print(f"[bold cyan]Listing branches not merged into [green]{bases}[/green]:[/bold cyan]")
 
-            unmerged_branches = _get_unmerged_branches(base)
+            unmerged_branches = _get_unmerged_branches(list(base), fetch=False)
             display_branches(unmerged_branches)
 
             if not unmerged_branches:
@@ -253,3 +315,86 @@ def branch(folder: Path, merged: bool, un_merged: bool, delete: bool, base: str,
         # Change back to the original directory if we changed it
         if folder:
             os.chdir(original_dir)
+
+
+def _check_base_branches(bases: tuple[str, ...]) -> None:
+    """Checks that the base branches exist.
+
+    Raises:
+        SimpleGitToolError: If a base branch does not exist.
+    """
+    for base_branch in bases:
+        try:
+            GIT_RUNNER.run(["rev-parse", "--verify", base_branch], check=True)
+        except subprocess.CalledProcessError:
+            raise SimpleGitToolError(f"Base branch '{base_branch}' does not exist")
+
+
+def _delete_merged_branches(merged_branches: list[str], current_branch: str, interactive: bool) -> None:
+    """Deletes merged branches from the remote, except the current and protected branches.
+
+    Args:
+        merged_branches: Names of the merged branches.
+        current_branch: Name of the branch that is checked out.
+        interactive: If True, asks before deleting each branch.
+    """
+    CLI_CONSOLE.print("[bold]Deleting merged branches...[/bold]")
+    to_delete = []
+    for branch_name in merged_branches:
+        # Don't delete the current branch or protected branches
+        if branch_name == current_branch:
+            CLI_CONSOLE.print(f"[yellow]Skipping current branch: {branch_name}[/yellow]")
+        elif branch_name in ("master", "develop"):
+            CLI_CONSOLE.print(f"[yellow]Skipping protected branch: {branch_name}[/yellow]")
+        elif not interactive or click.confirm(f"Do you want to delete branch {branch_name}?", default=True):
+            to_delete.append(branch_name)
+
+    # Confirmations are collected first so the deletions can be pushed together.
+    for branch_name, error in delete_remote_branches(to_delete).items():
+        if error is None:
+            CLI_CONSOLE.print(f"Deleted branch: [red]{branch_name}[/red]")
+        else:
+            CLI_CONSOLE.print(f"[yellow]Warning: Could not delete branch {branch_name}: {error}[/yellow]")
+
+
+@git.command()
+@click.option("--folder", "-f", type=Path, help="Path to the git repository", default=None)
+@click.option("--author", "-a", type=str, help="Only branches whose author contains this text", default=None)
+@click.option("--jobs", "-j", type=int, help="Number of git processes that run at the same time", default=4)
+@click.option("--no-cache", is_flag=True, help="Ignore cached predictions and merge every branch again", default=False)
+def conflicts(folder: Path, author: str | None, jobs: int, no_cache: bool) -> None:
+    """Predicts which unmerged branches would conflict with their git flow source branch.
+
+    Feature and release branches are merged into develop, and hotfix branches into master, with
+    `git merge-tree --write-tree`, so the working tree is not modified.
+
+    Args:
+        folder: Path to the git repository. If not provided, uses current directory.
+        author: Only branches whose author contains this text are checked.
+        jobs: Number of git processes that run at the same time.
+        no_cache: If True, cached predictions are ignored.
+    """
+    original_dir = os.getcwd()
+    try:
+        change_directory(folder)
+        unmerged_branches = _get_unmerged_branches(resolve_branch_ref("master"), author_pattern=author)
+        predictions = predict_branch_conflicts(unmerged_branches, max_workers=jobs, use_cache=not no_cache)
+        if not predictions:
+            CLI_CONSOLE.print("[bold green]No unmerged git flow branches found.[/bold green]")
+            return
+        for prediction in predictions:
+            if prediction.error:
+                CLI_CONSOLE.print(f" [yellow]{prediction.branch}[/yellow]: [red]{prediction.error}[/red]")
+            elif prediction.has_conflicts:
+                files = ", ".join(prediction.conflicted_files)
+                CLI_CONSOLE.print(
+                    f" [yellow]{prediction.branch}[/yellow] -> {prediction.base}: [red]conflicts[/red] in {files}"
+                )
+            else:
+                CLI_CONSOLE.print(f" [yellow]{prediction.branch}[/yellow] -> {prediction.base}: [green]clean[/green]")
+    except SimpleGitToolError as e:
+        CLI_CONSOLE.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
+    finally:
+        if folder:
+            os.chdir(original_dir)
@@ -0,0 +1,586 @@
+import heapq
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+_TREE_MODE = b"40000"
+_SUBMODULE_MODE = b"160000"
+_IDX_SIGNATURE = b"\xfftOc"
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+_PEEL_PATTERN = re.compile(r"^(?P<rev>.+)\^\{(?P<type>commit|tree)\}$")
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Reads a little-endian base-128 number as used in delta headers."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Builds an object from its delta base and a git delta.
+
+    Args:
+        base: Content of the base object.
+        delta: Delta instructions from a packfile.
+
+    Raises:
+        ValueError: If the delta is corrupt or does not match the base.
+    """
+    base_size, pos = _read_varint(delta, 0)
+    if base_size != len(base):
+        raise ValueError("Delta base size does not match")
+    target_size, pos = _read_varint(delta, pos)
+    result = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            offset = 0
+            size = 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if opcode & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            result += base[offset : offset + (size or 0x10000)]
+        elif opcode:
+            result += delta[pos : pos + opcode]
+            pos += opcode
+        else:
+            raise ValueError("Invalid delta opcode 0")
+    if len(result) != target_size:
+        raise ValueError("Delta target size does not match")
+    return bytes(result)
+
+
+class PackFile:
+    """A memory-mapped packfile and its version 2 index."""
+
+    def __init__(self, idx_path: Path) -> None:
+        """Initializes the PackFile.
+
+        Args:
+            idx_path: Path of the .idx file. The .pack file must be next to it.
+
+        Raises:
+            ValueError: If the index is not a version 2 index.
+        """
+        self.idx_path = idx_path
+        with open(idx_path, "rb") as f:
+            self._idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._idx[:4] != _IDX_SIGNATURE or struct.unpack(">I", self._idx[4:8])[0] != 2:  # noqa: PLR2004
+            self._idx.close()
+            raise ValueError(f"Unsupported pack index {idx_path}")
+        with open(idx_path.with_suffix(".pack"), "rb") as f:
+            self._pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._fanout = struct.unpack(">256I", self._idx[8 : 8 + 256 * 4])
+        self.count = self._fanout[255]
+        self._sha_offset = 8 + 256 * 4
+        self._offset_offset = self._sha_offset + self.count * 24  # SHA-1 table and CRC32 table
+        self._large_offset_offset = self._offset_offset + self.count * 4
+
+    def close(self) -> None:
+        """Unmaps the files of the pack."""
+        self._idx.close()
+        self._pack.close()
+
+    def find_offset(self, sha: bytes) -> int | None:
+        """Returns the offset of an object in the pack using a binary search bounded by the fan-out table.
+
+        Args:
+            sha: The binary SHA-1 of the object.
+        """
+        low = self._fanout[sha[0] - 1] if sha[0] else 0
+        high = self._fanout[sha[0]]
+        while low < high:
+            middle = (low + high) // 2
+            position = self._sha_offset + middle * 20
+            current = self._idx[position : position + 20]
+            if current < sha:
+                low = middle + 1
+            elif current > sha:
+                high = middle
+            else:
+                position = self._offset_offset + middle * 4
+                offset = struct.unpack(">I", self._idx[position : position + 4])[0]
+                if offset & 0x80000000:
+                    position = self._large_offset_offset + (offset & 0x7FFFFFFF) * 8
+                    offset = struct.unpack(">Q", self._idx[position : position + 8])[0]
+                return offset
+        return None
+
+    def _inflate(self, offset: int, size: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            chunk = self._pack[offset : offset + max(size, 4096) + 64]
+            if not chunk:
+                raise ValueError(f"Truncated pack entry in {self.idx_path}")
+            offset += len(chunk)
+            chunks.append(decompressor.decompress(chunk))
+        return b"".join(chunks)
+
+    def read_entry(self, offset: int) -> tuple[int, bytes, int | bytes | None]:
+        """Reads the entry at an offset of the pack.
+
+        Returns:
+            The type code, the inflated data and the delta base: an offset for offset deltas, a binary SHA-1 for
+            ref deltas or None for whole objects.
+        """
+        byte = self._pack[offset]
+        entry_offset = offset
+        offset += 1
+        type_code = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        while byte & 0x80:
+            byte = self._pack[offset]
+            offset += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        base = None
+        if type_code == _OFS_DELTA:
+            byte = self._pack[offset]
+            offset += 1
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = self._pack[offset]
+                offset += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            base = entry_offset - distance
+        elif type_code == _REF_DELTA:
+            base = self._pack[offset : offset + 20]
+            offset += 20
+        return type_code, self._inflate(offset, size), base
+
+
+class GitObjectStore:
+    """Reads git objects and refs directly from the files of a repository.
+
+    Loose objects are inflated with zlib and packed objects are read from memory-mapped packfiles, so read-only
+    queries need no git process. Methods return None for anything the store cannot answer (unknown objects,
+    unsupported pack formats, complex revision syntax) so callers can fall back to the git CLI.
+    """
+
+    def __init__(self, git_dir: Path, common_dir: Path | None = None, max_cache_size: int = 16 * 1024 * 1024) -> None:
+        """Initializes the GitObjectStore.
+
+        Args:
+            git_dir: The .git folder, or the private folder of a linked worktree.
+            common_dir: Folder with the objects and refs shared by the worktrees. Defaults to git_dir.
+            max_cache_size: Maximum total size in bytes of the cached objects, used for delta bases and trees.
+        """
+        self.git_dir = git_dir
+        self.common_dir = common_dir or git_dir
+        self.objects_dir = self.common_dir / "objects"
+        self.max_cache_size = max_cache_size
+        self._packs: dict[Path, PackFile] = {}
+        self._packs_mtime: float | None = None
+        self._packed_refs: dict[str, str] = {}
+        self._packed_refs_mtime: float | None = None
+        self._cache: OrderedDict[bytes, tuple[str, bytes]] = OrderedDict()
+        self._cache_size = 0
+        self._lock = threading.RLock()
+
+    # Objects
+
+    def _refresh_packs(self) -> None:
+        pack_dir = self.objects_dir / "pack"
+        try:
+            mtime = pack_dir.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._packs_mtime:
+            return
+        idx_files = set(pack_dir.glob("pack-*.idx"))
+        for idx_path in list(self._packs):
+            if idx_path not in idx_files:
+                self._packs.pop(idx_path).close()
+        for idx_path in idx_files - set(self._packs):
+            try:
+                self._packs[idx_path] = PackFile(idx_path)
+            except (OSError, ValueError) as e:
+                logger.debug("Skipping pack %s: %s", idx_path, e)
+        self._packs_mtime = mtime
+
+    def _cache_object(self, sha: bytes, obj: tuple[str, bytes]) -> None:
+        if len(obj[1]) > self.max_cache_size:
+            return
+        self._cache[sha] = obj
+        self._cache_size += len(obj[1])
+        while self._cache_size > self.max_cache_size:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cache_size -= len(evicted)
+
+    def _read_loose(self, sha: str) -> tuple[str, bytes] | None:
+        path = self.objects_dir / sha[:2] / sha[2:]
+        try:
+            data = zlib.decompress(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        header, _, content = data.partition(b"\0")
+        object_type = header.split(b" ")[0].decode("ascii")
+        return object_type, content
+
+    def _read_packed(self, sha: bytes) -> tuple[str, bytes] | None:
+        for pack in list(self._packs.values()):
+            offset = pack.find_offset(sha)
+            if offset is not None:
+                return self._read_pack_object(pack, offset)
+        return None
+
+    def _read_pack_object(self, pack: PackFile, offset: int) -> tuple[str, bytes] | None:
+        # Offset deltas are followed down to a whole object, a ref delta or a cached base, then applied upwards.
+        # Objects that share a delta chain are usually read together, so the bases are cached.
+        deltas = []
+        while True:
+            cache_key = f"{pack.idx_path}:{offset}".encode()
+            base_object = self._cache.get(cache_key) if deltas else None
+            if base_object is not None:
+                break
+            type_code, data, base = pack.read_entry(offset)
+            if type_code == _OFS_DELTA:
+                deltas.append((cache_key, data))
+                offset = base
+                continue
+            if type_code == _REF_DELTA:
+                base_object = self._read_binary(base)
+                if base_object is None:
+                    return None
+                base_object = (base_object[0], apply_delta(base_object[1], data))
+            else:
+                base_object = (OBJECT_TYPES[type_code], data)
+            if deltas:
+                self._cache_object(cache_key, base_object)
+            break
+        for index in range(len(deltas) - 1, -1, -1):
+            cache_key, data = deltas[index]
+            base_object = (base_object[0], apply_delta(base_object[1], data))
+            if index:
+                self._cache_object(cache_key, base_object)
+        return base_object
+
+    def _read_binary(self, sha: bytes) -> tuple[str, bytes] | None:
+        with self._lock:
+            cached = self._cache.get(sha)
+            if cached is not None:
+                self._cache.move_to_end(sha)
+                return cached
+            self._refresh_packs()
+            obj = self._read_loose(sha.hex()) or self._read_packed(sha)
+            if obj is None:
+                # The object may be in a pack created after the last refresh.
+                self._packs_mtime = None
+                self._refresh_packs()
+                obj = self._read_packed(sha)
+            if obj is not None:
+                self._cache_object(sha, obj)
+            return obj
+
+    def read_object(self, sha: str) -> tuple[str, bytes] | None:
+        """Reads an object by its hex SHA-1.
+
+        Returns:
+            The type ('commit', 'tree', 'blob' or 'tag') and content of the object, or None if it is not found.
+        """
+        try:
+            return self._read_binary(bytes.fromhex(sha))
+        except (OSError, ValueError, zlib.error, IndexError) as e:
+            logger.debug("Could not read object %s: %s", sha, e)
+            return None
+
+    def read_commit(self, sha: str) -> dict[str, str | list[str]] | None:
+        """Parses the headers of a commit.
+
+        Returns:
+            A dictionary with 'tree', 'parents' (list of hashes), 'author' and 'committer', or None if the
+            object is not a readable commit.
+        """
+        obj = self.read_object(sha)
+        if obj is None or obj[0] != "commit":
+            return None
+        commit: dict[str, str | list[str]] = {"parents": []}
+        for line in obj[1].split(b"\n"):
+            if not line:
+                break
+            key, _, value = line.decode("utf-8", errors="replace").partition(" ")
+            if key == "parent":
+                commit["parents"].append(value)
+            elif key in {"tree", "author", "committer"}:
+                commit[key] = value
+        return commit
+
+    def read_tree(self, sha: str) -> list[tuple[bytes, str, str]] | None:
+        """Parses a tree object.
+
+        Returns:
+            The mode, name and hex SHA-1 of each entry, or None if the object is not a readable tree.
+        """
+        obj = self.read_object(sha)
+        if obj is None or obj[0] != "tree":
+            return None
+        entries = []
+        data = obj[1]
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            null = data.index(b"\0", space)
+            mode = data[pos:space]
+            name = data[space + 1 : null].decode("utf-8", errors="surrogateescape")
+            entries.append((mode, name, data[null + 1 : null + 21].hex()))
+            pos = null + 21
+        return entries
+
+    # Refs
+
+    def _read_packed_refs(self) -> dict[str, str]:
+        path = self.common_dir / "packed-refs"
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return {}
+        if mtime != self._packed_refs_mtime:
+            refs = {}
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if not line or line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.partition(" ")
+                refs[name] = sha
+            self._packed_refs = refs
+            self._packed_refs_mtime = mtime
+        return self._packed_refs
+
+    def read_ref(self, name: str, depth: int = 0) -> str | None:
+        """Resolves a full ref name such as 'refs/remotes/origin/master' or 'HEAD', following symbolic refs.
+
+        Returns:
+            The hex SHA-1 the ref points to, or None if it does not exist.
+        """
+        if depth > 5:  # noqa: PLR2004
+            return None
+        for folder in (self.git_dir, self.common_dir):
+            try:
+                content = (folder / name).read_text(encoding="utf-8").strip()
+            except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+                continue
+            if content.startswith("ref: "):
+                return self.read_ref(content[5:], depth + 1)
+            return content if _SHA_PATTERN.match(content) else None
+        return self._read_packed_refs().get(name)
+
+    def _peel(self, sha: str, object_type: str) -> str | None:
+        for _ in range(10):
+            obj = self.read_object(sha)
+            if obj is None:
+                return None
+            if obj[0] == object_type:
+                return sha
+            # The first header of a tag is the object it points to, and the first header of a commit its tree.
+            if obj[0] == "tag" or (obj[0] == "commit" and object_type == "tree"):
+                sha = obj[1].split(b"\n", 1)[0].split(b" ")[1].decode("ascii")
+            else:
+                return None
+        return None
+
+    def resolve(self, rev: str) -> str | None:
+        """Resolves a revision to a hex SHA-1 like `git rev-parse --verify`.
+
+        Only full hashes and ref names, optionally followed by '^{commit}' or '^{tree}', are supported.
+
+        Returns:
+            The hex SHA-1, or None if the revision is unknown or uses syntax the store does not support.
+        """
+        match = _PEEL_PATTERN.match(rev)
+        if match:
+            sha = self.resolve(match.group("rev"))
+            return self._peel(sha, match.group("type")) if sha else None
+        if _SHA_PATTERN.match(rev):
+            return rev if self.read_object(rev) else None
+        if any(character in rev for character in "^~:@{}*?[\\ ") or ".." in rev:
+            return None
+        for name in (rev, f"refs/{rev}", f"refs/tags/{rev}", f"refs/heads/{rev}", f"refs/remotes/{rev}"):
+            if name != "HEAD" and "/" not in name:
+                continue
+            sha = self.read_ref(name)
+            if sha:
+                return sha
+        return self.read_ref(f"refs/remotes/{rev}/HEAD")
+
+    # Trees
+
+    def lookup_path(self, rev: str, path: str) -> tuple[bytes, str] | None:
+        """Finds a path in the tree of a revision.
+
+        Args:
+            rev: Revision, see `resolve`.
+            path: Path relative to the root of the repository. An empty string is the root tree.
+
+        Returns:
+            The mode and hex SHA-1 of the entry, or None if the path or revision is not found.
+        """
+        sha = self.resolve(f"{rev}^{{tree}}")
+        if sha is None:
+            return None
+        mode = _TREE_MODE
+        for part in [part for part in path.split("/") if part]:
+            if mode != _TREE_MODE:
+                return None
+            entries = self.read_tree(sha)
+            if entries is None:
+                return None
+            for entry_mode, name, entry_sha in entries:
+                if name == part:
+                    mode, sha = entry_mode, entry_sha
+                    break
+            else:
+                return None
+        return mode, sha
+
+    def walk_tree(self, sha: str, prefix: str = "") -> Iterator[tuple[str, bytes, str]]:
+        """Yields the path, mode and hex SHA-1 of every file in a tree, like `git ls-tree -r`."""
+        for mode, name, entry_sha in self.read_tree(sha) or []:
+            path = f"{prefix}{name}"
+            if mode == _TREE_MODE:
+                yield from self.walk_tree(entry_sha, f"{path}/")
+            else:
+                yield path, mode, entry_sha
+
+    def read_blob(self, rev: str, path: str) -> bytes | None:
+        """Reads a file at a revision.
+
+        Returns:
+            The content of the file, or None if it is not found or is not a regular file.
+        """
+        entry = self.lookup_path(rev, path)
+        if entry is None or entry[0] in {_TREE_MODE, _SUBMODULE_MODE}:
+            return None
+        obj = self.read_object(entry[1])
+        return obj[1] if obj and obj[0] == "blob" else None
+
+    # History
+
+    def _commit_date(self, sha: str) -> int:
+        commit = self.read_commit(sha)
+        if commit is None or "committer" not in commit:
+            raise LookupError(sha)
+        return int(commit["committer"].rsplit(" ", 2)[-2])
+
+    def read_parents(self, sha: str) -> tuple[int, list[str]]:
+        """Returns the committer timestamp and the parents of a commit.
+
+        Raises:
+            LookupError: If the commit cannot be read.
+        """
+        return self._commit_date(sha), self.read_commit(sha)["parents"]
+
+    def merge_base(self, first: str, second: str) -> str | None:
+        """Finds a best common ancestor of two commits, like `git merge-base` without --all.
+
+        Commits are walked newest first by committer date, painting the ancestors of each side until every
+        pending commit is known to be below a common ancestor.
+
+        Args:
+            first: Hex SHA-1 of a commit.
+            second: Hex SHA-1 of another commit.
+
+        Returns:
+            The hex SHA-1 of the merge base, or None if there is none or a commit could not be read.
+        """
+        if first == second:
+            return first
+        side_one, side_two, stale = 1, 2, 4
+        flags = {first: side_one, second: side_two}
+        try:
+            queue = [(-self._commit_date(first), first), (-self._commit_date(second), second)]
+            heapq.heapify(queue)
+            results = []
+            while any(not flags[sha] & stale for _, sha in queue):
+                _, sha = heapq.heappop(queue)
+                commit_flags = flags[sha]
+                if commit_flags & (side_one | side_two) == side_one | side_two and not commit_flags & stale:
+                    results.append(sha)
+                    commit_flags |= stale
+                    flags[sha] = commit_flags
+                for parent in self.read_commit(sha)["parents"]:
+                    if flags.get(parent, 0) & commit_flags == commit_flags:
+                        continue
+                    flags[parent] = flags.get(parent, 0) | commit_flags
+                    heapq.heappush(queue, (-self._commit_date(parent), parent))
+        except (LookupError, TypeError, ValueError) as e:
+            logger.debug("Could not compute the merge base of %s and %s: %s", first, second, e)
+            return None
+        return results[0] if results else None
+
+
+def find_git_dirs(folder: Path) -> tuple[Path, Path] | None:
+    """Finds the git folder and the common folder of the repository that contains a folder.
+
+    Returns:
+        The git folder and the common folder, or None if the folder is not inside a git repository.
+    """
+    for current in (folder, *folder.parents):
+        dot_git = current / ".git"
+        if dot_git.is_dir():
+            return dot_git, dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if not content.startswith("gitdir: "):
+                return None
+            git_dir = (current / content[8:]).resolve()
+            common_dir = git_dir
+            commondir_file = git_dir / "commondir"
+            if commondir_file.exists():
+                common_dir = (git_dir / commondir_file.read_text(encoding="utf-8").strip()).resolve()
+            return git_dir, common_dir
+    return None
+
+
+_STORES: dict[Path, GitObjectStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_object_store(folder: Path | None = None) -> GitObjectStore | None:
+    """Returns the object store of the repository that contains a folder.
+
+    Args:
+        folder: A folder inside the repository. Defaults to the current working directory.
+
+    Returns:
+        The shared store of the repository, or None if there is no repository or it uses a format the store
+        does not support (SHA-256 objects, reftable, partial clones, alternates). Callers then use the git CLI.
+    """
+    git_dirs = find_git_dirs(Path(folder or os.getcwd()).resolve())
+    if git_dirs is None:
+        return None
+    git_dir, common_dir = git_dirs
+    with _STORES_LOCK:
+        if git_dir not in _STORES:
+            config_file = common_dir / "config"
+            config = config_file.read_text(encoding="utf-8").lower() if config_file.exists() else ""
+            unsupported = ("objectformat", "refstorage", "promisor", "partialclone")
+            if any(key in config for key in unsupported) or (common_dir / "objects" / "info" / "alternates").exists():
+                return None
+            _STORES[git_dir] = GitObjectStore(git_dir, common_dir)
+        return _STORES[git_dir]
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from code_review.plugins.git.history import count_ahead_behind
+from code_review.plugins.git.object_store import find_git_dirs
+
+logger = logging.getLogger(__name__)
+
+# Stored in the common git directory so every worktree and every run of the tool shares it.
+REACHABILITY_FILE = "code_review_reachability.json"
+
+
+class ReachabilityIndex:
+    """Answers whether branch tips are merged into base branches, remembering the answers between runs.
+
+    For each base the index keeps the commit it was computed at and the branch tips found merged and not merged.
+    A tip is merged into a base when the base can reach it. When the base moves forward, tips that were merged
+    stay merged, so only new tips and tips that were not merged are checked again, in one walk of the new
+    commits. If the base was rewritten (it cannot reach its previous commit) everything is checked again.
+    """
+
+    def __init__(self, cwd: Path | None = None) -> None:
+        """Initializes the ReachabilityIndex.
+
+        Args:
+            cwd: Folder of the repository. Defaults to the current working directory when the index is used.
+        """
+        self.cwd = cwd
+        self._lock = threading.Lock()
+
+    def _get_file(self) -> Path | None:
+        git_dirs = find_git_dirs(Path(self.cwd or os.getcwd()).resolve())
+        return git_dirs[1] / REACHABILITY_FILE if git_dirs else None
+
+    @staticmethod
+    def _load(index_file: Path | None) -> dict:
+        if index_file is None or not index_file.exists():
+            return {}
+        try:
+            return json.loads(index_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable reachability index %s: %s", index_file, e)
+            return {}
+
+    @staticmethod
+    def _save(index_file: Path | None, index: dict) -> None:
+        if index_file is None:
+            return
+        temporary_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            temporary_file.write_text(json.dumps(index), encoding="utf-8")
+            temporary_file.replace(index_file)
+        except OSError as e:
+            logger.debug("Could not save the reachability index %s: %s", index_file, e)
+
+    def get_merged(self, tips: dict[str, str], bases: dict[str, str]) -> dict[str, dict[str, bool]]:
+        """Checks for every (branch, base) pair whether the branch is merged into the base.
+
+        Args:
+            tips: Names of the branches and the hashes of the commits they point to.
+            bases: Names of the bases and the hashes of the commits they point to.
+
+        Returns:
+            For every base, whether each branch is merged into it, e.g. {'origin/master': {'origin/feature/x': False}}.
+        """
+        with self._lock:
+            index_file = self._get_file()
+            index = self._load(index_file)
+            known = {}
+            previous_tips = {}
+            for base, base_hash in bases.items():
+                entry = index.get(base, {})
+                if entry.get("tip") == base_hash:
+                    known[base] = (set(entry.get("merged", [])), set(entry.get("unmerged", [])))
+                elif entry.get("tip"):
+                    known[base] = (set(entry.get("merged", [])), set())
+                    previous_tips[base] = entry["tip"]
+                else:
+                    known[base] = (set(), set())
+
+            # Drop what was known about bases that were rewritten instead of moved forward.
+            if previous_tips:
+                previous = {f"previous:{base}": tip for base, tip in previous_tips.items()}
+                moved = count_ahead_behind(previous, {base: bases[base] for base in previous_tips})
+                for base in previous_tips:
+                    if moved.get(base, {}).get(f"previous:{base}", (1, 0))[0]:
+                        logger.info("Base %s was rewritten, checking every branch again", base)
+                        known[base] = (set(), set())
+
+            tip_hashes = set(tips.values())
+            unknown = {sha for merged, unmerged in known.values() for sha in tip_hashes if sha not in merged | unmerged}
+            status = count_ahead_behind({sha: sha for sha in unknown}, bases) if unknown else {}
+
+            results = {}
+            for base, base_hash in bases.items():
+                merged, unmerged = known[base]
+                for sha in unknown - merged - unmerged:
+                    ahead = status.get(base, {}).get(sha, (1, 0))[0]
+                    (unmerged if ahead else merged).add(sha)
+                index[base] = {
+                    "tip": base_hash,
+                    "merged": sorted(merged & tip_hashes),
+                    "unmerged": sorted(unmerged & tip_hashes),
+                }
+                results[base] = {name: sha in merged for name, sha in tips.items()}
+            logger.debug("Checked %d branch tips against %d bases", len(unknown), len(bases))
+            self._save(index_file, index)
+        return results
+
+
+REACHABILITY_INDEX = ReachabilityIndex()
@@ -0,0 +1,154 @@
+import logging
+import os
+import subprocess
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Commands whose output only depends on the refs and objects of the repository. `diff` and `show` are only
+# memoized when they name their revisions, see `_is_memoizable`.
+MEMOIZED_COMMANDS = {
+    "cat-file",
+    "describe",
+    "diff",
+    "for-each-ref",
+    "log",
+    "ls-tree",
+    "merge-base",
+    "rev-list",
+    "rev-parse",
+    "show",
+}
+
+# Commands that can move refs or HEAD. Running one of them discards every memoized result.
+INVALIDATING_COMMANDS = {
+    "am",
+    "branch",
+    "checkout",
+    "cherry-pick",
+    "commit",
+    "fetch",
+    "merge",
+    "pull",
+    "push",
+    "rebase",
+    "reset",
+    "revert",
+    "stash",
+    "switch",
+    "tag",
+    "update-ref",
+}
+
+
+class GitRunner:
+    """Runs git commands, memoizing read-only ones while a memoization session is active.
+
+    Outside a session every command runs as a plain subprocess. Inside one, the result of a read-only command
+    is reused for the same arguments and repository until a command that can move refs runs, e.g. a fetch,
+    checkout or pull.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the GitRunner."""
+        self._results: dict[tuple[str, tuple[str, ...]], subprocess.CompletedProcess] = {}
+        self._lock = threading.Lock()
+        self._sessions = 0
+        self.calls = 0
+        self.executed = 0
+
+    @property
+    def saved(self) -> int:
+        """Number of subprocesses avoided by reusing memoized results."""
+        return self.calls - self.executed
+
+    def run(
+        self, args: list[str], check: bool = False, cwd: Path | None = None, input: str | None = None
+    ) -> subprocess.CompletedProcess:
+        """Runs a git command and captures its output as text.
+
+        Args:
+            args: Arguments of the command without the leading 'git', e.g. ['rev-parse', 'HEAD'].
+            check: Raise CalledProcessError if the command fails, like `subprocess.run`.
+            cwd: Folder of the repository. Defaults to the current working directory.
+            input: Text sent to the standard input of the command. Commands with input are not memoized.
+
+        Returns:
+            The completed process. Memoized results are shared, so they must not be modified.
+        """
+        command = args[0] if args else ""
+        memoizable = input is None and _is_memoizable(args)
+        key = (str(cwd or os.getcwd()), tuple(args))
+        with self._lock:
+            self.calls += 1
+            result = self._results.get(key) if self._sessions and memoizable else None
+            if command in INVALIDATING_COMMANDS:
+                self._results.clear()
+
+        if result is None:
+            result = subprocess.run(["git", *args], capture_output=True, text=True, check=False, cwd=cwd, input=input)
+            with self._lock:
+                self.executed += 1
+                if self._sessions and memoizable:
+                    self._results[key] = result
+                if command in INVALIDATING_COMMANDS:
+                    self._results.clear()
+
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+        return result
+
+    def clear(self) -> None:
+        """Discards every memoized result."""
+        with self._lock:
+            self._results.clear()
+
+    @contextmanager
+    def memoize(self) -> Iterator["GitRunner"]:
+        """Context manager that memoizes read-only git commands, e.g. for the length of a review.
+
+        Sessions can be nested; the memoized results are discarded when the outermost session ends.
+        """
+        with self._lock:
+            if not self._sessions:
+                self.calls = 0
+                self.executed = 0
+            self._sessions += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._sessions -= 1
+                finished = not self._sessions
+                if finished:
+                    self._results.clear()
+            if finished:
+                logger.info("Ran %d git commands, %d subprocesses saved by memoization", self.calls, self.saved)
+
+
+def _is_memoizable(args: list[str]) -> bool:
+    """Checks if the output of a command only depends on the refs and objects of the repository.
+
+    `diff` reads the working tree or the index unless it compares two revisions, and `show` shows HEAD unless it
+    is given a revision.
+    """
+    command = args[0] if args else ""
+    if command not in MEMOIZED_COMMANDS:
+        return False
+    if command not in {"diff", "show"}:
+        return True
+    options = args[1:]
+    if "--" in options:
+        options = options[: options.index("--")]
+    revisions = [arg for arg in options if not arg.startswith("-")]
+    if command == "show":
+        return bool(revisions)
+    if "--no-index" in options:
+        return False
+    return len(revisions) > 1 or any(".." in revision for revision in revisions)
+
+
+GIT_RUNNER = GitRunner()
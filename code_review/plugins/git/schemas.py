@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+class MergeConflictSchema(BaseModel):
+    """Schema for the predicted result of merging a branch into its base branch."""
+
+    branch: str = Field(description="Ref of the branch that would be merged, e.g. 'origin/feature/x'")
+    base: str = Field(description="Ref of the branch it would be merged into, e.g. 'origin/develop'")
+    branch_hash: str = Field(description="Commit hash of the branch")
+    base_hash: str = Field(description="Commit hash of the base branch")
+    has_conflicts: bool | None = Field(
+        default=None, description="Whether the merge has conflicts. None if it could not be predicted"
+    )
+    conflicted_files: list[str] = Field(default_factory=list, description="Files with conflicts")
+    error: str | None = Field(default=None, description="Error that prevented the prediction, if any")
@@ -0,0 +1,115 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+from rich.table import Table
+
+from code_review.enums import BranchSyncStatus
+from code_review.handlers.file_handlers import change_directory, get_all_project_folder
+from code_review.plugins.git.handlers import get_sync_status, sync_branches
+from code_review.settings import CLI_CONSOLE, CURRENT_CONFIGURATION
+
+logger = logging.getLogger(__name__)
+
+
+class RepositorySyncResult(BaseModel):
+    """Schema for the result of syncing the default branches of one repository."""
+
+    project: str = Field(description="Name of the project")
+    statuses: dict[str, BranchSyncStatus] = Field(default_factory=dict, description="Sync status of each branch")
+    in_sync: bool | None = Field(default=None, description="Whether master and develop have the same tree")
+    error: str | None = Field(default=None, description="Error that stopped the sync, if any")
+
+
+def sync_repository(folder: Path, branches: list[str], force_fetch: bool = False) -> RepositorySyncResult:
+    """Fast-forwards the default branches of a repository and checks that master and develop are in sync.
+
+    It runs in a worker process of `sync_all_repositories`, so changing the working directory does not affect other
+    repositories. Errors are recorded in the result instead of being raised.
+
+    Args:
+        folder: Path to the git repository.
+        branches: Default branches to sync. The first two are compared, e.g. ['master', 'develop'].
+        force_fetch: Fetch even if the remote was fetched recently.
+    """
+    CLI_CONSOLE.quiet = True
+    result = RepositorySyncResult(project=folder.name)
+    try:
+        change_directory(folder)
+        result.statuses = sync_branches(branches, force_fetch=force_fetch)
+        if len(branches) > 1:
+            result.in_sync, _, _ = get_sync_status(branches[0], branches[1])
+    except Exception as e:  # noqa: BLE001
+        logger.error("Could not sync %s: %s", folder, e)
+        result.error = str(e)
+    return result
+
+
+def sync_all_repositories(
+    base_folder: Path,
+    branches: list[str] | None = None,
+    max_workers: int | None = None,
+    force_fetch: bool = False,
+    exclusion_list: list[str] | None = None,
+) -> list[RepositorySyncResult]:
+    """Syncs the default branches of every git project in a base folder concurrently.
+
+    The work is mostly waiting on the network, so up to ``max_workers`` repositories are synced at the same time
+    and the whole run takes about as long as the slowest repository.
+
+    Args:
+        base_folder: Folder that contains the git projects.
+        branches: Branches to sync. Defaults to the 'default_branches' setting.
+        max_workers: Number of repositories synced at the same time. Defaults to 8.
+        force_fetch: Fetch even if a remote was fetched recently.
+        exclusion_list: Names of project folders to leave out.
+
+    Returns:
+        The results sorted by project.
+    """
+    project_folders = get_all_project_folder(base_folder, exclusion_list)
+    if not project_folders:
+        return []
+    branches = branches or CURRENT_CONFIGURATION.get("default_branches", ["master", "develop"])
+    max_workers = min(max_workers or 8, len(project_folders))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(sync_repository, folder.resolve(), branches, force_fetch): folder
+            for folder in project_folders
+        }
+        for future in as_completed(futures):
+            folder = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # noqa: BLE001
+                logger.error("Sync of %s failed: %s", folder, e)
+                result = RepositorySyncResult(project=folder.name, error=str(e))
+            CLI_CONSOLE.print(f"Synced [cyan]{folder.name}[/cyan]")
+            results.append(result)
+    return sorted(results, key=lambda result: result.project)
+
+
+def display_sync_summary(results: list[RepositorySyncResult], branches: list[str]) -> None:
+    """Prints one table with the sync status of every repository."""
+    table = Table(title="Repository Sync")
+    table.add_column("Project", style="cyan")
+    for branch in branches:
+        table.add_column(branch)
+    table.add_column("In sync")
+
+    ok_statuses = {BranchSyncStatus.UP_TO_DATE, BranchSyncStatus.UPDATED, BranchSyncStatus.CREATED}
+    for result in results:
+        if result.error:
+            table.add_row(result.project, *[""] * len(branches), f"[red]Error: {result.error}[/red]")
+            continue
+        cells = []
+        for branch in branches:
+            status = result.statuses.get(branch)
+            color = "green" if status in ok_statuses else "red"
+            cells.append(f"[{color}]{status.value}[/{color}]" if status else "")
+        in_sync = {True: "[green]yes[/green]", False: "[red]no[/red]", None: ""}[result.in_sync]
+        table.add_row(result.project, *cells, in_sync)
+    CLI_CONSOLE.print(table)
@@ -0,0 +1,69 @@
+import logging
+
+from code_review.handlers.cache_handlers import DiskCache, hash_key
+from code_review.plugins.git.handlers import LazyWorktree, list_files_by_suffix
+from code_review.plugins.linting.ast.engine import AstRule, AstRuleEngine
+from code_review.plugins.linting.ruff.cache import PYTHON_SUFFIXES
+from code_review.schemas import RulesResult
+from code_review.settings import CACHE_FOLDER
+
+logger = logging.getLogger(__name__)
+
+# The results of a file only depend on its content and the rules, so entries are shared by every path, branch
+# and project that has the same file.
+AST_CACHE = DiskCache(CACHE_FOLDER / "ast", max_entries=200_000, max_size=200 * 1024 * 1024)
+
+# Changes when the engine changes how results are built, e.g. the fields stored for each result.
+ENGINE_VERSION = "2"
+
+
+def get_rule_set_version(rules: list[type[AstRule]]) -> str:
+    """Returns a hash of the names and versions of the rules, so a new or changed rule misses the cache."""
+    return hash_key(ENGINE_VERSION, sorted((rule.__module__, rule.__qualname__, rule.version) for rule in rules))
+
+
+def get_branch_findings(
+    ref: str, worktree: LazyWorktree, rules: list[type[AstRule]], files: list[str] | None = None
+) -> list[RulesResult]:
+    """Runs the AST rules over the Python files of a branch, reusing the results of files analyzed before.
+
+    Files are identified by their git blob hashes, which are read without checking out the branch. Only the
+    files that miss the cache are parsed, so the work of a review grows with the files changed on the branch
+    instead of the size of the project, and the worktree is not created when every file is cached.
+
+    Args:
+        ref: Ref of the branch.
+        worktree: Worktree of the branch, used to read the files that miss the cache.
+        rules: Classes of the rules to run.
+        files: Paths relative to the root of the repository to analyze instead of every Python file.
+
+    Returns:
+        The results sorted by file and line.
+    """
+    blob_hashes = list_files_by_suffix(ref, PYTHON_SUFFIXES)
+    if files is not None:
+        blob_hashes = {path: blob_hashes[path] for path in files if path in blob_hashes}
+    rule_set_version = get_rule_set_version(rules)
+    keys = {path: hash_key(blob_hash, rule_set_version) for path, blob_hash in blob_hashes.items()}
+
+    findings = []
+    missing = []
+    for path, key in keys.items():
+        cached = AST_CACHE.get(key)
+        if cached is None:
+            missing.append(path)
+        else:
+            findings.extend(RulesResult(file=path, **item) for item in cached)
+    logger.info("Reusing the AST results of %d of %d files of %s", len(keys) - len(missing), len(keys), ref)
+
+    if missing:
+        analyzed = AstRuleEngine(rules).analyze_files(worktree.folder, missing)
+        # Files without results are stored too, so they are not parsed again.
+        AST_CACHE.set_many(
+            {
+                keys[path]: [result.model_dump(exclude={"file"}) for result in results]
+                for path, results in analyzed.items()
+            }
+        )
+        findings.extend(result for results in analyzed.values() for result in results)
+    return sorted(findings, key=lambda result: (result.file, result.line or 0, result.name))
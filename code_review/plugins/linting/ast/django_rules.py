@@ -0,0 +1,406 @@
+"""AST rules that find Django ORM code running one query per row (N+1 queries).
+
+The rules only see one module at a time and know nothing about the models, so they rely on how querysets are
+usually written: a queryset is a chain of queryset methods that starts at ``Model.objects``, and reading an
+attribute of an attribute of a row, e.g. ``book.author.name``, follows a relation.
+"""
+
+import ast
+from typing import NamedTuple
+
+from code_review.plugins.linting.ast.engine import AstRule, FileContext
+
+# Methods that return a queryset from a queryset.
+QUERYSET_METHODS = {
+    "all",
+    "alias",
+    "annotate",
+    "defer",
+    "distinct",
+    "exclude",
+    "filter",
+    "iterator",
+    "only",
+    "order_by",
+    "reverse",
+    "select_for_update",
+    "using",
+}
+
+PREFETCH_METHODS = {"select_related", "prefetch_related"}
+
+# Attributes of field values that are not relations, e.g. ``invoice.date.year`` or ``document.file.url``.
+SCALAR_ATTRIBUTES = {
+    "year",
+    "month",
+    "day",
+    "hour",
+    "minute",
+    "second",
+    "microsecond",
+    "tzinfo",
+    "days",
+    "seconds",
+    "url",
+    "width",
+    "height",
+}
+
+# Methods of related managers and querysets. Calling any other method of a field value, e.g.
+# ``book.title.upper()``, is not a query.
+MANAGER_METHODS = (
+    QUERYSET_METHODS | PREFETCH_METHODS | {"count", "exists", "first", "last", "get", "values", "values_list"}
+)
+
+LOOP_NODES = (ast.For, ast.AsyncFor, ast.While, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+class Queryset(NamedTuple):
+    """Relations a queryset loads with its rows, and the lines of the statements that build it."""
+
+    lookups: frozenset[str]
+    all_related: bool = False
+    lines: frozenset[int] = frozenset()
+
+    def covers(self, field: str) -> bool:
+        """Whether the rows of the queryset come with the related objects of a field."""
+        return self.all_related or field in self.lookups
+
+
+def get_lines(node: ast.AST) -> frozenset[int]:
+    """Returns the lines a node spans."""
+    return frozenset(range(node.lineno, (node.end_lineno or node.lineno) + 1))
+
+
+def get_loop_header_lines(loop: ast.AST) -> frozenset[int]:
+    """Returns the lines that start a loop, e.g. ``for book in books:``, without its body.
+
+    Comprehensions are usually short, so all their lines are returned.
+    """
+    if isinstance(loop, (ast.For, ast.AsyncFor)):
+        return frozenset(range(loop.lineno, loop.iter.end_lineno + 1))
+    if isinstance(loop, ast.While):
+        return frozenset(range(loop.lineno, loop.test.end_lineno + 1))
+    return get_lines(loop)
+
+
+def get_lookup_roots(arguments: list[ast.expr]) -> set[str]:
+    """Returns the first field of the lookups given to select_related or prefetch_related.
+
+    Lookups are strings such as 'author__profile' or Prefetch objects whose first argument is the lookup.
+    """
+    roots = set()
+    for argument in arguments:
+        lookup = argument.args[0] if isinstance(argument, ast.Call) and argument.args else argument
+        if isinstance(lookup, ast.Constant) and isinstance(lookup.value, str):
+            roots.add(lookup.value.split("__")[0])
+    return roots
+
+
+def as_queryset(node: ast.expr, known: dict[str, Queryset]) -> Queryset | None:
+    """Returns what a queryset expression loads, or None if the expression does not look like a queryset.
+
+    Args:
+        node: Expression, e.g. ``Book.objects.filter(published=True).select_related("author")``.
+        known: Querysets assigned to names earlier in the function.
+    """
+    lookups = set()
+    all_related = False
+    while True:
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            method = node.func.attr
+            if method in PREFETCH_METHODS:
+                all_related = all_related or (method == "select_related" and not node.args)
+                lookups.update(get_lookup_roots(node.args))
+            elif method not in QUERYSET_METHODS:
+                return None
+            node = node.func.value
+        elif isinstance(node, ast.Attribute) and node.attr == "objects":
+            return Queryset(frozenset(lookups), all_related)
+        elif isinstance(node, ast.Name) and node.id in known:
+            queryset = known[node.id]
+            return Queryset(queryset.lookups | lookups, queryset.all_related or all_related, queryset.lines)
+        else:
+            return None
+
+
+def _get_name(node: ast.expr) -> str | None:
+    """Returns the name of a class or function reference, e.g. 'ModelSerializer' for serializers.ModelSerializer."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _ends_in_count_or_exists(node: ast.Attribute, parents: list[ast.AST]) -> bool:
+    """Whether a chain of calls, e.g. ``author.books.filter(published=True).exists()``, ends in count() or exists()."""
+    current = node
+    if node.attr in {"count", "exists"}:
+        return True
+    for parent in reversed(parents):
+        if isinstance(parent, ast.Call) and parent.func is current:
+            current = parent
+        elif isinstance(parent, ast.Attribute) and parent.value is current:
+            if parent.attr in {"count", "exists"}:
+                return True
+            current = parent
+        else:
+            return False
+    return False
+
+
+class _QuerysetRule(AstRule):
+    """Keeps track of the querysets assigned to names in the function being visited."""
+
+    def __init__(self) -> None:
+        """Initializes the rule."""
+        self.querysets: dict[str, Queryset] = {}
+
+    def visit_FunctionDef(self, _node: ast.FunctionDef, _context: FileContext) -> None:  # noqa: N802
+        """Forgets the querysets of the previous function."""
+        self.querysets = {}
+
+    def visit_AsyncFunctionDef(self, _node: ast.AsyncFunctionDef, _context: FileContext) -> None:  # noqa: N802
+        """Forgets the querysets of the previous function."""
+        self.querysets = {}
+
+    def visit_Assign(self, node: ast.Assign, _context: FileContext) -> None:  # noqa: N802
+        """Tracks the querysets assigned to names."""
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                queryset = as_queryset(node.value, self.querysets)
+                if queryset is None:
+                    self.querysets.pop(target.id, None)
+                else:
+                    self.querysets[target.id] = queryset._replace(lines=queryset.lines | get_lines(node))
+
+
+class RelatedFieldInLoopRule(_QuerysetRule):
+    """Finds relations read for every row of a queryset that does not load them.
+
+    ``for book in Book.objects.all(): book.author.name`` runs one query per book to get its author.
+    """
+
+    name = "N+1 Related Field In Loop"
+    version = "2"
+
+    def __init__(self) -> None:
+        """Initializes the RelatedFieldInLoopRule."""
+        super().__init__()
+        # Loop variable, queryset, first line and header lines of the loops over querysets being visited.
+        self.loops: list[tuple[str, Queryset, int, frozenset[int]]] = []
+        self.reported: set[tuple[int, str]] = set()
+
+    def _enter_loop(self, target: ast.expr, iterable: ast.expr, line: int, header_lines: frozenset[int]) -> None:
+        queryset = as_queryset(iterable, self.querysets)
+        if queryset is not None and isinstance(target, ast.Name):
+            self.loops.append((target.id, queryset, line, header_lines))
+
+    def _leave_loop(self, line: int) -> None:
+        self.loops = [loop for loop in self.loops if loop[2] != line]
+
+    def visit_For(self, node: ast.For, _context: FileContext) -> None:  # noqa: N802
+        """Starts tracking a loop over a queryset."""
+        self._enter_loop(node.target, node.iter, node.lineno, get_loop_header_lines(node))
+
+    def leave_For(self, node: ast.For, _context: FileContext) -> None:  # noqa: N802
+        """Stops tracking the loop."""
+        self._leave_loop(node.lineno)
+
+    def visit_AsyncFor(self, node: ast.AsyncFor, _context: FileContext) -> None:  # noqa: N802
+        """Starts tracking a loop over a queryset."""
+        self._enter_loop(node.target, node.iter, node.lineno, get_loop_header_lines(node))
+
+    def leave_AsyncFor(self, node: ast.AsyncFor, _context: FileContext) -> None:  # noqa: N802
+        """Stops tracking the loop."""
+        self._leave_loop(node.lineno)
+
+    def _enter_comprehension(self, node: ast.ListComp | ast.SetComp | ast.DictComp | ast.GeneratorExp) -> None:
+        # The element of a comprehension is visited before its generators, so the loops start at the comprehension.
+        for generator in node.generators:
+            self._enter_loop(generator.target, generator.iter, node.lineno, get_loop_header_lines(node))
+
+    def visit_ListComp(self, node: ast.ListComp, _context: FileContext) -> None:  # noqa: N802
+        """Starts tracking the loops of the comprehension over querysets."""
+        self._enter_comprehension(node)
+
+    def leave_ListComp(self, node: ast.ListComp, _context: FileContext) -> None:  # noqa: N802
+        """Stops tracking the loops of the comprehension."""
+        self._leave_loop(node.lineno)
+
+    def visit_SetComp(self, node: ast.SetComp, _context: FileContext) -> None:  # noqa: N802
+        """Starts tracking the loops of the comprehension over querysets."""
+        self._enter_comprehension(node)
+
+    def leave_SetComp(self, node: ast.SetComp, _context: FileContext) -> None:  # noqa: N802
+        """Stops tracking the loops of the comprehension."""
+        self._leave_loop(node.lineno)
+
+    def visit_DictComp(self, node: ast.DictComp, _context: FileContext) -> None:  # noqa: N802
+        """Starts tracking the loops of the comprehension over querysets."""
+        self._enter_comprehension(node)
+
+    def leave_DictComp(self, node: ast.DictComp, _context: FileContext) -> None:  # noqa: N802
+        """Stops tracking the loops of the comprehension."""
+        self._leave_loop(node.lineno)
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp, _context: FileContext) -> None:  # noqa: N802
+        """Starts tracking the loops of the comprehension over querysets."""
+        self._enter_comprehension(node)
+
+    def leave_GeneratorExp(self, node: ast.GeneratorExp, _context: FileContext) -> None:  # noqa: N802
+        """Stops tracking the loops of the comprehension."""
+        self._leave_loop(node.lineno)
+
+    def visit_Attribute(self, node: ast.Attribute, context: FileContext) -> None:  # noqa: N802
+        """Reports relations of the rows of the loops that their queryset does not load."""
+        relation = node.value
+        if not (isinstance(relation, ast.Attribute) and isinstance(relation.value, ast.Name)):
+            return
+        if node.attr in SCALAR_ATTRIBUTES or relation.attr.endswith("_id"):
+            return
+        parent = context.parents[-1]
+        if isinstance(parent, ast.Call) and parent.func is node and node.attr not in MANAGER_METHODS:
+            return
+        # Queries that end in count() or exists() are reported by QueryInLoopRule.
+        if _ends_in_count_or_exists(node, context.parents):
+            return
+        for variable, queryset, line, header_lines in self.loops:
+            if relation.value.id != variable or queryset.covers(relation.attr):
+                continue
+            if (line, relation.attr) not in self.reported:
+                self.reported.add((line, relation.attr))
+                context.report(
+                    self,
+                    node,
+                    f"'{variable}.{relation.attr}' runs a query for every row of the queryset on line {line}.",
+                    details=f"Add select_related('{relation.attr}') or prefetch_related('{relation.attr}').",
+                    related_lines=header_lines | queryset.lines,
+                )
+
+
+class QueryInLoopRule(_QuerysetRule):
+    """Finds `.count()` and `.exists()` queries that run on every iteration of a loop."""
+
+    name = "N+1 Query In Loop"
+    version = "3"
+
+    def visit_Call(self, node: ast.Call, context: FileContext) -> None:  # noqa: N802
+        """Reports count() and exists() queries inside loops."""
+        if not isinstance(node.func, ast.Attribute) or node.args or node.keywords:
+            return
+        method = node.func.attr
+        # Other objects have these methods too, e.g. paths have exists() and itertools has count().
+        if method in {"count", "exists"} and self._is_queryset(node.func.value):
+            loop = next((parent for parent in reversed(context.parents) if isinstance(parent, LOOP_NODES)), None)
+            if loop is not None:
+                context.report(
+                    self,
+                    node,
+                    f"'.{method}()' runs a query on every iteration of the loop on line {loop.lineno}.",
+                    details="Annotate the queryset with Count or Exists, or prefetch the related objects.",
+                    related_lines=get_loop_header_lines(loop),
+                )
+
+    def _is_queryset(self, node: ast.expr) -> bool:
+        if as_queryset(node, self.querysets) is not None:
+            return True
+        # Related managers, e.g. item.children.exists() or item.comment_set.filter(...).exists().
+        while isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            if node.func.attr not in QUERYSET_METHODS | PREFETCH_METHODS:
+                return False
+            node = node.func.value
+        return isinstance(node, ast.Attribute) and isinstance(node.value, (ast.Name, ast.Attribute))
+
+
+class NestedSerializerPrefetchRule(AstRule):
+    """Finds nested DRF serializers whose relation is not loaded by the queryset of the view that uses them.
+
+    A view listing books with a serializer that nests ``author = AuthorSerializer()`` runs one query per book
+    unless its ``queryset`` or ``get_queryset`` selects or prefetches 'author'. Only serializers defined in the
+    same module as the view are checked.
+    """
+
+    name = "N+1 Nested Serializer"
+    version = "2"
+
+    def __init__(self) -> None:
+        """Initializes the NestedSerializerPrefetchRule."""
+        # Nested serializer fields of each serializer: name of the relation and the node of the field.
+        self.serializers: dict[str, list[tuple[str, ast.Assign]]] = {}
+        # Name of each view, the name of its serializer and what its queryset loads. The lines of the queryset
+        # include the serializer_class line, since the problem depends on both.
+        self.views: list[tuple[str, str, Queryset]] = []
+
+    def visit_ClassDef(self, node: ast.ClassDef, _context: FileContext) -> None:  # noqa: N802
+        """Collects the nested fields of serializers and the querysets of views."""
+        bases = [_get_name(base) or "" for base in node.bases]
+        if any(base.endswith("Serializer") for base in bases):
+            self.serializers[node.name] = self._get_nested_fields(node)
+        elif any(base.endswith(("ViewSet", "APIView")) for base in bases):
+            self._add_view(node)
+
+    @staticmethod
+    def _get_nested_fields(node: ast.ClassDef) -> list[tuple[str, ast.Assign]]:
+        fields = []
+        for statement in node.body:
+            if not (
+                isinstance(statement, ast.Assign)
+                and len(statement.targets) == 1
+                and isinstance(statement.targets[0], ast.Name)
+                and isinstance(statement.value, ast.Call)
+                and (_get_name(statement.value.func) or "").endswith("Serializer")
+            ):
+                continue
+            source = statement.targets[0].id
+            for keyword in statement.value.keywords:
+                if keyword.arg == "source" and isinstance(keyword.value, ast.Constant):
+                    source = str(keyword.value.value)
+            if source != "*":
+                fields.append((source.split(".")[0], statement))
+        return fields
+
+    def _add_view(self, node: ast.ClassDef) -> None:
+        serializer = None
+        querysets = []
+        lines = frozenset()
+        for statement in node.body:
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+                target = _get_name(statement.targets[0])
+                if target == "serializer_class":
+                    serializer = _get_name(statement.value)
+                    lines |= get_lines(statement)
+                elif target == "queryset":
+                    querysets.append(statement.value)
+                    lines |= get_lines(statement)
+            elif isinstance(statement, ast.FunctionDef) and statement.name == "get_queryset":
+                querysets.append(statement)
+                lines |= get_lines(statement)
+        if serializer is None or not querysets:
+            return
+        lookups = set()
+        all_related = False
+        for queryset in querysets:
+            for call in ast.walk(queryset):
+                method = call.func.attr if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) else None
+                if method in PREFETCH_METHODS:
+                    all_related = all_related or (method == "select_related" and not call.args)
+                    lookups.update(get_lookup_roots(call.args))
+        self.views.append((node.name, serializer, Queryset(frozenset(lookups), all_related, lines)))
+
+    def leave_Module(self, _node: ast.Module, context: FileContext) -> None:  # noqa: N802
+        """Reports the nested fields the querysets of the views using them do not load."""
+        for view, serializer, queryset in self.views:
+            for field, statement in self.serializers.get(serializer, []):
+                if not queryset.covers(field):
+                    context.report(
+                        self,
+                        statement,
+                        f"{serializer} nests '{field}', which {view} does not load with its queryset.",
+                        details=f"Add select_related('{field}') or prefetch_related('{field}') to {view}.",
+                        related_lines=queryset.lines,
+                    )
+
+
+DJANGO_RULES: list[type[AstRule]] = [RelatedFieldInLoopRule, QueryInLoopRule, NestedSerializerPrefetchRule]
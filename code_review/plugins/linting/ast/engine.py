@@ -0,0 +1,201 @@
+import ast
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from code_review.schemas import RulesResult
+
+logger = logging.getLogger(__name__)
+
+# Below this number of files the files are analyzed in the current process, starting workers costs more.
+MIN_FILES_FOR_PROCESS_POOL = 8
+
+
+class FileContext:
+    """What the rules know about the file being analyzed while the engine walks its tree."""
+
+    def __init__(self, file: str, source: str) -> None:
+        """Initializes the FileContext.
+
+        Args:
+            file: Path of the file relative to the project root.
+            source: Content of the file.
+        """
+        self.file = file
+        self.lines = source.splitlines()
+        # Nodes from the module down to the parent of the node being visited.
+        self.parents: list[ast.AST] = []
+        self.results: list[RulesResult] = []
+
+    def report(
+        self,
+        rule: "AstRule",
+        node: ast.AST,
+        message: str,
+        details: str | None = None,
+        related_lines: Iterable[int] = (),
+    ) -> None:
+        """Records a problem found by a rule at a node.
+
+        Args:
+            rule: Rule that found the problem.
+            node: Node the problem is about. Its line is the line of the result.
+            message: Description of the problem.
+            details: More information about the problem.
+            related_lines: Other lines the problem depends on, e.g. the loop a query runs in. A change to any of
+                them can introduce the problem.
+        """
+        line = getattr(node, "lineno", None)
+        self.results.append(
+            RulesResult(
+                name=rule.name,
+                passed=False,
+                level=rule.level,
+                message=message,
+                details=details,
+                file=self.file,
+                line=line,
+                related_lines=sorted(set(related_lines) - {line}),
+            )
+        )
+
+
+class AstRule:
+    """Base class of the rules run by the `AstRuleEngine`.
+
+    A rule handles the node types it cares about with methods named after them: ``visit_Call(node, context)``
+    runs when the engine enters a Call node and ``leave_For(node, context)`` when it leaves a For node, after
+    its children. A new instance is created for every file, so rules can keep state between handlers.
+
+    Results are cached by the content of the files and the versions of the rules, so ``version`` must change
+    whenever a change to the rule changes what it reports.
+    """
+
+    name: str = ""
+    level: str = "WARNING"
+    version: str = "1"
+
+
+class AstRuleEngine:
+    """Runs many AST rules over a file in a single walk of its tree.
+
+    The handlers of the rules are indexed by node type when the engine is created, so visiting a node only calls
+    the handlers registered for its type.
+    """
+
+    def __init__(self, rules: Iterable[type[AstRule]]) -> None:
+        """Initializes the AstRuleEngine.
+
+        Args:
+            rules: Classes of the rules to run.
+        """
+        self.rules = list(rules)
+        self._enter, self._leave = _build_handler_tables(self.rules)
+
+    def analyze_source(self, file: str, source: str) -> list[RulesResult]:
+        """Parses a file once and runs every rule over its tree.
+
+        Args:
+            file: Path of the file relative to the project root.
+            source: Content of the file.
+
+        Returns:
+            The problems found, sorted by line. Files that can not be parsed have none, ruff reports them.
+        """
+        try:
+            tree = ast.parse(source, filename=file)
+        except (SyntaxError, ValueError) as e:
+            logger.debug("Skipping %s, it can not be parsed: %s", file, e)
+            return []
+        context = FileContext(file, source)
+        instances = {rule: rule() for rule in self.rules}
+        enter = {
+            node_type: [(instances[rule], handler) for rule, handler in handlers]
+            for node_type, handlers in self._enter.items()
+        }
+        leave = {
+            node_type: [(instances[rule], handler) for rule, handler in handlers]
+            for node_type, handlers in self._leave.items()
+        }
+        self._walk(tree, context, enter, leave)
+        return sorted(context.results, key=lambda result: (result.line or 0, result.name))
+
+    def analyze_file(self, root: Path, file: str) -> list[RulesResult]:
+        """Reads a file of a project and runs every rule over it.
+
+        Args:
+            root: Folder of the project.
+            file: Path of the file relative to the folder.
+        """
+        try:
+            source = (Path(root) / file).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug("Skipping %s, it can not be read: %s", file, e)
+            return []
+        return self.analyze_source(file, source)
+
+    def analyze_files(
+        self, root: Path, files: list[str], max_workers: int | None = None
+    ) -> dict[str, list[RulesResult]]:
+        """Runs every rule over some files of a project, parsing the files in parallel worker processes.
+
+        Args:
+            root: Folder of the project.
+            files: Paths relative to the folder.
+            max_workers: Number of worker processes. Defaults to the number of CPUs.
+
+        Returns:
+            The problems found in each file.
+        """
+        if not self.rules or not files:
+            return {file: [] for file in files}
+        max_workers = min(max_workers or os.cpu_count() or 1, len(files))
+        if max_workers == 1 or len(files) < MIN_FILES_FOR_PROCESS_POOL:
+            return {file: self.analyze_file(root, file) for file in files}
+        # Files are sent in a few chunks per worker, so the workers are kept busy without a round trip per file.
+        chunk_size = max(1, len(files) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_analyze_file, [(self.rules, root, file) for file in files], chunksize=chunk_size)
+            return dict(zip(files, results, strict=True))
+
+    def _walk(
+        self,
+        node: ast.AST,
+        context: FileContext,
+        enter: dict[type, list[tuple[AstRule, Callable]]],
+        leave: dict[type, list[tuple[AstRule, Callable]]],
+    ) -> None:
+        for rule, handler in enter.get(type(node), ()):
+            handler(rule, node, context)
+        context.parents.append(node)
+        for child in ast.iter_child_nodes(node):
+            self._walk(child, context, enter, leave)
+        context.parents.pop()
+        for rule, handler in leave.get(type(node), ()):
+            handler(rule, node, context)
+
+
+def _build_handler_tables(
+    rules: list[type[AstRule]],
+) -> tuple[dict[type, list[tuple[type[AstRule], Callable]]], dict[type, list[tuple[type[AstRule], Callable]]]]:
+    """Indexes the `visit_<NodeType>` and `leave_<NodeType>` methods of the rules by node type."""
+    tables = {"visit_": defaultdict(list), "leave_": defaultdict(list)}
+    for rule in rules:
+        for attribute in dir(rule):
+            prefix = attribute[:6]
+            if prefix not in tables:
+                continue
+            node_type = getattr(ast, attribute[6:], None)
+            if not isinstance(node_type, type) or not issubclass(node_type, ast.AST):
+                raise ValueError(f"{rule.__name__}.{attribute} does not handle an AST node type")
+            tables[prefix][node_type].append((rule, getattr(rule, attribute)))
+    return dict(tables["visit_"]), dict(tables["leave_"])
+
+
+def _analyze_file(arguments: tuple[list[type[AstRule]], Path, str]) -> list[RulesResult]:
+    """Analyzes one file in a worker process."""
+    rules, root, file = arguments
+    return AstRuleEngine(rules).analyze_file(root, file)
@@ -0,0 +1,42 @@
+import logging
+
+from code_review.plugins.git.handlers import LazyWorktree, get_changed_lines
+from code_review.plugins.linting.ast.cache import get_branch_findings
+from code_review.plugins.linting.ast.engine import AstRule
+from code_review.schemas import RulesResult
+
+logger = logging.getLogger(__name__)
+
+
+def find_issues_on_changed_lines(
+    target_ref: str, source_ref: str, worktree: LazyWorktree, rules: list[type[AstRule]]
+) -> list[RulesResult]:
+    """Runs AST rules over the Python files changed on a branch and keeps the results on changed lines.
+
+    Problems in code the branch did not touch are left out, so a review only reports what the branch adds. A
+    problem is kept when its line or one of the lines it depends on changed, e.g. a relation read in a loop that
+    the branch added around existing code.
+
+    Args:
+        target_ref: Ref of the branch, e.g. 'origin/feature/x'.
+        source_ref: Ref of the branch it was created from, e.g. 'origin/develop'.
+        worktree: Worktree of the target branch, used to read the files that miss the AST cache.
+        rules: Classes of the rules to run.
+
+    Returns:
+        The results sorted by file and line.
+    """
+    changed_lines = get_changed_lines(target_ref, source_ref)
+    findings = get_branch_findings(target_ref, worktree, rules, files=sorted(changed_lines))
+    on_changed_lines = [
+        result
+        for result in findings
+        if not changed_lines.get(result.file, set()).isdisjoint([result.line, *result.related_lines])
+    ]
+    logger.info(
+        "Found %d AST issues on the lines changed on %s, %d more in the rest of the changed files",
+        len(on_changed_lines),
+        target_ref,
+        len(findings) - len(on_changed_lines),
+    )
+    return on_changed_lines
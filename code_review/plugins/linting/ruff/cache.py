@@ -0,0 +1,234 @@
+import hashlib
+import logging
+import posixpath
+from collections import defaultdict
+from pathlib import Path
+
+import tomllib
+
+from code_review.handlers.cache_handlers import DiskCache, hash_key
+from code_review.plugins.git.blob_reader import CatFileReader
+from code_review.plugins.git.handlers import LazyWorktree, get_object_hashes, list_files_by_names, list_files_by_suffix
+from code_review.plugins.linting.ruff.handlers import RUFF_CONFIG_FILES, get_ruff_version, get_ruff_violations
+from code_review.plugins.linting.ruff.schemas import RuffViolation
+from code_review.plugins.linting.ruff.server import get_ruff_server
+from code_review.settings import CACHE_FOLDER
+
+logger = logging.getLogger(__name__)
+
+# The violations of a file only depend on its content, its path, the ruff settings and the ruff version, so
+# entries are shared by every branch and project that has the same file.
+RUFF_CACHE = DiskCache(CACHE_FOLDER / "ruff", max_entries=200_000, max_size=200 * 1024 * 1024)
+
+PYTHON_SUFFIXES = (".py", ".pyi")
+
+
+# In a folder with several settings files ruff uses the first one of these.
+RUFF_CONFIG_PRECEDENCE = (".ruff.toml", "ruff.toml", "pyproject.toml")
+
+# Longest chain of `extend` settings that is followed, so a cycle cannot loop forever.
+MAX_EXTEND_DEPTH = 10
+
+
+class _RuffConfigResolver:
+    """Finds the ruff settings files that apply to the files of a ref, reading them without checking it out.
+
+    Like ruff, the settings of a file come from the closest folder above it with a `.ruff.toml`, a `ruff.toml`
+    or a `pyproject.toml` with a `[tool.ruff]` table, and from the files those settings `extend`.
+    """
+
+    def __init__(self, ref: str, reader: CatFileReader) -> None:
+        """Initializes the _RuffConfigResolver.
+
+        Args:
+            ref: Ref whose settings files are read.
+            reader: Reader of the contents of the settings files.
+        """
+        self.ref = ref
+        self.reader = reader
+        self.blob_hashes: dict[str, str | None] = list_files_by_names(ref, tuple(RUFF_CONFIG_FILES))
+        self._settings: dict[str, dict | None] = {}
+
+    def get_settings(self, path: str) -> dict | None:
+        """Returns the ruff settings of a file of the ref, or None if it has none or does not exist."""
+        if path not in self._settings:
+            if path not in self.blob_hashes:
+                self.blob_hashes.update(get_object_hashes(self.ref, [path]))
+            content = self.reader.read_blob(self.ref, path) if self.blob_hashes[path] else None
+            self._settings[path] = None if content is None else _parse_ruff_settings(path, content)
+        return self._settings[path]
+
+    def find_config(self, folder: str) -> str | None:
+        """Returns the path of the settings file that applies to the files of a folder, or None if there is none."""
+        while True:
+            for name in RUFF_CONFIG_PRECEDENCE:
+                path = posixpath.join(folder, name)
+                if path in self.blob_hashes and self.get_settings(path) is not None:
+                    return path
+            if not folder:
+                return None
+            folder = posixpath.dirname(folder)
+
+    def get_chain(self, config: str | None) -> list[tuple[str, str | None]]:
+        """Returns the settings file and the files it extends, with the hashes of their contents."""
+        chain = []
+        while config is not None and len(chain) < MAX_EXTEND_DEPTH:
+            if config.startswith(("/", "~", "../")):
+                # Outside the repository, e.g. settings shared from the home folder.
+                chain.append((config, _hash_outside_file(Path(config).expanduser())))
+                break
+            chain.append((config, self.blob_hashes.get(config)))
+            extend = (self.get_settings(config) or {}).get("extend")
+            config = _resolve_extend(config, extend) if isinstance(extend, str) else None
+        return chain
+
+
+def _resolve_extend(config: str, extend: str) -> str:
+    """Returns the path of the file a settings file extends, relative to the repository root if it is in it."""
+    if extend.startswith(("/", "~")):
+        return extend
+    return posixpath.normpath(posixpath.join(posixpath.dirname(config), extend))
+
+
+def _hash_outside_file(file: Path) -> str | None:
+    try:
+        return hashlib.sha256(file.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _parse_ruff_settings(path: str, content: bytes) -> dict | None:
+    """Returns the ruff settings of a settings file, or None if it is a `pyproject.toml` without them."""
+    try:
+        data = tomllib.loads(content.decode("utf-8"))
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+        # Ruff reports the broken file. Its content is still part of the hash, so a fix is noticed.
+        logger.debug("Could not parse the ruff settings %s: %s", path, e)
+        return {}
+    if posixpath.basename(path) == "pyproject.toml":
+        tool = data.get("tool")
+        return tool.get("ruff") if isinstance(tool, dict) else None
+    return data
+
+
+def get_ruff_config_hashes(ref: str, files: list[str]) -> dict[str, str]:
+    """Returns a hash of the ruff settings that apply to each file of a ref.
+
+    The hash covers the closest settings file of the file and every file it extends, so a change to nested or
+    shared settings only invalidates the files they apply to.
+
+    Args:
+        ref: Ref of the branch.
+        files: Paths relative to the root of the repository.
+
+    Returns:
+        The hash of the settings of each file.
+    """
+    chains = _get_config_chains(ref, files)
+    return {file: hash_key(chains[posixpath.dirname(file)]) for file in files}
+
+
+def get_ruff_config_files(ref: str, files: list[str]) -> dict[str, str | None]:
+    """Returns the ruff settings files that apply to some files of a ref, see `get_ruff_config_hashes`.
+
+    Args:
+        ref: Ref of the branch.
+        files: Paths relative to the root of the repository.
+
+    Returns:
+        The hash of the content of each settings file, or None for files that can not be read.
+    """
+    return dict(entry for chain in _get_config_chains(ref, files).values() for entry in chain)
+
+
+def _get_config_chains(ref: str, files: list[str]) -> dict[str, list[tuple[str, str | None]]]:
+    """Returns the chain of settings files of each folder that has some of the files."""
+    with CatFileReader() as reader:
+        resolver = _RuffConfigResolver(ref, reader)
+        return {
+            folder: resolver.get_chain(resolver.find_config(folder))
+            for folder in {posixpath.dirname(file) for file in files}
+        }
+
+
+def get_file_cache_key(path: str, blob_hash: str, config_hash: str, ruff_version: str) -> str:
+    """Builds the cache key of the violations of one file.
+
+    The path is part of the key because settings such as per-file-ignores depend on it.
+    """
+    return hash_key(path, blob_hash, config_hash, ruff_version)
+
+
+def get_branch_violations(
+    ref: str, worktree: LazyWorktree, files: list[str] | None = None, ruff_version: str | None = None
+) -> list[RuffViolation] | None:
+    """Lints the Python files of a branch, reusing the violations of files whose content was linted before.
+
+    Files are identified by their git blob hashes, which are read without checking out the branch. Only the
+    files that miss the cache are linted, in one `ruff check` call or through the ruff server of the current
+    session, so the worktree is not created when every file is cached.
+
+    Args:
+        ref: Ref of the branch.
+        worktree: Worktree of the branch, used to lint the files that miss the cache.
+        files: Paths relative to the root of the repository to lint instead of every Python file.
+        ruff_version: Version of ruff. It is looked up if not given.
+
+    Returns:
+        The violations sorted by file and line, or None if ruff could not run.
+    """
+    ruff_version = ruff_version or get_ruff_version()
+    if ruff_version is None:
+        return get_ruff_violations(worktree.folder, files=files)
+
+    blob_hashes = list_files_by_suffix(ref, PYTHON_SUFFIXES)
+    if files is not None:
+        blob_hashes = {path: blob_hashes[path] for path in files if path in blob_hashes}
+    config_hashes = get_ruff_config_hashes(ref, list(blob_hashes))
+    keys = {
+        path: get_file_cache_key(path, blob_hash, config_hashes[path], ruff_version)
+        for path, blob_hash in blob_hashes.items()
+    }
+
+    violations = []
+    missing = []
+    for path, key in keys.items():
+        cached = RUFF_CACHE.get(key)
+        if cached is None:
+            missing.append(path)
+        else:
+            violations.extend(RuffViolation(file=path, **item) for item in cached)
+    logger.info("Reusing the ruff results of %d of %d files of %s", len(keys) - len(missing), len(keys), ref)
+
+    if missing:
+        linted = lint_branch(ref, worktree, missing)
+        if linted is None:
+            return None
+        by_file = defaultdict(list)
+        for violation in linted:
+            by_file[violation.file].append(violation.model_dump(exclude={"file"}))
+        # Files without violations are stored too, so they are not linted again.
+        RUFF_CACHE.set_many({keys[path]: by_file[path] for path in missing})
+        violations.extend(linted)
+    return sorted(violations, key=lambda violation: (violation.file, violation.line, violation.code))
+
+
+def lint_branch(ref: str, worktree: LazyWorktree, files: list[str] | None = None) -> list[RuffViolation] | None:
+    """Lints files of a branch through the ruff server of the current session, or with `ruff check` outside one.
+
+    Args:
+        ref: Ref of the branch. Its Python files are the ones the server lints when no files are given.
+        worktree: Worktree of the branch.
+        files: Paths relative to the root of the repository to lint instead of every Python file.
+
+    Returns:
+        The violations sorted by file and line, or None if ruff could not run.
+    """
+    server = get_ruff_server()
+    if server is not None:
+        server_files = sorted(list_files_by_suffix(ref, PYTHON_SUFFIXES)) if files is None else files
+        linted = server.lint(worktree.folder, server_files)
+        if linted is not None:
+            return linted
+        logger.warning("Falling back to `ruff check` for %s", worktree.folder)
+    return get_ruff_violations(worktree.folder, files=files)
@@ -1,117 +1,218 @@
+import json
 import logging
+import os
 import re
 import subprocess
+import tempfile
+from collections import Counter
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
+from code_review.handlers.cache_handlers import hash_key
+from code_review.plugins.linting.ruff.schemas import RuffDelta, RuffViolation
+
 logger = logging.getLogger(__name__)
 
+# Files ruff reads its settings from, relative to the project root.
+RUFF_CONFIG_FILES = ["pyproject.toml", "ruff.toml", ".ruff.toml"]
+
+
+def get_ruff_version() -> str | None:
+    """Returns the version of the `ruff` command, e.g. '0.6.9', or None if ruff can not be run."""
+    try:
+        result = subprocess.run(["ruff", "--version"], capture_output=True, text=True, check=True)
+    except (FileNotFoundError, subprocess.CalledProcessError) as e:
+        logger.error("Could not get the ruff version: %s", e)
+        return None
+    return result.stdout.strip().split()[-1]
 
-def count_ruff_issues(path: Path) -> int:
-    """Runs `ruff check` on a specified path and returns the total number of issues found.
 
-    This function executes the `ruff check` command as a subprocess, captures its
-    output, and then uses a regular expression to parse the summary line to
-    extract the total count of issues.
+def _get_ruff_targets(path: Path, files: list[str] | None) -> tuple[list[str | Path], Path | None] | None:
+    """Returns the arguments that select what ruff checks and the folder to run it in.
 
     Args:
-        path (Path): The Path object representing the file or directory to check.
+        path: Folder of the project.
+        files: Paths relative to the folder to check instead of the whole folder. Files that do not exist are
+            left out, e.g. files deleted on the branch.
 
     Returns:
-        int: The total number of issues found by ruff. Returns 0 if no issues
-             are found, or -1 if the `ruff` command fails to run.
+        The arguments and the folder, or None if none of the files exist.
     """
-    try:
-        # Run `ruff check` as a subprocess. The stdout and stderr are captured.
-        # `capture_output=True` redirects the command's output to the result object.
-        # `text=True` decodes the output as text.
-        # We specify the path as the argument for the ruff command.
-        result = subprocess.run(
-            ["ruff", "check", path],
-            capture_output=True,
-            text=True,
-            check=False,
-            # check=True
-        )
-        # The last line of the `ruff check` output contains the summary, e.g.,
+    if files is None:
+        return [path], None
+    existing = [file for file in files if (Path(path) / file).is_file()]
+    if not existing:
+        return None
+    # Files given explicitly are checked even if the ruff settings exclude them, unless --force-exclude is set.
+    return ["--force-exclude", *existing], Path(path)
 
-        result_lines = result.stdout.strip().split("\n")
-        last_line = result_lines[-1]
-        if last_line.startswith("[*]"):
-            last_line = result_lines[-2]
 
-        # Use a regular expression to find the number of issues.
-        # The pattern looks for one or more digits (\d+) after "Found " and before " issue".
-        match = re.search(r"Found (\d+) error[s]?", last_line)
+def get_ruff_violations(path: Path, files: list[str] | None = None) -> list[RuffViolation] | None:
+    """Runs `ruff check` and parses its JSON Lines output one violation at a time.
 
-        if match:
-            # If a match is found, extract the number and convert it to an integer.
-            return int(match.group(1))
-        # If the regex doesn't match, it likely means there are no issues.
-        # ruff outputs "Found 0 issues" or similar, but let's be safe and
-        # handle the case where it's a different summary message.
-        # In the absence of a clear number, assume 0 issues.
-        logger.debug("No issue count found in output. Assuming 0 issues.")
-        return 0
+    Only the compact records are kept, so a project with many violations does not hold ruff's whole report in
+    memory.
 
+    Args:
+        path: Folder of the project. Paths in the records are relative to it.
+        files: Paths relative to ``path`` to check instead of the whole folder, e.g. the files changed on a branch.
+
+    Returns:
+        The violations sorted by file and line, or None if ruff could not run.
+    """
+    targets = _get_ruff_targets(path, files)
+    if targets is None:
+        return []
+    arguments, cwd = targets
+    command = ["ruff", "check", "--output-format", "json-lines", "--exit-zero", *arguments]
+    try:
+        # stderr goes to a file so a long warning can not block ruff while stdout is being read.
+        with tempfile.TemporaryFile(mode="w+") as stderr:
+            with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, text=True, cwd=cwd) as process:
+                violations = list(_parse_violations(process.stdout, Path(path)))
+            if process.returncode != 0:
+                stderr.seek(0)
+                logger.error("Error running `ruff check` on %s: %s", path, stderr.read().strip())
+                return None
     except FileNotFoundError:
-        # This error occurs if the `ruff` command is not found in the system's PATH.
         logger.error("Error: `ruff` command not found. Please ensure it is installed and in your PATH.")
-        return -1
-    except subprocess.CalledProcessError as e:
-        # This error occurs if the subprocess command returns a non-zero exit code,
-        # which can happen if `ruff check` fails for reasons other than finding issues
-        # (e.g., invalid path).
-        logger.error("Error running `ruff`: %s %s", e.stderr, e)
-        return -1
-    except Exception as e:
-        # Catch any other unexpected errors.
-        logger.error("An unexpected error occurred: %s", e)
-        return -1
+        return None
+    except (OSError, ValueError) as e:
+        logger.error("Could not read the output of `ruff check` on %s: %s", path, e)
+        return None
+    return sorted(violations, key=lambda violation: (violation.file, violation.line, violation.code))
+
+
+def _parse_violations(lines: Iterable[str], root: Path) -> Iterator[RuffViolation]:
+    """Turns the JSON Lines output of `ruff check` into violation records, see `build_violation`."""
+    root = Path(os.path.realpath(root))
+    occurrences: Counter = Counter()
+    current_file, file_lines = None, []
+    for line in lines:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        file = Path(os.path.realpath(item["filename"]))
+        relative = file.relative_to(root).as_posix() if file.is_relative_to(root) else file.as_posix()
+        if relative != current_file:
+            # ruff reports the violations of one file together, so only one file is kept in memory.
+            current_file = relative
+            file_lines = file.read_text(encoding="utf-8", errors="replace").splitlines() if file.is_file() else []
+        row = (item.get("location") or {}).get("row") or 0
+        yield build_violation(relative, item.get("code"), row, file_lines, occurrences)
+
+
+def build_violation(
+    file: str, code: str | None, line: int, file_lines: list[str], occurrences: Counter
+) -> RuffViolation:
+    """Builds the record of a violation and its fingerprint.
+
+    The fingerprint hashes the text of the line instead of its number, so violations that only moved keep their
+    fingerprint. Identical violations in a file are told apart by how many came before them, so violations must
+    be built in the order of their lines.
 
+    Args:
+        file: Path of the file relative to the project root.
+        code: Code of the rule. None for syntax errors.
+        line: Line of the violation, starting at 1.
+        file_lines: Lines of the file.
+        occurrences: Number of violations seen so far by file, code and line text. It is updated.
+    """
+    text = file_lines[line - 1].strip() if 0 < line <= len(file_lines) else ""
+    code = code or "syntax-error"
+    occurrences[file, code, text] += 1
+    return RuffViolation(
+        file=file, code=code, line=line, fingerprint=hash_key(file, code, text, occurrences[file, code, text])[:16]
+    )
+
+
+def compare_violations(base: list[RuffViolation], target: list[RuffViolation]) -> RuffDelta:
+    """Classifies violations as introduced, fixed or unchanged by matching their fingerprints.
 
-def _check_and_format_ruff(folder_path: Path) -> int:
-    """Runs `ruff format` on a specified folder.
+    Comparing violations instead of totals shows a new violation even when the branch also fixes another one.
 
-    First, it checks if any files need formatting without applying changes.
-    If changes are needed, it then runs `ruff format` to apply them.
+    Args:
+        base: Violations of the base branch.
+        target: Violations of the target branch.
+    """
+    base_counts = Counter(violation.fingerprint for violation in base)
+    target_counts = Counter(violation.fingerprint for violation in target)
+    delta = RuffDelta(unchanged=sum((base_counts & target_counts).values()))
+    for violations, others, result in ((target, base_counts, delta.introduced), (base, target_counts, delta.fixed)):
+        remaining = Counter(others)
+        for violation in violations:
+            if remaining[violation.fingerprint]:
+                remaining[violation.fingerprint] -= 1
+            else:
+                result.append(violation)
+    return delta
+
+
+def count_ruff_issues(path: Path, files: list[str] | None = None) -> int:
+    """Runs `ruff check` on a specified path and returns the total number of issues found.
 
     Args:
-        folder_path: The path to the folder to format.
+        path (Path): The Path object representing the file or directory to check.
+        files: Paths relative to ``path`` to check instead of the whole path, e.g. the files changed on a branch.
 
     Returns:
-        True if any files were formatted, False otherwise.
-        Raises an exception if `ruff` is not found or other errors occur.
+        int: The total number of issues found by ruff. Returns 0 if no issues
+             are found, or -1 if the `ruff` command fails to run.
     """
-    # Command to check for unformatted files without applying changes.
-    # The --check flag will cause a non-zero exit code if formatting is needed.
-    check_command: list[str] = ["ruff", "format", "--check", folder_path]
+    violations = get_ruff_violations(path, files)
+    return -1 if violations is None else len(violations)
 
-    try:
-        # Use subprocess.run() to execute the command.
-        # `capture_output=True` captures stdout and stderr.
-        # `text=True` decodes output to strings.
-        # `check=False` is crucial here so we can handle the non-zero exit code manually.
-        check_result = subprocess.run(check_command, capture_output=True, text=True, check=False)
-
-        # Check the return code. A non-zero code from `ruff format --check`
-        # indicates that there are unformatted files.
-        if check_result.returncode == 0:
-            # No files need formatting.
-            return 0
-        lines = check_result.stdout.splitlines()
-        reformat_count = 0
-        for line in lines:
-            if "Would reformat" in line:
-                logger.debug("Ruff needs to format file: %s", line)
-                reformat_count += 1
-        return reformat_count
 
+# `ruff format --check` reports files as 'Would reformat: <path>' before ruff 0.9 and as ' --> <path>:1:1' since.
+_UNFORMATTED_FILE = re.compile(r"^(?:Would reformat: | *--> )(.+?)(?::\d+:\d+)?$")
+
+
+def get_unformatted_files(path: Path, files: list[str] | None = None) -> list[str] | None:
+    """Runs `ruff format --check` and returns the files it would reformat.
+
+    Args:
+        path: Folder of the project. The returned paths are relative to it.
+        files: Paths relative to ``path`` to check instead of the whole folder.
+
+    Returns:
+        The sorted paths of the files that are not formatted, or None if ruff could not run.
+    """
+    targets = _get_ruff_targets(path, files)
+    if targets is None:
+        return []
+    arguments, cwd = targets
+    try:
+        result = subprocess.run(
+            ["ruff", "format", "--check", *arguments], capture_output=True, text=True, check=False, cwd=cwd
+        )
     except FileNotFoundError:
         logger.error("Error: `ruff` command not found. Please ensure it is installed and in your PATH.")
-        return False
-    except subprocess.CalledProcessError as e:
-        logger.error("Error running `ruff format --check` on folder %s. Error: %s", folder_path, e)
-        return False
-    except Exception as e:
-        logger.error("An unexpected error occurred: %s", e)
-        return False
+        return None
+    # Exit code 1 means some files are not formatted, 2 that ruff failed.
+    if result.returncode not in (0, 1):
+        logger.error("Error running `ruff format --check` on %s: %s", path, result.stderr.strip())
+        return None
+    root = Path(os.path.realpath(path))
+    unformatted = set()
+    for line in result.stdout.splitlines():
+        match = _UNFORMATTED_FILE.match(line)
+        if match:
+            file = Path(os.path.realpath(Path(cwd or ".") / match.group(1)))
+            unformatted.add(file.relative_to(root).as_posix() if file.is_relative_to(root) else match.group(1))
+    return sorted(unformatted)
+
+
+def _check_and_format_ruff(folder_path: Path, files: list[str] | None = None) -> int:
+    """Runs `ruff format --check` on a specified folder and counts the files that need formatting.
+
+    Args:
+        folder_path: The path to the folder to check.
+        files: Paths relative to the folder to check instead of the whole folder.
+
+    Returns:
+        The number of files that would be reformatted, 0 if ruff could not run.
+    """
+    unformatted = get_unformatted_files(folder_path, files)
+    for file in unformatted or []:
+        logger.debug("Ruff needs to format file: %s", file)
+    return len(unformatted or [])
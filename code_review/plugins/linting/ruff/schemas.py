@@ -0,0 +1,38 @@
+from collections import Counter
+
+from pydantic import BaseModel, Field
+
+
+class RuffViolation(BaseModel):
+    """Schema for one violation reported by `ruff check`."""
+
+    file: str = Field(description="Path of the file relative to the project root")
+    code: str = Field(description="Code of the rule, e.g. 'F401'. 'syntax-error' for code ruff could not parse")
+    line: int = Field(description="Line of the violation")
+    fingerprint: str = Field(
+        description="Hash of the file, the code and the text of the line. It does not change when the line moves"
+    )
+
+
+class RuffDelta(BaseModel):
+    """Schema for the violations a branch introduces and fixes compared to its base branch."""
+
+    introduced: list[RuffViolation] = Field(default_factory=list, description="Violations only in the target branch")
+    fixed: list[RuffViolation] = Field(default_factory=list, description="Violations only in the base branch")
+    unchanged: int = Field(default=0, description="Number of violations in both branches")
+
+    def count_by_rule(self) -> dict[str, tuple[int, int]]:
+        """Returns the number of introduced and fixed violations of each rule code, sorted by code."""
+        return _count_by(self.introduced, self.fixed, "code")
+
+    def count_by_file(self) -> dict[str, tuple[int, int]]:
+        """Returns the number of introduced and fixed violations in each file, sorted by file."""
+        return _count_by(self.introduced, self.fixed, "file")
+
+
+def _count_by(
+    introduced: list[RuffViolation], fixed: list[RuffViolation], attribute: str
+) -> dict[str, tuple[int, int]]:
+    introduced_counts = Counter(getattr(violation, attribute) for violation in introduced)
+    fixed_counts = Counter(getattr(violation, attribute) for violation in fixed)
+    return {key: (introduced_counts[key], fixed_counts[key]) for key in sorted(introduced_counts | fixed_counts)}
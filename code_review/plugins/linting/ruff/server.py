@@ -0,0 +1,260 @@
+import contextlib
+import itertools
+import json
+import logging
+import subprocess
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Self
+
+from code_review.plugins.linting.ruff.handlers import build_violation
+from code_review.plugins.linting.ruff.schemas import RuffViolation
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the diagnostics of one call to `RuffServer.lint` before giving up on the server.
+RESPONSE_TIMEOUT = 60
+
+
+class RuffServerError(Exception):
+    """Raised when the `ruff server` process fails or stops answering."""
+
+
+class RuffServer:
+    """Keeps a `ruff server` process running so many lints share one warm ruff.
+
+    The server speaks the language server protocol over its standard input and output. Each call to `lint`
+    registers the project folder as a workspace, so ruff discovers its settings, opens the files, asks for their
+    diagnostics in one batch of requests and closes them again. A background thread reads the messages of the
+    server and hands each response to the request waiting for it.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the RuffServer. The process starts with `start` or when used as a context manager."""
+        self._process: subprocess.Popen | None = None
+        self._reader: threading.Thread | None = None
+        self._write_lock = threading.Lock()
+        self._lint_lock = threading.Lock()
+        self._pending: dict[int, Future] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def running(self) -> bool:
+        """Whether the server process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Starts the server process and initializes the session.
+
+        Raises:
+            RuffServerError: If ruff can not be run or does not answer the initialization.
+        """
+        try:
+            self._process = subprocess.Popen(
+                ["ruff", "server"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            raise RuffServerError(f"Could not start `ruff server`: {e}") from e
+        self._reader = threading.Thread(target=self._read_messages, name="ruff-server-reader", daemon=True)
+        self._reader.start()
+        try:
+            self._request(
+                "initialize",
+                {
+                    "processId": None,
+                    "rootUri": None,
+                    "workspaceFolders": [],
+                    "capabilities": {"textDocument": {"diagnostic": {}}, "workspace": {"workspaceFolders": True}},
+                },
+            ).result(RESPONSE_TIMEOUT)
+            self._notify("initialized", {})
+        except Exception as e:
+            self.close()
+            raise RuffServerError(f"The ruff server did not initialize: {e}") from e
+        logger.debug("Started ruff server with pid %d", self._process.pid)
+
+    def close(self) -> None:
+        """Shuts the server down, killing it if it does not exit."""
+        if self._process is None:
+            return
+        if self.running:
+            try:
+                self._request("shutdown", None).result(5)
+                self._notify("exit", None)
+                self._process.wait(5)
+            except Exception as e:  # noqa: BLE001
+                logger.debug("Killing ruff server: %s", e)
+                self._process.kill()
+                self._process.wait()
+        self._fail_pending(RuffServerError("The ruff server was closed"))
+        for stream in (self._process.stdin, self._process.stdout):
+            with contextlib.suppress(OSError):
+                stream.close()
+        self._process = None
+
+    def __enter__(self) -> Self:
+        """Starts the server and returns it."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Shuts the server down."""
+        self.close()
+
+    def lint(self, root: Path, files: list[str]) -> list[RuffViolation] | None:
+        """Returns the violations of some files of a project.
+
+        Files excluded by the ruff settings and files that do not exist are left out, like `ruff check` does
+        with `--force-exclude`.
+
+        Args:
+            root: Folder of the project. Ruff reads its settings from it and paths in the records are relative to it.
+            files: Paths relative to the folder to check.
+
+        Returns:
+            The violations sorted by file and line, or None if the server failed. The server is closed when it
+            fails, so callers can fall back to `ruff check`.
+        """
+        if not self.running:
+            return None
+        root = Path(root).resolve()
+        documents = {}
+        for file in files:
+            with contextlib.suppress(OSError, UnicodeDecodeError):
+                documents[file] = (root / file).read_text(encoding="utf-8")
+        if not documents:
+            return []
+
+        workspace = {"uri": root.as_uri(), "name": root.name}
+        # One project at a time, so the workspaces of two projects never share a document.
+        with self._lint_lock:
+            try:
+                self._notify("workspace/didChangeWorkspaceFolders", {"event": {"added": [workspace], "removed": []}})
+                requests = {}
+                for file, text in documents.items():
+                    document = {"uri": (root / file).as_uri(), "languageId": "python", "version": 1, "text": text}
+                    self._notify("textDocument/didOpen", {"textDocument": document})
+                    requests[file] = self._request(
+                        "textDocument/diagnostic", {"textDocument": {"uri": document["uri"]}}
+                    )
+                reports = {file: request.result(RESPONSE_TIMEOUT) for file, request in requests.items()}
+                for file in documents:
+                    self._notify("textDocument/didClose", {"textDocument": {"uri": (root / file).as_uri()}})
+                self._notify("workspace/didChangeWorkspaceFolders", {"event": {"added": [], "removed": [workspace]}})
+            except Exception as e:  # noqa: BLE001
+                logger.error("The ruff server failed linting %s: %s", root, e)
+                self.close()
+                return None
+
+        violations = []
+        for file, report in reports.items():
+            violations.extend(_parse_diagnostics(file, documents[file], (report or {}).get("items", [])))
+        return sorted(violations, key=lambda violation: (violation.file, violation.line, violation.code))
+
+    def _send(self, message: dict) -> None:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode("utf-8")
+        with self._write_lock:
+            if not self.running:
+                raise RuffServerError("The ruff server is not running")
+            self._process.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            self._process.stdin.flush()
+
+    def _notify(self, method: str, params: dict | None) -> None:
+        self._send({"method": method, "params": params})
+
+    def _request(self, method: str, params: dict | None) -> Future:
+        request_id = next(self._ids)
+        future = Future()
+        self._pending[request_id] = future
+        try:
+            self._send({"id": request_id, "method": method, "params": params})
+        except (OSError, RuffServerError) as e:
+            self._pending.pop(request_id, None)
+            future.set_exception(RuffServerError(f"Could not send {method}: {e}"))
+        return future
+
+    def _read_messages(self) -> None:
+        stdout = self._process.stdout
+        try:
+            while True:
+                headers = {}
+                while line := stdout.readline():
+                    if line == b"\r\n":
+                        break
+                    name, _, value = line.decode("ascii").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if "content-length" not in headers:
+                    break
+                self._dispatch(json.loads(stdout.read(int(headers["content-length"]))))
+        except (OSError, ValueError) as e:
+            logger.debug("Stopped reading the ruff server: %s", e)
+        self._fail_pending(RuffServerError("The ruff server stopped"))
+
+    def _dispatch(self, message: dict) -> None:
+        if "method" in message:
+            # The server asks the client things such as configuration. The defaults of ruff are what we want.
+            if "id" in message:
+                with contextlib.suppress(OSError, RuffServerError):
+                    self._send({"id": message["id"], "result": None})
+            return
+        future = self._pending.pop(message.get("id"), None)
+        if future is None:
+            return
+        if "error" in message:
+            future.set_exception(RuffServerError(message["error"].get("message", "Unknown error")))
+        else:
+            future.set_result(message.get("result"))
+
+    def _fail_pending(self, error: Exception) -> None:
+        while self._pending:
+            _, future = self._pending.popitem()
+            if not future.done():
+                future.set_exception(error)
+
+
+def _parse_diagnostics(file: str, text: str, diagnostics: list[dict]) -> Iterator[RuffViolation]:
+    """Turns the diagnostics of one file into violation records with the same fingerprints as `ruff check`."""
+    file_lines = text.splitlines()
+    occurrences = Counter()
+    # Syntax errors have no code, so they sort as an empty code.
+    positions = sorted(
+        (diagnostic["range"]["start"]["line"], diagnostic["range"]["start"]["character"], diagnostic.get("code") or "")
+        for diagnostic in diagnostics
+    )
+    for line, _, code in positions:
+        # Lines of the protocol start at 0.
+        yield build_violation(file, code, line + 1, file_lines, occurrences)
+
+
+_ACTIVE_SERVER: RuffServer | None = None
+
+
+def get_ruff_server() -> RuffServer | None:
+    """Returns the server of the current `ruff_server_session`, or None outside a session."""
+    return _ACTIVE_SERVER
+
+
+@contextlib.contextmanager
+def ruff_server_session() -> Iterator[RuffServer | None]:
+    """Keeps a ruff server running while the block runs, so the reviews in it lint through it.
+
+    If the server can not start, the block runs without it and ruff is run as a command.
+    """
+    global _ACTIVE_SERVER  # noqa: PLW0603
+    server = RuffServer()
+    try:
+        server.start()
+    except RuffServerError as e:
+        logger.error("Linting with `ruff check` instead of the ruff server: %s", e)
+        server.close()
+        yield None
+        return
+    _ACTIVE_SERVER = server
+    try:
+        yield server
+    finally:
+        _ACTIVE_SERVER = None
+        server.close()
@@ -1,212 +1,594 @@
 import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from rich.progress import BarColumn, Progress, SpinnerColumn, TaskID, TaskProgressColumn, TextColumn, TimeElapsedColumn
 
 from code_review.adapters.changelog import parse_changelog
 from code_review.adapters.setup_adapters import setup_to_dict
-from code_review.handlers.file_handlers import change_directory, get_not_ignored
+from code_review.enums import LintScope
+from code_review.handlers.file_handlers import change_directory
 from code_review.plugins.coverage.main import get_makefile, get_minimum_coverage
-from code_review.plugins.dependencies.pip.handlers import find_requirements_to_update, get_requirements
-from code_review.plugins.docker.docker_files.handlers import parse_dockerfile
+from code_review.plugins.dependencies.pip.handlers import find_requirements_to_update, get_requirements_from_contents
+from code_review.plugins.docker.docker_files.handlers import apply_expected_image, parse_dockerfile
+from code_review.plugins.docker.schemas import DockerfileSchema
 from code_review.plugins.git.adapters import get_git_flow_source_branch, is_rebased
-from code_review.plugins.git.handlers import branch_line_to_dict, check_out_and_pull, get_branch_info
-from code_review.plugins.linting.ruff.handlers import _check_and_format_ruff, count_ruff_issues
-from code_review.review.rules import (
-    ci_file_rules,
-    docker_image_rules,
-    linting_rules,
-    readme_rules,
-    requirement_rules,
-    unvetted_requirements_rules,
-version_rules,
+from code_review.plugins.git.blob_reader import CatFileReader
+from code_review.plugins.git.conflicts import predict_conflicts
+from code_review.plugins.git.handlers import (
+    LazyWorktree,
+    branch_line_to_dict,
+    get_changed_files,
+    get_object_hashes,
+    list_files_by_name,
+    list_files_by_suffix,
+    list_folder,
+    resolve_branch_ref,
+    temporary_worktree,
 )
-from code_review.review.rules.git_rules import (
-    rebase_rule,
-    validate_master_develop_sync_legacy,
+from code_review.plugins.git.runner import GIT_RUNNER
+from code_review.plugins.linting.ast.django_rules import DJANGO_RULES
+from code_review.plugins.linting.ast.handlers import find_issues_on_changed_lines
+from code_review.plugins.linting.ruff.cache import (
+    PYTHON_SUFFIXES,
+    get_branch_violations,
+    get_ruff_config_files,
+    lint_branch,
 )
-from code_review.review.schemas import CodeReviewSchema
-from code_review.schemas import BranchSchema, SemanticVersion, RulesResult
-from code_review.settings import CLI_CONSOLE
+from code_review.plugins.linting.ruff.handlers import get_unformatted_files
+from code_review.review.cache import (
+    PROVIDER_CACHE,
+    CachedReview,
+    get_configuration_hash,
+    get_provider_cache_key,
+    get_review_cache_key,
+    get_tool_versions,
+    load_review,
+    save_review,
+)
+from code_review.review.providers import (
+    PROVIDER_FIELDS,
+    PROVIDER_INPUTS,
+    RUFF_PROVIDERS,
+    DataProvider,
+    get_required_providers,
+)
+from code_review.review.rules.registry import RULES
+from code_review.review.scheduler import run_rules
+from code_review.review.schemas import CodeReviewSchema, RuleDefinition
+from code_review.schemas import BranchSchema, RulesResult, SemanticVersion
+from code_review.settings import CLI_CONSOLE, CURRENT_CONFIGURATION
 
 logger = logging.getLogger(__name__)
 
 
+class _BranchContext:
+    """What the data providers of one branch read."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        branch_ref: str,
+        folder: Path,
+        worktree: LazyWorktree,
+        reader: CatFileReader,
+        *,
+        tool_versions: dict[str, str | None] | None = None,
+        changed_files: list[str] | None = None,
+    ) -> None:
+        """Initializes the _BranchContext.
+
+        Args:
+            branch_ref: Ref of the branch (e.g. 'origin/master').
+            folder: The project folder. Paths in the results point inside it.
+            worktree: Worktree of the branch.
+            reader: Reader of the files of the repository.
+            tool_versions: Versions from `get_tool_versions`. None disables the provider and merge conflict caches.
+            changed_files: If given, only these files are linted and format-checked instead of the whole project.
+        """
+        self.branch_ref = branch_ref
+        self.folder = folder
+        self.worktree = worktree
+        self.reader = reader
+        self.tool_versions = tool_versions
+        self.changed_files = changed_files
+
+
+def _collect_linting(context: _BranchContext, files: list[str] | None) -> object:
+    # With tool versions, ruff only checks the files whose violations are not in the ruff cache.
+    if context.tool_versions is not None:
+        return get_branch_violations(context.branch_ref, context.worktree, files, context.tool_versions.get("ruff"))
+    return lint_branch(context.branch_ref, context.worktree, files)
+
+
+def _collect_formatting(context: _BranchContext, files: list[str] | None) -> object:
+    return get_unformatted_files(context.worktree.folder, files=files)
+
+
+def _collect_requirements_to_update(context: _BranchContext, _files: list[str] | None) -> object:
+    return find_requirements_to_update(context.worktree.folder)
+
+
+def _collect_min_coverage(context: _BranchContext, _files: list[str] | None) -> object:
+    for name in ("Makefile", "makefile"):
+        content = context.reader.read_text(context.branch_ref, name)
+        if content is not None:
+            return get_minimum_coverage(context.folder / name, content=content)
+    raise FileNotFoundError(f"Makefile not found in {context.branch_ref}")
+
+
+def _collect_requirements(context: _BranchContext, _files: list[str] | None) -> object:
+    files = [path for path in list_folder(context.branch_ref, "requirements") if path.endswith(".txt")]
+    if not files:
+        logger.error("Could not find requirements folder in %s", context.branch_ref)
+    contents = context.reader.read_blobs([(context.branch_ref, path) for path in files])
+    return get_requirements_from_contents(
+        {
+            context.folder / path: content.decode("utf-8")
+            for path, content in zip(files, contents, strict=True)
+            if content is not None
+        }
+    )
+
+
+def _collect_version(context: _BranchContext, _files: list[str] | None) -> object:
+    return get_version_from_config_file(
+        context.folder, context.folder.stem, reader=context.reader, ref=context.branch_ref
+    )
+
+
+def _collect_changelog(context: _BranchContext, _files: list[str] | None) -> object:
+    content = context.reader.read_text(context.branch_ref, "CHANGELOG.md")
+    if content is None:
+        logger.error("CHANGELOG.md does not exist in %s", context.branch_ref)
+        return []
+    return parse_changelog(context.folder / "CHANGELOG.md", context.folder.stem, content=content)
+
+
+# Providers that only parse a few files read them from git with the blob reader. Only the providers that run
+# external tools on the code (ruff, pur) use the worktree of the branch.
+_BRANCH_COLLECTORS: dict[DataProvider, Callable[[_BranchContext, list[str] | None], object]] = {
+    DataProvider.LINTING: _collect_linting,
+    DataProvider.FORMATTING: _collect_formatting,
+    DataProvider.REQUIREMENTS_TO_UPDATE: _collect_requirements_to_update,
+    DataProvider.MIN_COVERAGE: _collect_min_coverage,
+    DataProvider.REQUIREMENTS: _collect_requirements,
+    DataProvider.VERSION: _collect_version,
+    DataProvider.CHANGELOG: _collect_changelog,
+}
+
+
+def _collect_provider(provider: DataProvider, context: _BranchContext, files: list[str] | None = None) -> object:
+    """Runs a branch data provider.
+
+    Args:
+        provider: The data provider to run.
+        context: The branch the provider runs on.
+        files: If given, ruff only checks these files instead of the whole project.
+
+    Returns:
+        The value of the BranchSchema field filled by the provider.
+    """
+    if provider not in _BRANCH_COLLECTORS:
+        raise ValueError(f"{provider} is not a branch data provider")
+    return _BRANCH_COLLECTORS[provider](context, files)
+
+
+def _get_branch_field(provider: DataProvider) -> str:
+    """Returns the name of the BranchSchema field filled by a branch data provider."""
+    return PROVIDER_FIELDS[provider][-1].split(".", 1)[1]
+
+
 def _process_branch_info(
-    branch_name: str,
-    folder: Path,
-    makefile: Path,
-    progress,
-    main_task,
-    is_target: bool = False,
+    context: _BranchContext, progress: Progress, main_task: TaskID, providers: set[DataProvider]
 ) -> BranchSchema:
     """Process branch information for base or target branch.
 
+    Files are read from git and the tools run in a worktree of the branch, so base and target can be processed
+    at the same time without checking out anything in the user's repository. Only the requested data providers
+    run; the fields of the other providers keep their "not checked" defaults.
+
+    If tool versions are given, the result of each provider is cached by the git hashes of the files it reads,
+    so a provider only runs again when its inputs change. The worktree is only created if a provider that runs
+    ruff or pur misses the cache. When only the changed files are linted, the ruff results are cached by the
+    hashes of these files and of the ruff settings instead of the whole tree.
+
     Args:
-        branch_name: Name of the branch to process
-        folder: Path to the folder containing the code
-        makefile: Path to the makefile
+        context: The branch to process.
         progress: Progress object for displaying progress
         main_task: Main task for updating progress
-        is_target: Whether this is the target branch (enables additional processing)
+        providers: Data providers to run for this branch.
 
     Returns:
-        BranchSchema with all the branch information populated
+        BranchSchema with the information of the requested providers populated
     """
-    # Checkout and pull branch
-    progress.update(main_task, advance=1, description=f"[yellow]Checkout and pull {branch_name}[/yellow]")
-    check_out_and_pull(branch_name, check=False)
-
-    # Run ruff to count linting issues
-    progress.update(main_task, advance=1, description=f"[yellow]Running ruff on {branch_name}[/yellow]")
-    linting_count = count_ruff_issues(folder)
-
+    branch_ref = context.branch_ref
     # Get branch info
-    progress.update(main_task, advance=1, description=f"[yellow]Get branch info for {branch_name}[/yellow]")
-    get_branch_info(branch_name)
-    branch_info = branch_line_to_dict(branch_name)
-
-    # Get minimum coverage
-    progress.update(main_task, advance=1, description=f"[yellow]Get min coverage for {branch_name}[/yellow]")
-    min_coverage = get_minimum_coverage(makefile)
+    progress.update(main_task, advance=1, description=f"[yellow]Get branch info for {branch_ref}[/yellow]")
+    branch_info = branch_line_to_dict(branch_ref)
+
+    cache_keys = _get_provider_cache_keys(context, providers)
+    pending = []
+    for provider in sorted(providers):
+        if provider in cache_keys and _load_cached_value(provider, cache_keys[provider], branch_ref, branch_info):
+            progress.update(
+                main_task, advance=1, description=f"[yellow]Cached {provider.value} for {branch_ref}[/yellow]"
+            )
+        else:
+            pending.append(provider)
+
+    ruff_values = _run_ruff_providers(context, pending)
+    for provider in pending:
+        field = _get_branch_field(provider)
+        progress.update(main_task, advance=1, description=f"[yellow]Running {provider.value} on {branch_ref}[/yellow]")
+        if provider in ruff_values:
+            value = ruff_values[provider]
+        else:
+            value = _collect_provider(provider, context, context.changed_files)
+        if context.worktree.created:
+            value = _relocate_value(value, context.worktree.folder, context.folder)
+        if provider in cache_keys:
+            adapter = TypeAdapter(BranchSchema.model_fields[field].annotation)
+            PROVIDER_CACHE.set(cache_keys[provider], {"value": adapter.dump_python(value, mode="json")})
+        branch_info[field] = value
+
+    if branch_info.get("linting_violations") is not None:
+        branch_info["linting_errors"] = len(branch_info["linting_violations"])
+    if branch_info.get("unformatted_files") is not None:
+        branch_info["formatting_errors"] = len(branch_info["unformatted_files"])
+    return BranchSchema(**branch_info)
+
+
+def _get_provider_cache_keys(context: _BranchContext, providers: set[DataProvider]) -> dict[DataProvider, str]:
+    """Builds the cache keys of the providers of a branch, or none if the provider cache is disabled."""
+    if context.tool_versions is None:
+        return {}
+    inputs = {provider: PROVIDER_INPUTS[provider] for provider in providers}
+    config_hashes = {}
+    if context.changed_files is not None and RUFF_PROVIDERS & providers:
+        # Only the settings that apply to the changed files, including nested and extended ones.
+        config_hashes = get_ruff_config_files(context.branch_ref, context.changed_files)
+        for provider in RUFF_PROVIDERS & providers:
+            inputs[provider] = [*config_hashes, *context.changed_files]
+    paths = sorted({path for provider_inputs in inputs.values() for path in provider_inputs} - set(config_hashes))
+    object_hashes = {**get_object_hashes(context.branch_ref, paths), **config_hashes}
+    return {
+        provider: get_provider_cache_key(
+            provider, str(context.folder), object_hashes, context.tool_versions, inputs[provider]
+        )
+        for provider in providers
+    }
 
-    # Populate branch info dictionary
-    branch_info["linting_errors"] = linting_count
-    branch_info["min_coverage"] = min_coverage
 
-    # Get requirements for target branch only
-    if is_target:
-        progress.update(main_task, advance=1, description="[yellow]Getting requirements[/yellow]")
-        branch_info["requirements"] = get_requirements(folder)
+def _load_cached_value(provider: DataProvider, cache_key: str, branch_ref: str, branch_info: dict) -> bool:
+    """Sets the cached value of a provider in the branch info.
 
-    # Create BranchSchema
-    branch = BranchSchema(**branch_info)
+    Returns:
+        Whether a valid value was cached.
+    """
+    cached_value = PROVIDER_CACHE.get(cache_key)
+    if cached_value is None:
+        return False
+    field = _get_branch_field(provider)
+    try:
+        adapter = TypeAdapter(BranchSchema.model_fields[field].annotation)
+        branch_info[field] = adapter.validate_python(cached_value["value"])
+    except ValidationError as e:
+        # Values cached by an older version may have another shape, e.g. a count instead of violations.
+        logger.warning("Discarding invalid cached %s for %s: %s", provider.value, branch_ref, e)
+        return False
+    return True
+
+
+def _run_ruff_providers(context: _BranchContext, pending: list[DataProvider]) -> dict[DataProvider, object]:
+    """Runs ruff check and ruff format --check at the same time on one list of files.
+
+    This avoids each of them walking the whole tree. Files tracked by git are the ones .gitignore does not
+    exclude. Nothing runs unless both providers are pending.
+    """
+    if not RUFF_PROVIDERS.issubset(pending):
+        return {}
+    files = context.changed_files
+    if files is None:
+        files = sorted(list_files_by_suffix(context.branch_ref, PYTHON_SUFFIXES))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            provider: executor.submit(_collect_provider, provider, context, files)
+            for provider in sorted(RUFF_PROVIDERS)
+        }
+        return {provider: future.result() for provider, future in futures.items()}
+
+
+def _parse_docker_files(
+    target_ref: str, folder: Path, reader: CatFileReader, tool_versions: dict[str, str | None] | None = None
+) -> list[DockerfileSchema]:
+    """Parses the Dockerfiles of the target branch reading them from git.
+
+    The parsed files are cached by the git hashes of the Dockerfiles. The expected images come from the
+    configuration, so they are set again on cached results.
 
-    # Get version from config file
-    progress.update(main_task, advance=1, description=f"[yellow]Getting version from config for {branch_name}[/yellow]")
-    branch.version = get_version_from_config_file(folder, folder.stem)
+    Args:
+        target_ref: Ref of the target branch.
+        folder: The project folder. Paths in the result point inside it.
+        reader: Reader of the files of the repository.
+        tool_versions: Versions from `get_tool_versions`. None disables the provider cache.
+    """
+    docker_file_hashes = list_files_by_name(target_ref, "Dockerfile")
+    cache_key = None
+    if tool_versions is not None:
+        cache_key = get_provider_cache_key(
+            DataProvider.DOCKER_FILES, str(folder), docker_file_hashes, tool_versions
+        )
+        cached_value = PROVIDER_CACHE.get(cache_key)
+        if cached_value is not None:
+            docker_files = [DockerfileSchema.model_validate(item) for item in cached_value["value"]]
+            return [apply_expected_image(docker_file) for docker_file in docker_files]
+
+    docker_info_list = []
+    paths = sorted(docker_file_hashes)
+    contents = reader.read_blobs([(target_ref, path) for path in paths])
+    for path, content in zip(paths, contents, strict=True):
+        if content is None:
+            continue
+        docker_info = parse_dockerfile(folder / path, content=content.decode("utf-8"))
+        if docker_info:
+            docker_info_list.append(docker_info)
+    if cache_key:
+        PROVIDER_CACHE.set(cache_key, {"value": [item.model_dump(mode="json") for item in docker_info_list]})
+    return docker_info_list
+
+
+def _relocate_value(value: object, worktree: Path, folder: Path) -> object:
+    """Maps the paths inside a temporary worktree found in a value to the same paths inside the project folder.
+
+    Pydantic models are updated in place, lists are rebuilt.
+    """
+    if isinstance(value, Path):
+        return folder / value.relative_to(worktree) if value.is_relative_to(worktree) else value
+    if isinstance(value, list):
+        return [_relocate_value(item, worktree, folder) for item in value]
+    if isinstance(value, BaseModel):
+        for name in type(value).model_fields:
+            setattr(value, name, _relocate_value(getattr(value, name), worktree, folder))
+    return value
 
-    # Parse changelog
-    progress.update(main_task, advance=1, description=f"[yellow]Parsing changelog for {branch_name}[/yellow]")
-    branch.changelog_versions = parse_changelog(folder / "CHANGELOG.md", folder.stem)
 
-    # Additional processing for target branch
-    if is_target:
-        progress.update(main_task, advance=1, description="[yellow]Finding requirements to update[/yellow]")
-        branch.requirements_to_update = find_requirements_to_update(folder)
+def _relocate_paths(code_review_schema: CodeReviewSchema, worktrees: list[Path], folder: Path) -> None:
+    """Replaces the paths of the temporary worktrees in the review with paths in the project folder.
 
-        progress.update(main_task, advance=1, description="[yellow]Checking and formatting ruff[/yellow]")
-        branch.formatting_errors = _check_and_format_ruff(folder)
+    Args:
+        code_review_schema: The review whose paths will be updated in place.
+        worktrees: Folders of the worktrees used to analyze the branches.
+        folder: The project folder the review belongs to.
+    """
+    for worktree in worktrees:
+        _relocate_value(code_review_schema, worktree, folder)
 
-    return branch
 
+def _review_from_cache(
+    cached_review: CachedReview, cache_key: str, folder: Path, target_ref: str, rules: list[RuleDefinition] | None
+) -> CodeReviewSchema:
+    """Builds a review from a cached one.
 
-def build_code_review_schema(folder: Path, target_branch_name: str) -> CodeReviewSchema:
+    If the configuration and the rules are the same the cached review is returned as is. Otherwise the data
+    collected from git, ruff and pur is reused and only the rules are validated again.
+    """
+    review = cached_review.review
+    review.date_created = datetime.now()
+    rule_names = [rule.name for rule in rules or RULES]
+    configuration_hash = get_configuration_hash()
+    if cached_review.configuration_hash == configuration_hash and cached_review.rules == rule_names:
+        logger.info("Using cached review for %s", target_ref)
+        return review
+
+    logger.info("Using cached data for %s and validating the rules again", target_ref)
+    for docker_file in review.docker_files:
+        apply_expected_image(docker_file)
+    with temporary_worktree(target_ref, folder.name) as target_folder:
+        _relocate_paths(review, [folder], target_folder)
+        review.rule_timings = {}
+        review.rules_validated = check_all_rules(review, rules)
+    _relocate_paths(review, [target_folder], folder)
+    save_review(cache_key, review, rule_names, configuration_hash)
+    return review
+
+
+@GIT_RUNNER.memoize()
+def build_code_review_schema(
+    folder: Path,
+    target_branch_name: str,
+    rules: list[RuleDefinition] | None = None,
+    use_cache: bool = True,
+    lint_scope: LintScope | None = None,
+) -> CodeReviewSchema:
     """Build a CodeReviewSchema for the given folder and target branch.
 
+    The base and target branches are checked out in temporary worktrees and analyzed concurrently, so the
+    checkout of the project folder is never modified. Only the data the selected rules read is collected.
+
+    Reviews are cached by the commits of the branches and the versions of ruff and pur, so reviewing a branch
+    that has not moved reuses the previous result. Read-only git commands are memoized while the review is built.
+
     Args:
         folder: Path to the folder containing the code review data.
         target_branch_name: Name of the target branch to compare against the base branch.
+        rules: Rules to validate. None runs every registered rule and collects all the data.
+        use_cache: Whether to read and write the review cache.
+        lint_scope: Whether ruff checks the whole project or only the Python files changed on the target branch
+            since it forked from its source branch. Defaults to the 'lint_scope' setting.
     """
-    total_work = 20
-
-    with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            TimeElapsedColumn(),
-            console=CLI_CONSOLE,
-            transient=True,
-    ) as progress:
-        main_task = progress.add_task("[cyan]Total Sync Progress[/cyan]", total=total_work)
-
-        # Change to project directory
-        progress.update(main_task, description="[yellow]Change folder[/yellow]")
-        change_directory(folder)
-
-        # Get makefile
-        progress.update(main_task, advance=1, description="[yellow]Get makefile[/yellow]")
-        makefile = get_makefile(folder)
-
-        # Process base branch (master)
-        base_name = "master"
-        base_branch = _process_branch_info(base_name, folder, makefile, progress, main_task, is_target=False)
-
-        # Process target branch
-        target_branch = _process_branch_info(target_branch_name, folder, makefile, progress, main_task, is_target=True)
-
-        # Parse Dockerfiles
-        docker_files = get_not_ignored(folder, "Dockerfile")
-        progress.update(main_task, advance=1, description="[yellow]Parsing dockerfiles[/yellow]")
-        docker_info_list = []
-        for file in docker_files:
-            docker_info = parse_dockerfile(file)
-            if docker_info:
-                docker_info_list.append(docker_info)
-
-        # Get source branch
-        progress.update(main_task, advance=1, description="[yellow]Getting source branch[/yellow]")
-        source_branch_name = get_git_flow_source_branch(target_branch.name)
-        if not source_branch_name:
-            logger.warning("No source branch in target branch for target branch. %s", target_branch.name)
-
-        # Create code review schema
-        rules = []
-        code_review_schema = CodeReviewSchema(
-            name=folder.name,
-            source_folder=folder,
-            makefile_path=makefile,
-            target_branch=target_branch,
-            source_branch_name=source_branch_name,
-            base_branch=base_branch,
-            date_created=datetime.now(),
-            docker_files=docker_info_list,
-            rules_validated=rules,
-            readme_file=folder / "README.md",
-            ci_file=folder / ".gitlab-ci.yml",
+    lint_scope = LintScope(lint_scope or CURRENT_CONFIGURATION.get("lint_scope", LintScope.PROJECT))
+    providers = get_required_providers(rules)
+    base_providers = get_required_providers(rules, branch="base_branch")
+    target_providers = get_required_providers(rules, branch="target_branch")
+    total_work = 8 + len(base_providers) + len(target_providers)
+
+    # Change to project directory
+    change_directory(folder)
+    base_ref = resolve_branch_ref("master")
+    target_ref = resolve_branch_ref(target_branch_name)
+
+    cache_key = None
+    tool_versions = None
+    if use_cache:
+        tool_versions = get_tool_versions()
+        cache_key = get_review_cache_key(
+            [base_ref, target_ref, resolve_branch_ref("develop")], str(folder), tool_versions, lint_scope, providers
         )
+        cached_review = load_review(cache_key)
+        if cached_review and providers.issubset(cached_review.review.data_providers):
+            return _review_from_cache(cached_review, cache_key, folder, target_ref, rules)
+
+    changed_files = None
+    if lint_scope == LintScope.CHANGED and RUFF_PROVIDERS & providers:
+        changed_files = _get_files_to_lint(target_branch_name, target_ref, base_ref)
+
+    with (
+        LazyWorktree(base_ref, folder.name) as base_worktree,
+        LazyWorktree(target_ref, folder.name) as target_worktree,
+        CatFileReader() as reader,
+    ):
+        # The rules read files of the target branch, so only the base worktree may be skipped.
+        target_folder = target_worktree.folder
+        with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TaskProgressColumn(),
+                TimeElapsedColumn(),
+                console=CLI_CONSOLE,
+                transient=True,
+        ) as progress:
+            main_task = progress.add_task("[cyan]Total Sync Progress[/cyan]", total=total_work)
+
+            # Get makefile
+            makefile = None
+            if DataProvider.MIN_COVERAGE in providers:
+                progress.update(main_task, advance=1, description="[yellow]Get makefile[/yellow]")
+                makefile = get_makefile(target_folder)
+
+            # Process base branch (master) and target branch at the same time
+            options = {"tool_versions": tool_versions, "changed_files": changed_files}
+            base_context = _BranchContext(base_ref, folder, base_worktree, reader, **options)
+            target_context = _BranchContext(target_ref, folder, target_worktree, reader, **options)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                base_future = executor.submit(_process_branch_info, base_context, progress, main_task, base_providers)
+                target_future = executor.submit(
+                    _process_branch_info, target_context, progress, main_task, target_providers
+                )
+                base_branch = base_future.result()
+                target_branch = target_future.result()
+
+            # Parse Dockerfiles
+            docker_info_list = []
+            if DataProvider.DOCKER_FILES in providers:
+                progress.update(main_task, advance=1, description="[yellow]Parsing dockerfiles[/yellow]")
+                docker_info_list = _parse_docker_files(target_ref, folder, reader, tool_versions)
+
+            # Get source branch
+            progress.update(main_task, advance=1, description="[yellow]Getting source branch[/yellow]")
+            source_branch_name = get_git_flow_source_branch(target_branch.name)
+            if not source_branch_name:
+                logger.warning("No source branch in target branch for target branch. %s", target_branch.name)
+
+            # Create code review schema
+            code_review_schema = CodeReviewSchema(
+                name=folder.name,
+                source_folder=target_folder,
+                makefile_path=makefile,
+                target_branch=target_branch,
+                source_branch_name=source_branch_name,
+                base_branch=base_branch,
+                date_created=datetime.now(),
+                docker_files=docker_info_list,
+                rules_validated=[],
+                readme_file=target_folder / "README.md",
+                ci_file=target_folder / ".gitlab-ci.yml",
+                data_providers=sorted(provider.value for provider in providers),
+                linted_files=changed_files,
+            )
+
+            _compare_with_source_branch(code_review_schema, target_context, base_ref, providers, progress)
+
+        # Run the validation rules while the target worktree still exists
+        code_review_schema.rules_validated = check_all_rules(code_review_schema, rules)
+
+    worktree_folders = [worktree.folder for worktree in (base_worktree, target_worktree) if worktree.created]
+    _relocate_paths(code_review_schema, worktree_folders, folder)
+    if cache_key:
+        save_review(cache_key, code_review_schema, [rule.name for rule in rules or RULES])
+    return code_review_schema
 
-        # Check if rebased
-        progress.update(main_task, advance=1, description="[yellow]Checking for rebase[/yellow]")
-        code_review_schema.is_rebased = is_rebased(code_review_schema.target_branch.name, source_branch_name)
 
-        # Check master and develop sync
-        progress.update(main_task, advance=1, description="[yellow]Checking sync between master and develop[/yellow]")
-        git_rules = validate_master_develop_sync_legacy(["master", "develop"])
-        if git_rules:
-            rules.extend(git_rules)
+def _get_files_to_lint(target_branch_name: str, target_ref: str, base_ref: str) -> list[str]:
+    """Returns the Python files changed on the target branch since it forked from its source branch."""
+    source_branch_name = get_git_flow_source_branch(target_branch_name)
+    source_ref = resolve_branch_ref(source_branch_name) if source_branch_name else base_ref
+    changed_files = get_changed_files(target_ref, source_ref)
+    logger.info("Linting the %d Python files changed on %s", len(changed_files), target_ref)
+    return changed_files
 
-    # Run all validation rules
-    rules_list = check_all_rules(code_review_schema)
-    rules.extend(rules_list)
 
-    code_review_schema.rules_validated = rules
-    return code_review_schema
+def _compare_with_source_branch(
+    code_review_schema: CodeReviewSchema,
+    target_context: _BranchContext,
+    base_ref: str,
+    providers: set[DataProvider],
+    progress: Progress,
+) -> None:
+    """Runs the providers that compare the target branch with its git flow source branch.
 
-def check_all_rules(code_review_schema: CodeReviewSchema)-> list[RulesResult]:
-    """Run all validation rules against the code review schema.
+    Args:
+        code_review_schema: The review to update.
+        target_context: The target branch.
+        base_ref: Ref of the base branch, used instead of the source branch for N+1 queries when there is none.
+        providers: Data providers required by the rules.
+        progress: Progress object with a single task.
+    """
+    main_task = progress.task_ids[0]
+    target_ref = target_context.branch_ref
+    source_branch_name = code_review_schema.source_branch_name
+    source_ref = resolve_branch_ref(source_branch_name) if source_branch_name else None
+
+    # Check if rebased
+    if DataProvider.REBASE in providers:
+        progress.update(main_task, advance=1, description="[yellow]Checking for rebase[/yellow]")
+        code_review_schema.is_rebased = is_rebased(target_ref, source_ref)
+
+    # Predict merge conflicts with the source branch
+    if DataProvider.MERGE_CONFLICTS in providers and source_ref:
+        progress.update(main_task, advance=1, description="[yellow]Predicting merge conflicts[/yellow]")
+        use_cache = target_context.tool_versions is not None
+        code_review_schema.merge_conflicts = predict_conflicts([(target_ref, source_ref)], use_cache=use_cache)[0]
+
+    # Look for N+1 queries on the lines changed since the branch forked from its source branch
+    if DataProvider.QUERY_PATTERNS in providers:
+        progress.update(main_task, advance=1, description="[yellow]Looking for N+1 queries[/yellow]")
+        code_review_schema.query_findings = find_issues_on_changed_lines(
+            target_ref, source_ref or base_ref, target_context.worktree, DJANGO_RULES
+        )
+
+
+def check_all_rules(
+    code_review_schema: CodeReviewSchema, rules: list[RuleDefinition] | None = None
+) -> list[RulesResult]:
+    """Run the validation rules against the code review schema.
+
+    The rules run concurrently through the rule scheduler and their results are returned in the order of the
+    rule registry. The time of each rule is stored in ``code_review_schema.rule_timings``.
 
     Args:
         code_review_schema: The CodeReviewSchema object to validate
+        rules: Rules to run. None runs every registered rule.
 
     Returns:
         List of RulesResult objects containing validation results
     """
-    rules = []
-    checks = [
-        ci_file_rules.check,
-        linting_rules.check,
-        rebase_rule,
-        version_rules.check,
-        docker_image_rules.check,
-        readme_rules.check,
-        requirement_rules.check,
-        unvetted_requirements_rules.check,
-
-    ]
-    total_work = len(checks)
+    if rules is None:
+        rules = RULES
+    total_work = len(rules)
 
     with Progress(
             SpinnerColumn(),  # Use a spinner column for dynamic status updates
@@ -218,21 +600,41 @@ def check_all_rules(code_review_schema: CodeReviewSchema)-> list[RulesResult]:
             transient=True,
     ) as progress:
         # Add a single task that covers the entire process
-        main_task = progress.add_task("[cyan]Total Sync Progress[/cyan]", total=total_work)
-        for check in checks:
-            progress.update(main_task,advance=1, description=f"[yellow]Running {check.__name__}[/yellow]")
-            result = check(code_review_schema)
-            if result:
-                rules.extend(result)
-    return rules
-
-def get_version_from_config_file(folder: Path, app_name: str) -> SemanticVersion | None:
-    """Extract the version string from a given file."""
-    setup_file = folder / "setup.cfg"
-    if not setup_file.exists():
-        setup_file = folder / ".bumpversion.cfg"
-
-    setup_dict = setup_to_dict(setup_file)
+        main_task = progress.add_task("[cyan]Running rules[/cyan]", total=total_work)
+
+        def rule_done(rule: RuleDefinition) -> None:
+            progress.update(main_task, advance=1, description=f"[yellow]Finished {rule.name}[/yellow]")
+
+        return run_rules(code_review_schema, rules, on_rule_done=rule_done)
+
+
+def get_version_from_config_file(
+    folder: Path, app_name: str, reader: CatFileReader | None = None, ref: str | None = None
+) -> SemanticVersion | None:
+    """Extract the version string from a given file.
+
+    Args:
+        folder: Folder containing setup.cfg or .bumpversion.cfg.
+        app_name: Name of the application.
+        reader: If given with a ref, the config files are read from git instead of the folder.
+        ref: Ref to read the config files from.
+    """
+    content = None
+    if reader is not None and ref is not None:
+        for name in ("setup.cfg", ".bumpversion.cfg"):
+            content = reader.read_text(ref, name)
+            if content is not None:
+                break
+        if content is None:
+            logger.error("No setup.cfg or .bumpversion.cfg in %s", ref)
+            return None
+        setup_file = folder / name
+    else:
+        setup_file = folder / "setup.cfg"
+        if not setup_file.exists():
+            setup_file = folder / ".bumpversion.cfg"
+
+    setup_dict = setup_to_dict(setup_file, content=content)
     if setup_dict.get("bumpversion", {}).get("current_version"):
         version_str = setup_dict["bumpversion"]["current_version"]
         return SemanticVersion.parse_version(version_str, app_name, setup_file)
@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from code_review.adapters.generics import parse_for_ticket
+from code_review.enums import LintScope, RuffBackend
+from code_review.handlers.file_handlers import change_directory, get_all_project_folder
+from code_review.plugins.git.handlers import _get_unmerged_branches, resolve_branch_ref
+from code_review.plugins.linting.ruff.server import ruff_server_session
+from code_review.review.adapters import build_code_review_schema
+from code_review.review.reporting import json as json_report
+from code_review.review.reporting import markdown as markdown_report
+from code_review.review.rules.registry import select_rules
+from code_review.settings import CLI_CONSOLE, CURRENT_CONFIGURATION
+
+logger = logging.getLogger(__name__)
+
+
+class BatchReviewResult(BaseModel):
+    """Schema for the result of reviewing one branch in a batch review."""
+
+    project: str = Field(description="Name of the project")
+    branch: str = Field(description="Name of the reviewed branch")
+    author: str | None = Field(default=None, description="Author of the branch")
+    ticket: str | None = Field(default=None, description="Ticket of the review")
+    failed_rules: int = Field(default=0, description="Number of rules that did not pass")
+    warnings: int = Field(default=0, description="Number of rules that passed with a warning")
+    json_file: Path | None = Field(default=None, description="Path to the JSON report")
+    markdown_file: Path | None = Field(default=None, description="Path to the markdown report")
+    error: str | None = Field(default=None, description="Error that stopped the review, if any")
+
+
+class BatchReviewOptions(BaseModel):
+    """Schema for the settings shared by the reviews of a batch review."""
+
+    author: str | None = Field(default=None, description="Only branches whose author contains this text are reviewed")
+    only: list[str] | None = Field(default=None, description="Names of the rules to run")
+    skip: list[str] | None = Field(default=None, description="Names of the rules to leave out")
+    use_cache: bool = Field(default=True, description="Whether to read and write the review cache")
+    lint_scope: LintScope | None = Field(
+        default=None, description="Whether ruff checks the whole projects or only the files changed on each branch"
+    )
+    ruff_backend: RuffBackend | None = Field(
+        default=None,
+        description="Whether ruff runs as a command for each branch or as one server for all the branches of a "
+        "project. Defaults to the 'ruff_backend' setting",
+    )
+
+
+def get_batch_ticket(branch_name: str) -> str:
+    """Returns the ticket used to name the reports of a branch reviewed without prompting.
+
+    Args:
+        branch_name: Name of the branch, e.g. 'feature/ABC-123-new-form'.
+
+    Returns:
+        The ticket parsed from the branch name or the branch name with '/' replaced by '-'.
+    """
+    return parse_for_ticket(branch_name) or branch_name.replace("/", "-")
+
+
+def review_project(folder: Path, output_folder: Path, options: BatchReviewOptions) -> list[BatchReviewResult]:
+    """Reviews every unmerged branch of a project and writes the reports.
+
+    It runs in a worker process of the batch review, so changing the working directory does not affect other
+    projects. Errors are recorded in the results instead of being raised so one broken branch or project does
+    not stop the batch.
+
+    Args:
+        folder: Path to the git repository.
+        output_folder: Folder where the reports are written.
+        options: Settings of the reviews.
+    """
+    # Several workers share the terminal, so the progress bars of each review are not shown.
+    CLI_CONSOLE.quiet = True
+    try:
+        change_directory(folder)
+        unmerged_branches = _get_unmerged_branches(resolve_branch_ref("master"), author_pattern=options.author)
+    except Exception as e:  # noqa: BLE001
+        logger.error("Could not list the branches of %s: %s", folder, e)
+        return [BatchReviewResult(project=folder.name, branch="", error=str(e))]
+
+    rules = select_rules(options.only, options.skip) if options.only or options.skip else None
+    ruff_backend = RuffBackend(options.ruff_backend or CURRENT_CONFIGURATION.get("ruff_backend", RuffBackend.CLI))
+    results = []
+    # One ruff server lints every branch of the project, so ruff discovers the settings and starts only once.
+    with ruff_server_session() if ruff_backend == RuffBackend.SERVER else nullcontext():
+        for branch in unmerged_branches:
+            result = BatchReviewResult(project=folder.name, branch=branch.name, author=branch.author)
+            try:
+                code_review_schema = build_code_review_schema(
+                    folder, branch.name, rules=rules, use_cache=options.use_cache, lint_scope=options.lint_scope
+                )
+                code_review_schema.ticket = get_batch_ticket(branch.name)
+                result.ticket = code_review_schema.ticket
+                result.failed_rules = len([rule for rule in code_review_schema.rules_validated if not rule.passed])
+                result.warnings = len(
+                    [rule for rule in code_review_schema.rules_validated if rule.passed and rule.level == "WARNING"]
+                )
+                result.json_file, _ = json_report.write_review(review=code_review_schema, folder=output_folder)
+                result.markdown_file, _ = markdown_report.write_review(review=code_review_schema, folder=output_folder)
+            except Exception as e:  # noqa: BLE001
+                logger.error("Could not review %s in %s: %s", branch.name, folder, e)
+                result.error = str(e)
+            results.append(result)
+    return results
+
+
+def write_batch_index(results: list[BatchReviewResult], folder: Path) -> tuple[Path, Path]:
+    """Writes the summary index of a batch review as JSON and markdown.
+
+    Args:
+        results: Results of the reviewed branches.
+        folder: Folder where the index is written.
+
+    Returns:
+        The paths of the JSON and markdown index files.
+    """
+    json_file = folder / "batch_review_index.json"
+    with open(json_file, "w") as f:
+        json.dump([result.model_dump() for result in results], f, indent=4, default=str)
+
+    markdown_file = folder / "batch_review_index.md"
+    with markdown_file.open("w", encoding="utf-8") as report_file:
+        report_file.write("# Batch Code Review\n\n")
+        report_file.write(f"Reviewed **{len(results)}** branch(es).\n\n")
+        report_file.write("| Project | Branch | Author | Failed | Warnings | Report |\n")
+        report_file.write("|---|---|---|---|---|---|\n")
+        for result in results:
+            report = result.markdown_file.name if result.markdown_file else f"Error: {result.error}"
+            report_file.write(
+                f"| {result.project} | {result.branch} | {result.author or ''} | {result.failed_rules} "
+                f"| {result.warnings} | {report} |\n"
+            )
+    return json_file, markdown_file
+
+
+def run_batch_review(
+    base_folder: Path,
+    output_folder: Path,
+    options: BatchReviewOptions | None = None,
+    max_workers: int | None = None,
+    exclusion_list: list[str] | None = None,
+) -> list[BatchReviewResult]:
+    """Reviews the unmerged branches of every git project in a base folder.
+
+    Each project is reviewed in its own worker process. Branches are checked out in temporary worktrees, so the
+    checkouts in the base folder are not modified.
+
+    Args:
+        base_folder: Folder that contains the git projects.
+        output_folder: Folder where the reports and the summary index are written.
+        options: Settings of the reviews. Defaults to reviewing every branch with every rule.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+        exclusion_list: Names of project folders to leave out.
+
+    Returns:
+        The results sorted by project and branch.
+    """
+    project_folders = get_all_project_folder(base_folder, exclusion_list)
+    if not project_folders:
+        return []
+    max_workers = min(max_workers or os.cpu_count() or 1, len(project_folders))
+    options = options or BatchReviewOptions()
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(review_project, folder.resolve(), output_folder, options): folder
+            for folder in project_folders
+        }
+        for future in as_completed(futures):
+            folder = futures[future]
+            try:
+                project_results = future.result()
+            except Exception as e:  # noqa: BLE001
+                logger.error("Review of %s failed: %s", folder, e)
+                project_results = [BatchReviewResult(project=folder.name, branch="", error=str(e))]
+            CLI_CONSOLE.print(f"Reviewed [cyan]{folder.name}[/cyan]: {len(project_results)} branch(es)")
+            results.extend(project_results)
+    return sorted(results, key=lambda result: (result.project, result.branch))
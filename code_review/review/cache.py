@@ -0,0 +1,143 @@
+import logging
+from datetime import date
+from typing import Any
+
+from pydantic import BaseModel, Field, ValidationError
+
+from code_review.enums import LintScope
+from code_review.handlers.cache_handlers import DiskCache, hash_key
+from code_review.plugins.dependencies.pip.handlers import get_pur_version
+from code_review.plugins.git.handlers import get_commit_hash
+from code_review.plugins.linting.ruff.handlers import get_ruff_version
+from code_review.review.providers import NETWORK_PROVIDERS, PROVIDER_INPUTS, PROVIDER_TOOLS, DataProvider
+from code_review.review.schemas import CodeReviewSchema
+from code_review.settings import CACHE_FOLDER, CURRENT_CONFIGURATION
+
+logger = logging.getLogger(__name__)
+
+REVIEW_CACHE = DiskCache(CACHE_FOLDER / "reviews", max_entries=200, max_size=50 * 1024 * 1024)
+PROVIDER_CACHE = DiskCache(CACHE_FOLDER / "providers", max_entries=5000, max_size=200 * 1024 * 1024)
+
+
+class CachedReview(BaseModel):
+    """Schema for a code review stored in the review cache."""
+
+    configuration_hash: str = Field(description="Hash of the configuration the rules were validated with")
+    rules: list[str] = Field(default_factory=list, description="Names of the rules that were validated")
+    review: CodeReviewSchema = Field(description="The cached code review")
+
+
+def get_configuration_hash(configuration: dict[str, Any] | None = None) -> str:
+    """Returns a hash of the configuration used to validate the rules.
+
+    Args:
+        configuration: The configuration to hash. Defaults to the current configuration.
+    """
+    return hash_key(CURRENT_CONFIGURATION if configuration is None else configuration)
+
+
+def get_tool_versions() -> dict[str, str | None]:
+    """Returns the versions of the external tools whose output is stored in a review."""
+    return {"ruff": get_ruff_version(), "pur": get_pur_version()}
+
+
+def get_review_cache_key(
+    refs: list[str],
+    project: str,
+    tool_versions: dict[str, str | None] | None = None,
+    lint_scope: LintScope = LintScope.PROJECT,
+    providers: set[DataProvider] | None = None,
+) -> str:
+    """Builds the cache key of a review from the commits of the refs it reads and the tool versions.
+
+    The configuration is not part of the key so a review whose configuration changed can still reuse the data
+    collected from git, ruff and pur.
+
+    Args:
+        refs: Refs the review reads, e.g. the base, target and source branches.
+        project: Path of the project folder. Reviews carry paths inside it and its name.
+        tool_versions: Versions from `get_tool_versions`. They are looked up if not given.
+        lint_scope: Files the review lints. Reviews that only lint the changed files are cached apart.
+        providers: Data providers the review collects. Reviews that query package indexes, see
+            NETWORK_PROVIDERS, are only reused on the day they were made, like their provider results.
+    """
+    parts = {
+        "commits": {ref: get_commit_hash(ref) for ref in refs},
+        "project": project,
+        "tools": tool_versions or get_tool_versions(),
+        "lint_scope": LintScope(lint_scope).value,
+    }
+    if providers and providers & NETWORK_PROVIDERS:
+        parts["date"] = date.today().isoformat()
+    return hash_key(parts)
+
+
+def get_provider_cache_key(
+    provider: DataProvider,
+    project: str,
+    object_hashes: dict[str, str | None],
+    tool_versions: dict[str, str | None],
+    paths: list[str] | None = None,
+) -> str:
+    """Builds the cache key of the result of a branch data provider.
+
+    Args:
+        provider: The data provider.
+        project: Path of the project folder. Cached results carry paths inside it and its name.
+        object_hashes: Git object hashes of the paths the provider reads, see PROVIDER_INPUTS. Every hash is
+            used for providers that are not listed there, e.g. the hashes of the Dockerfiles.
+        tool_versions: Versions from `get_tool_versions`.
+        paths: Paths the provider reads. Defaults to the paths in PROVIDER_INPUTS.
+    """
+    paths = paths if paths is not None else PROVIDER_INPUTS.get(provider, sorted(object_hashes))
+    parts = {
+        "provider": provider.value,
+        "project": project,
+        "inputs": {path: object_hashes.get(path) for path in paths},
+        "tools": {tool: tool_versions.get(tool) for tool in PROVIDER_TOOLS.get(provider, [])},
+    }
+    if provider in NETWORK_PROVIDERS:
+        parts["date"] = date.today().isoformat()
+    return hash_key(parts)
+
+
+def load_review(key: str, cache: DiskCache = REVIEW_CACHE) -> CachedReview | None:
+    """Returns the cached review for the key or None if there is none.
+
+    Args:
+        key: Key built with `get_review_cache_key`.
+        cache: Cache to read from.
+    """
+    data = cache.get(key)
+    if data is None:
+        return None
+    try:
+        return CachedReview.model_validate(data)
+    except ValidationError as e:
+        logger.warning("Discarding invalid cached review %s: %s", key, e)
+        cache.delete(key)
+        return None
+
+
+def save_review(
+    key: str,
+    review: CodeReviewSchema,
+    rules: list[str],
+    configuration_hash: str | None = None,
+    cache: DiskCache = REVIEW_CACHE,
+) -> None:
+    """Stores a review in the cache.
+
+    Args:
+        key: Key built with `get_review_cache_key`.
+        review: The review to store.
+        rules: Names of the rules validated in the review.
+        configuration_hash: Hash of the configuration. Defaults to the hash of the current configuration.
+        cache: Cache to write to.
+    """
+    cached_review = CachedReview(
+        configuration_hash=configuration_hash or get_configuration_hash(),
+        rules=rules,
+        review=review,
+    )
+    cache.set(key, cached_review.model_dump(mode="json"))
@@ -3,6 +3,7 @@ from datetime import datetime
 from pathlib import Path
 
 from code_review.enums import ReviewRuleLevelIcon
+from code_review.review.providers import DataProvider
 from code_review.review.schemas import CodeReviewSchema
 from code_review.settings import CLI_CONSOLE
 
@@ -18,59 +19,76 @@ def display_review(review: CodeReviewSchema, base_branch_name: str = "develop")
     """
     CLI_CONSOLE.print(f"[bold blue]Code Review for Project:[/bold blue] {review.name} by {review.target_branch.author}")
     CLI_CONSOLE.print(f"[bold blue]Branch: {review.target_branch.name}[/bold blue]")
+    if DataProvider.REBASE in review.data_providers:
+        _display_rebase(review, base_branch_name)
+    # Linting comparison
+    if DataProvider.LINTING in review.data_providers:
+        _display_linting(review)
+    logger.debug("Review Details: %s", review.target_branch.changelog_versions)
+    logger.debug("Review version: %s", review.target_branch.version)
+    print("-" * 80)
+    # Rules validated
+    CLI_CONSOLE.print("[bold blue]>>> Rules Validated <<<[/bold blue]")
+    _display_rules(review)
+
+    print("-" * 80)
+    _display_versioning(review)
+
+
+def _display_rebase(review: CodeReviewSchema, base_branch_name: str) -> None:
+    branch_name = review.target_branch.name
     if review.is_rebased:
         CLI_CONSOLE.print(
-            f"[bold green]{ReviewRuleLevelIcon.INFO.value} Branch {review.target_branch.name} is rebased on {base_branch_name}.[/bold green]"
+            f"[bold green]{ReviewRuleLevelIcon.INFO.value} Branch {branch_name} is rebased on "
+            f"{base_branch_name}.[/bold green]"
         )
     else:
         CLI_CONSOLE.print(
-            f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Branch {review.target_branch.name} is not rebased on {base_branch_name}![/bold red]"
+            f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Branch {branch_name} is not rebased on "
+            f"{base_branch_name}![/bold red]"
         )
-    # Linting comparison
+
+
+def _display_linting(review: CodeReviewSchema) -> None:
+    counts = (
+        f"base has {review.base_branch.linting_errors} while {review.target_branch.name} "
+        f"has {review.target_branch.linting_errors}"
+    )
     if review.target_branch.linting_errors > review.base_branch.linting_errors:
-        CLI_CONSOLE.print(
-            f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Linting Issues Increased![/bold red] base has "
-            f"{review.base_branch.linting_errors} while {review.target_branch.name} "
-            f"has {review.target_branch.linting_errors}"
-        )
+        CLI_CONSOLE.print(f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Linting Issues Increased![/bold red] {counts}")
     elif (
         review.target_branch.linting_errors == review.base_branch.linting_errors
         and review.target_branch.linting_errors != 0
     ):
         CLI_CONSOLE.print(
-            f"[bold yellow]{ReviewRuleLevelIcon.WARNING.value} Linting Issues Stayed the Same![/bold yellow] base has "
-            f"{review.base_branch.linting_errors} while {review.target_branch.name} "
-            f"has {review.target_branch.linting_errors}"
+            f"[bold yellow]{ReviewRuleLevelIcon.WARNING.value} Linting Issues Stayed the Same![/bold yellow] {counts}"
         )
     else:
         CLI_CONSOLE.print(
-            f"[bold green]{ReviewRuleLevelIcon.INFO.value} Linting Issues Decreased or Stayed the Same.[/bold green] base has "
-            f"{review.base_branch.linting_errors} while {review.target_branch.name} "
-            f"has {review.target_branch.linting_errors}"
+            f"[bold green]{ReviewRuleLevelIcon.INFO.value} Linting Issues Decreased or Stayed the Same."
+            f"[/bold green] {counts}"
         )
-    logger.debug("Review Details: %s", review.target_branch.changelog_versions)
-    logger.debug("Review version: %s", review.target_branch.version)
-    print("-" * 80)
-    # Rules validated
-    CLI_CONSOLE.print("[bold blue]>>> Rules Validated <<<[/bold blue]")
 
+
+def _display_rules(review: CodeReviewSchema) -> None:
     filtered_rules = [rule for rule in review.rules_validated if not rule.passed or rule.level == "WARNING"]
-    if filtered_rules:
-        for rule in filtered_rules:
-            if rule.passed:
-                CLI_CONSOLE.print(
-                    f"[bold green]{ReviewRuleLevelIcon.INFO.value} Rule Passed: {rule.name} {rule.message}[/bold green]"
-                )
-            elif rule.level == "WARNING":
-                CLI_CONSOLE.print(
-                    f"[bold yellow]{ReviewRuleLevelIcon.WARNING.value} Rule Warning: {rule.name} {rule.message}[/bold yellow]"
-                )
-            else:
-                CLI_CONSOLE.print(
-                    f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Rule Failed: {rule.name} {rule.message}[/bold red]"
-                )
+    for rule in filtered_rules:
+        if rule.passed:
+            CLI_CONSOLE.print(
+                f"[bold green]{ReviewRuleLevelIcon.INFO.value} Rule Passed: {rule.name} {rule.message}[/bold green]"
+            )
+        elif rule.level == "WARNING":
+            CLI_CONSOLE.print(
+                f"[bold yellow]{ReviewRuleLevelIcon.WARNING.value} Rule Warning: {rule.name} "
+                f"{rule.message}[/bold yellow]"
+            )
+        else:
+            CLI_CONSOLE.print(
+                f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Rule Failed: {rule.name} {rule.message}[/bold red]"
+            )
 
-    print("-" * 80)
+
+def _display_versioning(review: CodeReviewSchema) -> None:
     if len(review.target_branch.changelog_versions) == 0 or review.target_branch.version is None:
         logger.error("Skipping version check due to missing information")
         return
@@ -79,13 +97,13 @@ def display_review(review: CodeReviewSchema, base_branch_name: str = "develop")
     logger.debug("Latest changelog version: %s", changelog_latest_version)
     if review.target_branch.version < changelog_latest_version:
         CLI_CONSOLE.print(
-            f"[bold green]{ReviewRuleLevelIcon.INFO.value} Versioning is correct expected to move from {review.target_branch.version} "
-            f"to {changelog_latest_version}![/bold green] "
+            f"[bold green]{ReviewRuleLevelIcon.INFO.value} Versioning is correct expected to move from "
+            f"{review.target_branch.version} to {changelog_latest_version}![/bold green] "
         )
     else:
         CLI_CONSOLE.print(
-            f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Versioning is not correct expected to move from {review.target_branch.version} "
-            f"to {changelog_latest_version}![/bold red] "
+            f"[bold red]{ReviewRuleLevelIcon.ERROR.value} Versioning is not correct expected to move from "
+            f"{review.target_branch.version} to {changelog_latest_version}![/bold red] "
         )
 
 
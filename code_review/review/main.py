@@ -4,16 +4,20 @@ import click
 
 from code_review.adapters.generics import parse_for_ticket
 from code_review.cli import cli
+from code_review.enums import LintScope, RuffBackend
 from code_review.handlers.file_handlers import change_directory
 from code_review.plugins.git.handlers import (
-    _are_there_uncommited_changes,
     _get_unmerged_branches,
     display_branches,
+    refresh_from_remote,
+    resolve_branch_ref,
     sync_branches,
 )
 from code_review.review.adapters import build_code_review_schema
+from code_review.review.batch import BatchReviewOptions, run_batch_review, write_batch_index
 from code_review.review.handlers import display_review, get_dated_folder_for_code_reviews
 from code_review.review.reporting import json, markdown
+from code_review.review.rules.registry import get_rule, select_rules
 from code_review.settings import CLI_CONSOLE, CURRENT_CONFIGURATION, OUTPUT_FOLDER
 
 
@@ -23,24 +27,55 @@ def review() -> None:
     pass
 
 
+def _parse_rule_names(ctx: click.Context, param: click.Parameter, value: str | None) -> list[str]:  # noqa: ARG001
+    """Click callback that splits a comma separated list of rule names and validates them."""
+    if not value:
+        return []
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    for name in names:
+        try:
+            get_rule(name)
+        except KeyError as e:
+            raise click.BadParameter(str(e.args[0])) from e
+    return names
+
+
 @review.command()
 @click.option("--folder", "-f", type=Path, help="Path to the git repository", default=None)
 @click.option("--author", "-a", type=str, help="Name of the author", default=None)
 @click.option("--page-size", "-p", type=int, help="Page size. If zero all", default=0)
-def make(folder: Path, author: str, page_size: int) -> None:
+@click.option(
+    "--only", callback=_parse_rule_names, help="Comma separated rules to run, e.g. gitlab-ci,versioning", default=None
+)
+@click.option("--skip", callback=_parse_rule_names, help="Comma separated rules to leave out", default=None)
+@click.option("--no-cache", is_flag=True, help="Ignore cached reviews and review the branch again", default=False)
+@click.option(
+    "--lint-scope",
+    type=click.Choice([scope.value for scope in LintScope]),
+    help="Lint the whole project or only the Python files changed on the branch. Defaults to the 'lint_scope' setting",
+    default=None,
+)
+# click passes one argument per option.
+def make(  # noqa: PLR0913, PLR0917
+    folder: Path,
+    author: str,
+    page_size: int,
+    only: list[str],
+    skip: list[str],
+    no_cache: bool,
+    lint_scope: str | None,
+) -> None:
     """List branches in the specified Git repository."""
     change_directory(folder)
     CLI_CONSOLE.print(f"Changing to directory: [cyan]{folder}[/cyan]")
-    uncommited_changes = _are_there_uncommited_changes()
-    if uncommited_changes:
-        CLI_CONSOLE.print(
-            "[red]You have uncommited changes, please commit or stash them before running the review.[/red]"
-        )
-        return
 
+    # Branches are reviewed in temporary worktrees from their remote-tracking refs, so the current checkout
+    # (and any uncommitted changes in it) is left untouched. The default branches are fast-forwarded without
+    # checking them out. One full fetch serves both the sync and the list of branches.
+    refresh_from_remote("origin")
     sync_branches(CURRENT_CONFIGURATION["default_branches"])
 
-    unmerged_branches = _get_unmerged_branches("master", author_pattern=author)
+    unmerged_branches = _get_unmerged_branches(resolve_branch_ref("master"), author_pattern=author, fetch=False)
     if not unmerged_branches:
         click.echo("No unmerged branches found.")
         return
@@ -49,7 +84,11 @@ def make(folder: Path, author: str, page_size: int) -> None:
     selected_branch = unmerged_branches[branch_num - 1]
     click.echo(f"You selected branch: {selected_branch.name}")
 
-    code_review_schema = build_code_review_schema(folder, selected_branch.name)
+    # Only the data needed by the selected rules is collected. Without filters the full review is made.
+    rules = select_rules(only, skip) if only or skip else None
+    code_review_schema = build_code_review_schema(
+        folder, selected_branch.name, rules=rules, use_cache=not no_cache, lint_scope=lint_scope
+    )
 
     ticket_number = parse_for_ticket(selected_branch.name)
 
@@ -68,3 +107,60 @@ def make(folder: Path, author: str, page_size: int) -> None:
     # Write markdown report
     md_file, _ = markdown.write_review(review=code_review_schema, folder=code_review_folder)
     CLI_CONSOLE.print("[bold blue]Code review report written to:[/bold blue] " + str(md_file))
+
+
+@review.command()
+@click.option("--base-folder", "-b", type=Path, help="Folder that contains the git projects", required=True)
+@click.option("--author", "-a", type=str, help="Name of the author", default=None)
+@click.option("--workers", "-w", type=int, help="Number of projects reviewed at the same time", default=None)
+@click.option("--exclude", "-e", multiple=True, help="Project folder names to leave out", default=())
+@click.option(
+    "--only", callback=_parse_rule_names, help="Comma separated rules to run, e.g. gitlab-ci,versioning", default=None
+)
+@click.option("--skip", callback=_parse_rule_names, help="Comma separated rules to leave out", default=None)
+@click.option("--no-cache", is_flag=True, help="Ignore cached reviews and review the branches again", default=False)
+@click.option(
+    "--lint-scope",
+    type=click.Choice([scope.value for scope in LintScope]),
+    help="Lint the whole project or only the Python files changed on the branch. Defaults to the 'lint_scope' setting",
+    default=None,
+)
+@click.option(
+    "--ruff-backend",
+    type=click.Choice([backend.value for backend in RuffBackend]),
+    help="Run ruff check for each branch or keep one ruff server per project. Defaults to the 'ruff_backend' setting",
+    default=None,
+)
+def batch(  # noqa: PLR0913, PLR0917
+    base_folder: Path,
+    author: str,
+    workers: int | None,
+    exclude: tuple[str, ...],
+    only: list[str],
+    skip: list[str],
+    no_cache: bool,
+    lint_scope: str | None,
+    ruff_backend: str | None,
+) -> None:
+    """Review every unmerged branch of every project in a folder without prompting."""
+    base_folder = base_folder.expanduser()
+    code_review_folder = get_dated_folder_for_code_reviews(OUTPUT_FOLDER)
+    options = BatchReviewOptions(
+        author=author,
+        only=only,
+        skip=skip,
+        use_cache=not no_cache,
+        lint_scope=lint_scope,
+        ruff_backend=ruff_backend,
+    )
+    results = run_batch_review(
+        base_folder, code_review_folder, options, max_workers=workers, exclusion_list=list(exclude)
+    )
+    if not results:
+        click.echo(f"No projects found in {base_folder}.")
+        return
+    json_index, md_index = write_batch_index(results, code_review_folder)
+    errors = [result for result in results if result.error]
+    CLI_CONSOLE.print(f"Reviewed [bold]{len(results) - len(errors)}[/bold] branch(es), {len(errors)} error(s).")
+    CLI_CONSOLE.print("[bold blue]Batch index written to:[/bold blue] " + str(md_index))
+    CLI_CONSOLE.print("[bold blue]Batch index JSON written to:[/bold blue] " + str(json_index))
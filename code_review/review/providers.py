@@ -0,0 +1,97 @@
+from enum import Enum
+
+from code_review.review.schemas import RuleDefinition
+
+
+class DataProvider(str, Enum):
+    """Steps that collect the data a code review is built from."""
+
+    LINTING = "linting"
+    FORMATTING = "formatting"
+    MIN_COVERAGE = "min_coverage"
+    REQUIREMENTS = "requirements"
+    REQUIREMENTS_TO_UPDATE = "requirements_to_update"
+    VERSION = "version"
+    CHANGELOG = "changelog"
+    DOCKER_FILES = "docker_files"
+    REBASE = "rebase"
+    MERGE_CONFLICTS = "merge_conflicts"
+    QUERY_PATTERNS = "query_patterns"
+
+
+# CodeReviewSchema fields filled by each provider. Fields not listed here (branch names, authors, file paths)
+# are always collected. The last field of a branch provider is the one its result is stored in.
+PROVIDER_FIELDS: dict[DataProvider, list[str]] = {
+    DataProvider.LINTING: [
+        "base_branch.linting_errors",
+        "target_branch.linting_errors",
+        "base_branch.linting_violations",
+        "target_branch.linting_violations",
+    ],
+    DataProvider.FORMATTING: ["target_branch.formatting_errors", "target_branch.unformatted_files"],
+    DataProvider.MIN_COVERAGE: ["base_branch.min_coverage", "target_branch.min_coverage"],
+    DataProvider.REQUIREMENTS: ["target_branch.requirements"],
+    DataProvider.REQUIREMENTS_TO_UPDATE: ["target_branch.requirements_to_update"],
+    DataProvider.VERSION: ["base_branch.version", "target_branch.version"],
+    DataProvider.CHANGELOG: ["base_branch.changelog_versions", "target_branch.changelog_versions"],
+    DataProvider.DOCKER_FILES: ["docker_files"],
+    DataProvider.REBASE: ["is_rebased"],
+    DataProvider.MERGE_CONFLICTS: ["merge_conflicts"],
+    DataProvider.QUERY_PATTERNS: ["query_findings"],
+}
+
+
+# Paths, relative to the repository root, each branch provider reads. An empty string stands for the whole tree.
+# Cached provider results are keyed by the git object hashes of these paths.
+PROVIDER_INPUTS: dict[DataProvider, list[str]] = {
+    DataProvider.LINTING: [""],
+    DataProvider.FORMATTING: [""],
+    DataProvider.MIN_COVERAGE: ["Makefile", "makefile"],
+    DataProvider.REQUIREMENTS: ["requirements"],
+    DataProvider.REQUIREMENTS_TO_UPDATE: ["requirements"],
+    DataProvider.VERSION: ["setup.cfg", ".bumpversion.cfg"],
+    DataProvider.CHANGELOG: ["CHANGELOG.md"],
+}
+
+# External tools whose version changes the result of a provider.
+PROVIDER_TOOLS: dict[DataProvider, list[str]] = {
+    DataProvider.LINTING: ["ruff"],
+    DataProvider.FORMATTING: ["ruff"],
+    DataProvider.REQUIREMENTS_TO_UPDATE: ["pur"],
+}
+
+# Providers that run ruff. They can lint only the files changed on the target branch, see LintScope.
+RUFF_PROVIDERS: set[DataProvider] = {DataProvider.LINTING, DataProvider.FORMATTING}
+
+# Providers that query remote services. Their cached results are only reused on the same day.
+NETWORK_PROVIDERS: set[DataProvider] = {DataProvider.REQUIREMENTS_TO_UPDATE}
+
+
+def get_required_fields(rules: list[RuleDefinition] | None = None) -> set[str]:
+    """Returns the CodeReviewSchema fields that have to be collected for the rules.
+
+    Args:
+        rules: Rules that will be run. None means a full review, in which case every field is collected.
+    """
+    if rules is None:
+        return {field for fields in PROVIDER_FIELDS.values() for field in fields}
+    return {field for rule in rules for field in rule.fields}
+
+
+def get_required_providers(rules: list[RuleDefinition] | None = None, branch: str | None = None) -> set[DataProvider]:
+    """Returns the data providers that have to run to validate the rules.
+
+    Args:
+        rules: Rules that will be run. None means a full review, in which case every provider runs.
+        branch: If 'base_branch' or 'target_branch', only the providers needed for that branch are returned.
+
+    Returns:
+        The set of providers whose fields are read by at least one of the rules.
+    """
+    required_fields = get_required_fields(rules)
+    providers = set()
+    for provider, fields in PROVIDER_FIELDS.items():
+        for field in fields:
+            if field in required_fields and (branch is None or field.startswith(f"{branch}.")):
+                providers.add(provider)
+    return providers
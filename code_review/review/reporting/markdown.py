@@ -3,6 +3,7 @@ from pathlib import Path
 
 from code_review.enums import ReviewRuleLevelIcon
 from code_review.review.schemas import CodeReviewSchema
+from code_review.schemas import RulesResult
 
 
 def write_review(review: CodeReviewSchema, folder: Path) -> tuple[Path, Path | None]:
@@ -33,11 +34,16 @@ def write_review(review: CodeReviewSchema, folder: Path) -> tuple[Path, Path | N
         for rule in errors_and_warnings:
             report_file.write(f"Found **{len(errors_and_warnings)}** issue(s) to fix.\n\n")
             status = f"{ReviewRuleLevelIcon.WARNING.value}" if rule.passed else f"{ReviewRuleLevelIcon.ERROR.value}"
-            report_file.write(f"- **{status} {rule.name}**: - {rule.message}\n")
+            report_file.write(f"- **{status} {rule.name}**{_format_location(rule)}: - {rule.message}\n")
 
         report_file.write("### Passed\n")
         for rule in passed_rules:
             status = f"{ReviewRuleLevelIcon.INFO.value}" if rule.passed else f"{ReviewRuleLevelIcon.ERROR.value}"
-            report_file.write(f"- **{status} {rule.name}**: - {rule.message}\n")
+            report_file.write(f"- **{status} {rule.name}**{_format_location(rule)}: - {rule.message}\n")
 
     return report_path, backup_file
+
+
+def _format_location(rule: RulesResult) -> str:
+    """Formats the file and line of a result, e.g. ' (`app/views.py:12`)'."""
+    return f" (`{rule.location}`)" if rule.location else ""
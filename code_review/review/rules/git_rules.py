@@ -1,7 +1,7 @@
 import logging
 
 from code_review.plugins.git.adapters import is_rebased
-from code_review.plugins.git.handlers import get_tree_hash
+from code_review.plugins.git.handlers import get_sync_status, resolve_branch_ref
 from code_review.review.schemas import CodeReviewSchema
 from code_review.schemas import RulesResult
 
@@ -62,10 +62,9 @@ def validate_master_develop_sync_legacy(default_branches: list[str]) -> list[Rul
               False otherwise.
     """
     rules = []
-    master_hash = get_tree_hash(default_branches[0])
-    develop_hash = get_tree_hash(default_branches[1])
+    in_sync, master_hash, develop_hash = get_sync_status(default_branches[0], default_branches[1])
 
-    if develop_hash == master_hash:
+    if in_sync:
         rules.append(
             RulesResult(
                 name="Git",
@@ -122,3 +121,57 @@ def rebase_rule(code_review_schema: CodeReviewSchema) -> list[RulesResult]:
         )
     logger.info("Rebase rule results: %s", rules)
     return rules
+
+
+def merge_conflict_rule(code_review_schema: CodeReviewSchema) -> list[RulesResult]:
+    """Check that the target branch can be merged into its source branch without conflicts.
+
+    Args:
+        code_review_schema: An instance of CodeReviewSchema with the predicted merge conflicts.
+
+    Returns:
+        list[RulesResult]: A list containing a single RulesResult object with the outcome of the conflict check.
+    """
+    prediction = code_review_schema.merge_conflicts
+    target_branch_name = code_review_schema.target_branch.name
+    if prediction is None or prediction.has_conflicts is None:
+        reason = prediction.error if prediction else "The target branch has no git flow source branch."
+        return [
+            RulesResult(
+                name="Git Merge Conflicts",
+                level="WARNING",
+                passed=True,
+                message=f"Could not predict merge conflicts for '{target_branch_name}'.",
+                details=reason,
+            )
+        ]
+    if prediction.has_conflicts:
+        return [
+            RulesResult(
+                name="Git Merge Conflicts",
+                level="ERROR",
+                passed=False,
+                message=f"Target branch '{target_branch_name}' has conflicts with '{prediction.base}'.",
+                details=f"Conflicted files: {', '.join(prediction.conflicted_files)}",
+            )
+        ]
+    return [
+        RulesResult(
+            name="Git Merge Conflicts",
+            level="INFO",
+            passed=True,
+            message=f"Target branch '{target_branch_name}' merges into '{prediction.base}' without conflicts.",
+        )
+    ]
+
+
+def master_develop_sync_rule(code_review_schema: CodeReviewSchema) -> list[RulesResult]:  # noqa: ARG001
+    """Check that the 'master' and 'develop' branches point to the same tree.
+
+    Args:
+        code_review_schema: An instance of CodeReviewSchema. The rule reads the branches from git directly.
+
+    Returns:
+        list[RulesResult]: A list containing a single RulesResult object with the outcome of the sync check.
+    """
+    return validate_master_develop_sync_legacy([resolve_branch_ref("master"), resolve_branch_ref("develop")])
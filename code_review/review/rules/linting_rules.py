@@ -1,10 +1,21 @@
+from code_review.plugins.linting.ruff.handlers import compare_violations
+from code_review.plugins.linting.ruff.schemas import RuffViolation
 from code_review.review.schemas import CodeReviewSchema
 from code_review.schemas import BranchSchema, RulesResult
 
 
 def check(code_review: CodeReviewSchema) -> list[RulesResult]:
-    results = compare_linting_error_rules(code_review.base_branch,code_review.target_branch, "linting_errors")
+    base_violations = code_review.base_branch.linting_violations
+    target_violations = code_review.target_branch.linting_violations
+    if base_violations is not None and target_violations is not None:
+        results = [compare_linting_violations(base_violations, target_violations)]
+    else:
+        results = compare_linting_error_rules(code_review.base_branch,code_review.target_branch, "linting_errors")
     results.extend(compare_linting_error_rules(code_review.base_branch, code_review.target_branch, "formatting_errors"))
+    if code_review.linted_files is not None:
+        scope = f"Only the {len(code_review.linted_files)} Python files changed on the target branch were checked."
+        for result in results:
+            result.details = f"{result.details} {scope}" if result.details else scope
     return results
 
 
@@ -32,7 +43,11 @@ def compare_linting_error_rules(
                     level="ERROR",
                     passed=False,
                     message=f"Target branch has {target_count} formatting errors.",
-                    details=(f"Target branch has {target_branch.formatting_errors} formatting errors."),
+                    details=(
+                        f"Files to format: {_format_files(target_branch.unformatted_files)}"
+                        if target_branch.unformatted_files
+                        else f"Target branch has {target_branch.formatting_errors} formatting errors."
+                    ),
                 )
             )
         else:
@@ -95,3 +110,68 @@ def compare_linting_error_rules(
             )
         )
     return rules
+
+
+# Rules and files listed in the details of the linting result, the rest are summed up.
+MAX_COUNTS_IN_DETAILS = 10
+
+
+def compare_linting_violations(base: list[RuffViolation], target: list[RuffViolation]) -> RulesResult:
+    """Compare the ruff violations of two branches one by one instead of by their totals.
+
+    A branch that fixes one violation and introduces another has the same total as its base branch, but it
+    still fails.
+
+    Args:
+        base: Violations of the base branch.
+        target: Violations of the target branch.
+
+    Returns:
+        The result with the introduced and fixed violations per rule and per file in the details.
+    """
+    delta = compare_violations(base, target)
+    introduced, fixed = len(delta.introduced), len(delta.fixed)
+    details = "; ".join(
+        f"{title}: {_format_counts(counts)}"
+        for title, counts in (("By rule", delta.count_by_rule()), ("By file", delta.count_by_file()))
+        if counts
+    )
+    if introduced:
+        return RulesResult(
+            name="Linting Errors",
+            level="ERROR",
+            passed=False,
+            message=f"Target branch introduces {introduced} linting errors and fixes {fixed}.",
+            details=details,
+        )
+    if fixed:
+        return RulesResult(
+            name="Linting Errors",
+            level="INFO",
+            passed=True,
+            message=f"Target branch fixes {fixed} linting errors and introduces none.",
+            details=details,
+        )
+    if delta.unchanged:
+        return RulesResult(
+            name="Linting Errors",
+            level="WARNING",
+            passed=False,
+            message=f"Target branch has the same {delta.unchanged} linting errors as the base branch.",
+        )
+    return RulesResult(name="Linting Errors", level="INFO", passed=True, message="Neither branch has linting errors.")
+
+
+def _format_counts(counts: dict[str, tuple[int, int]]) -> str:
+    """Formats introduced and fixed counts, e.g. 'F401 +2/-1, E501 +0/-3'."""
+    items = [f"{key} +{introduced}/-{fixed}" for key, (introduced, fixed) in counts.items()]
+    if len(items) > MAX_COUNTS_IN_DETAILS:
+        items = [*items[:MAX_COUNTS_IN_DETAILS], f"and {len(items) - MAX_COUNTS_IN_DETAILS} more"]
+    return ", ".join(items)
+
+
+def _format_files(files: list[str]) -> str:
+    """Formats a list of files, e.g. 'app/models.py, app/views.py'."""
+    if len(files) > MAX_COUNTS_IN_DETAILS:
+        files = [*files[:MAX_COUNTS_IN_DETAILS], f"and {len(files) - MAX_COUNTS_IN_DETAILS} more"]
+    return ", ".join(files)
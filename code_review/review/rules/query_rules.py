@@ -0,0 +1,23 @@
+from code_review.review.schemas import CodeReviewSchema
+from code_review.schemas import RulesResult
+
+
+def check(code_review: CodeReviewSchema) -> list[RulesResult]:
+    """Reports the N+1 query patterns found on the lines changed on the target branch.
+
+    Args:
+        code_review: The CodeReviewSchema object with the query findings of the target branch.
+
+    Returns:
+        One result per problem, with its file and line, or a single passing result.
+    """
+    if code_review.query_findings:
+        return code_review.query_findings
+    return [
+        RulesResult(
+            name="N+1 Queries",
+            level="INFO",
+            passed=True,
+            message="No N+1 query patterns on the lines changed on the target branch.",
+        )
+    ]
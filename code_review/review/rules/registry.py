@@ -0,0 +1,115 @@
+from code_review.enums import RuleResource
+from code_review.review.rules import (
+    ci_file_rules,
+    docker_image_rules,
+    linting_rules,
+    query_rules,
+    readme_rules,
+    requirement_rules,
+    unvetted_requirements_rules,
+    version_rules,
+)
+from code_review.review.rules.git_rules import master_develop_sync_rule, merge_conflict_rule, rebase_rule
+from code_review.review.schemas import RuleDefinition
+
+# Rules in the order their results are reported.
+RULES: list[RuleDefinition] = [
+    RuleDefinition(
+        name="master-develop-sync",
+        check=master_develop_sync_rule,
+        resources=[RuleResource.GIT],
+    ),
+    RuleDefinition(
+        name="gitlab-ci",
+        check=ci_file_rules.check,
+        fields=["ci_file"],
+        resources=[RuleResource.FILESYSTEM],
+    ),
+    RuleDefinition(
+        name="linting",
+        check=linting_rules.check,
+        fields=[
+            "base_branch.linting_errors",
+            "target_branch.linting_errors",
+            "base_branch.linting_violations",
+            "target_branch.linting_violations",
+            "target_branch.formatting_errors",
+            "target_branch.unformatted_files",
+        ],
+    ),
+    RuleDefinition(
+        name="n-plus-one-queries",
+        check=query_rules.check,
+        fields=["query_findings"],
+    ),
+    RuleDefinition(
+        name="rebase",
+        check=rebase_rule,
+        fields=["is_rebased"],
+    ),
+    RuleDefinition(
+        name="merge-conflicts",
+        check=merge_conflict_rule,
+        fields=["merge_conflicts"],
+    ),
+    RuleDefinition(
+        name="versioning",
+        check=version_rules.check,
+        fields=["base_branch.changelog_versions", "target_branch.changelog_versions"],
+    ),
+    RuleDefinition(
+        name="docker-images",
+        check=docker_image_rules.check,
+        fields=["docker_files"],
+    ),
+    RuleDefinition(
+        name="readme",
+        check=readme_rules.check,
+        fields=["readme_file"],
+        resources=[RuleResource.FILESYSTEM],
+    ),
+    RuleDefinition(
+        name="requirements",
+        check=requirement_rules.check,
+        fields=["target_branch.requirements_to_update"],
+    ),
+    RuleDefinition(
+        name="unvetted-requirements",
+        check=unvetted_requirements_rules.check,
+        fields=["target_branch.requirements"],
+        resources=[RuleResource.CONFIG],
+    ),
+]
+
+
+def get_rule(name: str) -> RuleDefinition:
+    """Returns the registered rule with the given name.
+
+    Args:
+        name: Name of the rule, e.g. 'gitlab-ci'.
+
+    Raises:
+        KeyError: If no rule is registered with that name.
+    """
+    for rule in RULES:
+        if rule.name == name:
+            return rule
+    raise KeyError(f"Unknown rule '{name}'. Available rules: {', '.join(rule.name for rule in RULES)}")
+
+
+def select_rules(only: list[str] | None = None, skip: list[str] | None = None) -> list[RuleDefinition]:
+    """Selects the registered rules to run.
+
+    Args:
+        only: Names of the rules to run. If empty or None, all rules are selected.
+        skip: Names of the rules to leave out.
+
+    Returns:
+        The selected rules in registry order.
+
+    Raises:
+        KeyError: If a rule name is not registered.
+    """
+    only_names = {get_rule(name).name for name in only or []}
+    skip_names = {get_rule(name).name for name in skip or []}
+    return [rule for rule in RULES if (not only_names or rule.name in only_names) and rule.name not in skip_names]
@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from code_review.enums import ReviewRuleLevel, RuleResource
+from code_review.review.schemas import CodeReviewSchema, RuleDefinition
+from code_review.schemas import RulesResult
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of rules that may use a resource at the same time. Resources not listed are unlimited.
+RESOURCE_LIMITS: dict[RuleResource, int] = {
+    RuleResource.GIT: 1,
+    RuleResource.NETWORK: 2,
+}
+
+
+def _run_rule(
+    rule: RuleDefinition,
+    code_review_schema: CodeReviewSchema,
+    semaphores: dict[RuleResource, threading.Semaphore],
+) -> tuple[list[RulesResult], float]:
+    """Runs a single rule holding the semaphores of the resources it declares.
+
+    Returns:
+        The results of the rule and the time in seconds it took to run.
+    """
+    # Semaphores are always acquired in the same order so two rules can not deadlock each other.
+    rule_semaphores = [semaphores[resource] for resource in sorted(set(rule.resources)) if resource in semaphores]
+    for semaphore in rule_semaphores:
+        semaphore.acquire()
+    start_time = time.perf_counter()
+    try:
+        results = rule.check(code_review_schema) or []
+    except Exception as e:  # noqa: BLE001
+        logger.error("Rule %s failed: %s", rule.name, e)
+        results = [
+            RulesResult(
+                name=rule.name,
+                passed=False,
+                level=ReviewRuleLevel.CRITICAL.value,
+                message=f"Unexpected error: {e}",
+            )
+        ]
+    finally:
+        for semaphore in reversed(rule_semaphores):
+            semaphore.release()
+    return results, time.perf_counter() - start_time
+
+
+def run_rules(
+    code_review_schema: CodeReviewSchema,
+    rules: list[RuleDefinition],
+    max_workers: int | None = None,
+    on_rule_done: Callable[[RuleDefinition], None] | None = None,
+) -> list[RulesResult]:
+    """Runs the rules concurrently and merges their results in the order of the rules list.
+
+    Rules only read the code review schema, so they run in a thread pool. Rules that declare a resource with a
+    limit in RESOURCE_LIMITS wait for each other. The time each rule took is stored in
+    ``code_review_schema.rule_timings``.
+
+    Args:
+        code_review_schema: The CodeReviewSchema object to validate.
+        rules: Rules to run.
+        max_workers: Maximum number of threads. Defaults to one per rule.
+        on_rule_done: Optional callback called with each rule as soon as it finishes.
+
+    Returns:
+        List of RulesResult objects in the order of the rules list.
+    """
+    if not rules:
+        return []
+    semaphores = {resource: threading.Semaphore(limit) for resource, limit in RESOURCE_LIMITS.items()}
+    results_by_rule: dict[str, list[RulesResult]] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(rules)) as executor:
+        futures = {executor.submit(_run_rule, rule, code_review_schema, semaphores): rule for rule in rules}
+        for future in as_completed(futures):
+            rule = futures[future]
+            results, elapsed = future.result()
+            results_by_rule[rule.name] = results
+            code_review_schema.rule_timings[rule.name] = elapsed
+            logger.debug("Rule %s finished in %.3f seconds", rule.name, elapsed)
+            if on_rule_done:
+                on_rule_done(rule)
+
+    return [result for rule in rules for result in results_by_rule[rule.name]]
@@ -1,9 +1,12 @@
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
+from code_review.enums import RuleResource
 from code_review.plugins.docker.schemas import DockerfileSchema
+from code_review.plugins.git.schemas import MergeConflictSchema
 from code_review.schemas import BranchSchema, RulesResult
 
 
@@ -27,12 +30,57 @@ class CodeReviewSchema(BaseModel):
     source_branch_name: str | None = Field(
         default=None, description="Name of the source branch from which the target branch was created."
     )
+    merge_conflicts: MergeConflictSchema | None = Field(
+        default=None, description="Predicted result of merging the target branch into its source branch"
+    )
+    query_findings: list[RulesResult] | None = Field(
+        default=None, description="N+1 query patterns found on the lines changed on the target branch"
+    )
     docker_files: list[DockerfileSchema] | None = Field(
         default_factory=list, description="List of Dockerfiles found in the project"
     )
     rules_validated: list[RulesResult] | None = Field(
         default_factory=list, description="List of rule validation results"
     )
+    linted_files: list[str] | None = Field(
+        default=None,
+        description="Python files changed on the target branch that ruff checked. None if it checked the whole project",
+    )
+    data_providers: list[str] = Field(
+        default_factory=list, description="Names of the data providers that were run to build the review"
+    )
+    rule_timings: dict[str, float] = Field(
+        default_factory=dict, description="Time in seconds each rule took to run, keyed by rule name"
+    )
+
+
+class RuleDefinition(BaseModel):
+    """Schema for a review rule and the data it depends on."""
+
+    name: str = Field(description="Unique name of the rule, e.g. 'gitlab-ci'")
+    check: Callable[[CodeReviewSchema], list[RulesResult]] = Field(
+        description="Function that validates the rule against a code review"
+    )
+    fields: list[str] = Field(
+        default_factory=list,
+        description="Dotted CodeReviewSchema fields the rule reads, e.g. 'target_branch.linting_errors'",
+    )
+    resources: list[RuleResource] = Field(
+        default_factory=list, description="External resources the rule uses while it runs"
+    )
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, fields: list[str]) -> list[str]:
+        """Validates that every declared field exists in the CodeReviewSchema."""
+        for field in fields:
+            model = CodeReviewSchema
+            for part in field.split("."):
+                if model is None or part not in model.model_fields:
+                    raise ValueError(f"Unknown CodeReviewSchema field: {field}")
+                annotation = model.model_fields[part].annotation
+                model = annotation if isinstance(annotation, type) and issubclass(annotation, BaseModel) else None
+        return fields
 
 
 class CodeProject(BaseModel):
@@ -5,6 +5,7 @@ from pathlib import Path
 from pydantic import BaseModel, Field
 
 from code_review.plugins.dependencies.pip.schemas import PackageRequirement, RequirementInfo
+from code_review.plugins.linting.ruff.schemas import RuffViolation
 
 logger = logging.getLogger(__name__)
 
@@ -97,8 +98,17 @@ class BranchSchema(BaseModel):
     email: str = Field(description="Email of the branch author")
     hash: str = Field(description="Commit hash of the branch")
     date: datetime | None = Field(default=None, description="Date of the last commit on the branch")
+    ref: str | None = Field(default=None, description="Ref the branch was read from, e.g. 'origin/feature/x'")
+    ahead: int | None = Field(default=None, description="Number of commits the branch is ahead of the base branch")
+    behind: int | None = Field(default=None, description="Number of commits the branch is behind the base branch")
+    rebased: bool | None = Field(
+        default=None, description="Whether the branch contains the tip of its git flow source branch"
+    )
 
     linting_errors: int = Field(default=-1, description="Number of linting errors found by ruff. -1 means not checked")
+    linting_violations: list[RuffViolation] | None = Field(
+        default=None, description="Violations found by ruff. None means not checked"
+    )
     min_coverage: float | None = Field(default=None, description="Minimum coverage based on the Makefile")
     version: SemanticVersion | None = Field(default=None, description="Semantic version from the version file")
     changelog_versions: list[SemanticVersion] = Field(
@@ -110,6 +120,9 @@ class BranchSchema(BaseModel):
     formatting_errors: int = Field(
         default=-1, description="Number of formatting errors found by black. -1 means not checked"
     )
+    unformatted_files: list[str] | None = Field(
+        default=None, description="Files `ruff format` would reformat. None means not checked"
+    )
     requirements: list[PackageRequirement] = Field(
         default_factory=list, description="List of parsed package requirements"
     )
@@ -133,3 +146,16 @@ class RulesResult(BaseModel):
     level: str = Field(description="Level of the rule", default="info")
     message: str
     details: str | None = None
+    file: str | None = Field(default=None, description="Path of the file the result is about, relative to the project")
+    line: int | None = Field(default=None, description="Line of the file the result is about")
+    related_lines: list[int] = Field(
+        default_factory=list,
+        description="Other lines of the file the result depends on, e.g. the loop a query runs in",
+    )
+
+    @property
+    def location(self) -> str | None:
+        """Returns the file and line of the result, e.g. 'app/views.py:12', or None if it is not about a file."""
+        if self.file is None:
+            return None
+        return f"{self.file}:{self.line}" if self.line is not None else self.file
@@ -13,6 +13,7 @@ if not CODE_REVIEW_FOLDER.exists():
 
 BASE_FOLDER = Path(__file__).parent.parent
 OUTPUT_FOLDER = BASE_FOLDER / "output"
+CACHE_FOLDER = OUTPUT_FOLDER / ".cache"
 
 # Define log directory
 LOG_DIR = OUTPUT_FOLDER / "logs"
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from tests.utils import load_environment_variables
+from tests.utils import commit_file, load_environment_variables, run_git
 
 
 @pytest.fixture
@@ -21,3 +21,28 @@ def requirements_folder() -> Path:
 def load_environment_vars():
     """Load environment variables for testing."""
     load_environment_variables("local.txt")
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch) -> Path:
+    """Create a git repository with an initial commit on master and change into it."""
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "Jane Doe")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "jane@example.com")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "Jane Doe")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "jane@example.com")
+    folder = tmp_path / "project"
+    folder.mkdir()
+    run_git(folder, "init", "-q", "-b", "master")
+    commit_file(folder, "README.md", "# Project\n", "Initial commit")
+    monkeypatch.chdir(folder)
+    return folder
+
+
+@pytest.fixture
+def cloned_repo(git_repo, tmp_path, monkeypatch) -> Path:
+    """Clone of the git_repo fixture, which acts as its 'origin' remote, with a develop branch. Changes into it."""
+    run_git(git_repo, "branch", "develop")
+    clone = tmp_path / "clone"
+    run_git(tmp_path, "clone", "-q", str(git_repo), str(clone))
+    monkeypatch.chdir(clone)
+    return clone
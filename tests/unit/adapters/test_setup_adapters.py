@@ -87,3 +87,8 @@ class TestSetupToDict:
         bumpversion_file = fixtures_folder / "bumpversion.cfg"
         result = setup_to_dict(bumpversion_file)
         assert result["bumpversion"]["current_version"] == "3.1.4"
+
+    def test_content_without_file(self, tmp_path):
+        """Tests that content read from git is parsed without reading the file."""
+        result = setup_to_dict(tmp_path / "setup.cfg", content="[bumpversion]\ncurrent_version = 1.2.3\n")
+        assert result["bumpversion"]["current_version"] == "1.2.3"
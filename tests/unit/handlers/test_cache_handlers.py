@@ -0,0 +1,81 @@
+import os
+from unittest.mock import patch
+
+from code_review.handlers.cache_handlers import DiskCache, hash_key
+
+
+class TestHashKey:
+    def test_same_parts_same_key(self):
+        assert hash_key({"b": 1, "a": 2}, "x") == hash_key({"a": 2, "b": 1}, "x")
+
+    def test_different_parts_different_key(self):
+        assert hash_key("a", "b") != hash_key("b", "a")
+
+
+class TestDiskCache:
+    def test_get_missing(self, tmp_path):
+        cache = DiskCache(tmp_path / "cache")
+        assert cache.get("missing") is None
+
+    def test_set_and_get(self, tmp_path):
+        cache = DiskCache(tmp_path / "cache")
+        cache.set("key", {"value": [1, 2, 3]})
+        assert cache.get("key") == {"value": [1, 2, 3]}
+
+    def test_unreadable_entry_is_discarded(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        (tmp_path / "broken.json").write_text("{not json")
+        assert cache.get("broken") is None
+        assert not (tmp_path / "broken.json").exists()
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        cache = DiskCache(tmp_path, max_entries=2)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        os.utime(tmp_path / "first.json", (1, 1))
+        os.utime(tmp_path / "second.json", (2, 2))
+        cache.get("first")
+
+        cache.set("third", 3)
+
+        assert cache.get("first") == 1
+        assert cache.get("second") is None
+        assert cache.get("third") == 3
+
+    def test_size_limit(self, tmp_path):
+        cache = DiskCache(tmp_path, max_size=150)
+        cache.set("first", "a" * 100)
+        os.utime(tmp_path / "first.json", (1, 1))
+        cache.set("second", "b" * 100)
+
+        assert cache.get("first") is None
+        assert cache.get("second") == "b" * 100
+
+    def test_set_many_evicts_once(self, tmp_path):
+        cache = DiskCache(tmp_path, max_entries=2)
+        with patch.object(cache, "evict", wraps=cache.evict) as mock_evict:
+            cache.set_many({"first": 1, "second": 2, "third": 3})
+
+        assert mock_evict.call_count == 1
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_eviction_waits_for_enough_writes(self, tmp_path):
+        cache = DiskCache(tmp_path, max_entries=2, evict_every=3)
+        with patch.object(cache, "evict", wraps=cache.evict) as mock_evict:
+            cache.set("first", 1)
+            cache.set("second", 2)
+            cache.set("third", 3)
+            assert mock_evict.call_count == 1
+            cache.set("fourth", 4)
+
+        assert mock_evict.call_count == 1
+        assert len(list(tmp_path.glob("*.json"))) == 3
+
+    def test_eviction_runs_once_enough_bytes_are_written(self, tmp_path):
+        cache = DiskCache(tmp_path, max_size=1000, evict_every=100)
+        with patch.object(cache, "evict", wraps=cache.evict) as mock_evict:
+            cache.set("small", "a")
+            assert mock_evict.call_count == 0
+            cache.set("large", "b" * 100)
+
+        assert mock_evict.call_count == 1
@@ -0,0 +1,71 @@
+import subprocess
+from unittest.mock import patch
+
+from code_review.plugins.git.blob_reader import CatFileReader
+from code_review.plugins.git.handlers import list_folder
+from tests.utils import commit_file, run_git
+
+
+class TestCatFileReader:
+    def test_read_files_from_several_revisions(self, git_repo):
+        commit_file(git_repo, "CHANGELOG.md", "## [1.0.0] - 2025-01-01\n")
+        run_git(git_repo, "checkout", "-q", "-b", "develop")
+        commit_file(git_repo, "CHANGELOG.md", "## [1.1.0] - 2025-02-01\n")
+        run_git(git_repo, "checkout", "-q", "master")
+
+        with (
+            patch("code_review.plugins.git.blob_reader.subprocess.Popen", wraps=subprocess.Popen) as popen,
+            CatFileReader(use_object_store=False) as reader,
+        ):
+            contents = reader.read_blobs(
+                [("master", "CHANGELOG.md"), ("develop", "CHANGELOG.md"), ("master", "missing.txt")]
+            )
+            assert reader.read_text("master", "README.md") == "# Project\n"
+
+        assert contents == [b"## [1.0.0] - 2025-01-01\n", b"## [1.1.0] - 2025-02-01\n", None]
+        assert popen.call_count == 1
+
+    def test_object_store_avoids_git_process(self, git_repo):
+        commit_file(git_repo, "CHANGELOG.md", "## [1.0.0] - 2025-01-01\n")
+        run_git(git_repo, "gc", "-q")
+
+        with (
+            patch("code_review.plugins.git.blob_reader.subprocess.Popen", wraps=subprocess.Popen) as popen,
+            CatFileReader() as reader,
+        ):
+            contents = reader.read_blobs([("master", "CHANGELOG.md"), ("master", "missing.txt")])
+            assert reader.read_text("HEAD~1", "README.md") == "# Project\n"
+
+        assert contents == [b"## [1.0.0] - 2025-01-01\n", None]
+        assert popen.call_count == 1
+
+    def test_trees_are_not_blobs(self, git_repo):
+        (git_repo / "requirements").mkdir()
+        commit_file(git_repo, "requirements/base.txt", "django==5.0\n")
+        with CatFileReader() as reader:
+            assert reader.read_blob("master", "requirements") is None
+            assert reader.read_blob("master", "requirements/base.txt") == b"django==5.0\n"
+
+    def test_cache_is_bounded(self, git_repo):
+        commit_file(git_repo, "a.txt", "a" * 10)
+        commit_file(git_repo, "b.txt", "b" * 10)
+        with CatFileReader(max_cache_size=15) as reader:
+            reader.read_blobs([("master", "a.txt"), ("master", "b.txt")])
+            assert reader._cache_size <= 15
+            assert reader.read_blob("master", "a.txt") == b"a" * 10
+
+    def test_large_batches_do_not_block(self, git_repo):
+        commit_file(git_repo, "big.txt", "x" * 200_000)
+        with CatFileReader(max_cache_size=0) as reader:
+            contents = reader.read_blobs([("master", "big.txt")] + [("master", f"big.txt{i}") for i in range(50)])
+        assert len(contents[0]) == 200_000
+
+
+class TestListFolder:
+    def test_only_direct_files(self, git_repo):
+        (git_repo / "requirements" / "old").mkdir(parents=True)
+        commit_file(git_repo, "requirements/base.txt", "django==5.0\n")
+        commit_file(git_repo, "requirements/old/local.txt", "pytest\n")
+
+        assert list(list_folder("master", "requirements")) == ["requirements/base.txt"]
+        assert list_folder("master", "missing") == {}
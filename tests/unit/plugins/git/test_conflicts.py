@@ -0,0 +1,72 @@
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from code_review.handlers.cache_handlers import DiskCache
+from code_review.plugins.git import conflicts
+from code_review.plugins.git.conflicts import _parse_merge_tree_output, predict_branch_conflicts, predict_conflicts
+from code_review.plugins.git.handlers import list_branches
+from tests.utils import commit_file, run_git
+
+
+@pytest.fixture
+def flow_repo(git_repo, tmp_path, monkeypatch):
+    """Repository with a develop branch and a clean and a conflicting feature branch."""
+    monkeypatch.setattr(conflicts, "CONFLICT_CACHE", DiskCache(tmp_path / "conflicts"))
+    commit_file(git_repo, "settings.py", "DEBUG = False\n")
+    run_git(git_repo, "checkout", "-q", "-b", "develop")
+    run_git(git_repo, "checkout", "-q", "-b", "feature/clean")
+    commit_file(git_repo, "clean.py", "clean = True\n")
+    run_git(git_repo, "checkout", "-q", "-b", "feature/conflict", "develop")
+    commit_file(git_repo, "settings.py", "DEBUG = True\n")
+    run_git(git_repo, "checkout", "-q", "develop")
+    commit_file(git_repo, "settings.py", "DEBUG = None\n")
+    run_git(git_repo, "checkout", "-q", "master")
+    return git_repo
+
+
+class TestParseMergeTreeOutput:
+    def test_clean_and_conflicted_merges(self):
+        output = "1\0aaaa\0\0" + "0\0bbbb\0settings.py\0urls.py\0\0"
+        assert _parse_merge_tree_output(output) == [(False, []), (True, ["settings.py", "urls.py"])]
+
+
+class TestPredictConflicts:
+    def test_predicts_without_touching_the_working_tree(self, flow_repo):
+        predictions = predict_conflicts([("feature/clean", "develop"), ("feature/conflict", "develop")])
+
+        assert [prediction.has_conflicts for prediction in predictions] == [False, True]
+        assert predictions[1].conflicted_files == ["settings.py"]
+        assert predictions[1].base_hash == run_git(flow_repo, "rev-parse", "develop")
+        assert run_git(flow_repo, "status", "--porcelain") == ""
+        assert (flow_repo / "settings.py").read_text() == "DEBUG = False\n"
+
+    def test_cached_predictions_do_not_merge_again(self, flow_repo):
+        predict_conflicts([("feature/conflict", "develop")])
+        with patch("code_review.plugins.git.runner.subprocess.run", wraps=subprocess.run) as mock_run:
+            prediction = predict_conflicts([("feature/conflict", "develop")])[0]
+
+        assert prediction.conflicted_files == ["settings.py"]
+        assert all("merge-tree" not in call.args[0] for call in mock_run.call_args_list)
+
+    def test_failed_merges_do_not_stop_the_others(self, flow_repo):
+        run_git(flow_repo, "checkout", "-q", "--orphan", "unrelated")
+        commit_file(flow_repo, "other.txt", "other\n")
+        run_git(flow_repo, "checkout", "-q", "-f", "master")
+
+        predictions = predict_conflicts(
+            [("unrelated", "develop"), ("feature/conflict", "develop"), ("missing", "develop")], max_workers=1
+        )
+
+        assert predictions[0].error is not None
+        assert predictions[1].has_conflicts is True
+        assert predictions[2].error == "Could not find 'missing'"
+
+
+def test_predict_branch_conflicts_uses_git_flow_source(flow_repo):
+    predictions = predict_branch_conflicts(list_branches("refs/heads/"))
+    assert {(prediction.branch, prediction.base, prediction.has_conflicts) for prediction in predictions} == {
+        ("feature/clean", "develop", False),
+        ("feature/conflict", "develop", True),
+    }
@@ -0,0 +1,51 @@
+import pytest
+
+from code_review.exceptions import SimpleGitToolError
+from code_review.plugins.git.fetch import FETCH_STATE_FILE, FetchCoordinator
+from tests.utils import commit_file, run_git
+
+
+class TestFetchCoordinator:
+    def test_fetch_is_skipped_while_fresh(self, git_repo, cloned_repo):
+        coordinator = FetchCoordinator(ttl=60)
+        assert coordinator.fetch("origin") is True
+        assert coordinator.fetch("origin") is False
+        assert FetchCoordinator(ttl=60).fetch("origin") is False
+        assert (cloned_repo / ".git" / FETCH_STATE_FILE).exists()
+
+        new_commit = commit_file(git_repo, "new.txt", "new\n")
+        assert coordinator.fetch("origin", force=True) is True
+        assert run_git(cloned_repo, "rev-parse", "origin/master") == new_commit
+        assert (coordinator.fetched, coordinator.skipped) == (2, 1)
+
+    def test_expired_fetch_runs_again(self, cloned_repo):
+        coordinator = FetchCoordinator(ttl=0)
+        assert coordinator.fetch("origin") is True
+        assert coordinator.fetch("origin") is True
+
+    def test_fetch_selected_branches(self, git_repo, cloned_repo):
+        run_git(git_repo, "branch", "feature/x")
+        coordinator = FetchCoordinator(ttl=60)
+
+        assert coordinator.fetch("origin", branches=["master", "feature/x"]) is True
+        assert run_git(cloned_repo, "rev-parse", "origin/feature/x") == run_git(git_repo, "rev-parse", "feature/x")
+        assert coordinator.is_fresh("origin", ["feature/x"])
+        assert not coordinator.is_fresh("origin", ["develop"])
+        assert not coordinator.is_fresh("origin")
+        # A full fetch covers every branch.
+        assert coordinator.fetch("origin") is True
+        assert coordinator.fetch("origin", branches=["develop"]) is False
+
+    def test_missing_branch_falls_back_to_full_fetch(self, cloned_repo):
+        coordinator = FetchCoordinator(ttl=60)
+        assert coordinator.fetch("origin", branches=["missing"]) is True
+        assert coordinator.is_fresh("origin")
+
+    def test_prunes_deleted_branches(self, git_repo, cloned_repo):
+        run_git(git_repo, "branch", "-D", "develop")
+        FetchCoordinator(ttl=60).fetch("origin")
+        assert "origin/develop" not in run_git(cloned_repo, "branch", "-r")
+
+    def test_unknown_remote(self, cloned_repo):
+        with pytest.raises(SimpleGitToolError):
+            FetchCoordinator(ttl=60).fetch("upstream")
@@ -1,10 +1,28 @@
+import subprocess
 from datetime import datetime
 from unittest.mock import patch
 
 import pytest
 
-from code_review.plugins.git.handlers import compare_branches_deprecated, display_branches
+from code_review.enums import BranchSyncStatus
+from code_review.plugins.git.handlers import (
+    LazyWorktree,
+    compare_branches_deprecated,
+    delete_remote_branches,
+    display_branches,
+    get_changed_files,
+    get_changed_lines,
+    get_object_hashes,
+    get_sync_status,
+    get_tree_hash,
+    list_branches,
+    list_files_by_name,
+    resolve_branch_ref,
+    sync_branches,
+    temporary_worktree,
+)
 from code_review.schemas import BranchSchema
+from tests.utils import commit_file, run_git
 
 
 class TestCompareBranches:
@@ -74,3 +92,218 @@ class TestDisplayBranches:
             for i, branch in enumerate(branches[:page_size] if page_size else branches, 1):
                 expected_output = f" {i} [yellow]{branch.name}[/yellow] {branch.date}(by [blue]{branch.author}[/blue])"
                 mock_console.print.assert_any_call(expected_output)
+
+
+class TestTemporaryWorktree:
+    def test_worktree_has_branch_content_and_keeps_checkout(self, git_repo):
+        run_git(git_repo, "checkout", "-q", "-b", "feature/new")
+        commit_file(git_repo, "feature.txt", "feature\n")
+        run_git(git_repo, "checkout", "-q", "master")
+        (git_repo / "README.md").write_text("uncommitted change\n")
+
+        with temporary_worktree("feature/new", git_repo.name) as worktree:
+            assert worktree.name == git_repo.name
+            assert (worktree / "feature.txt").read_text() == "feature\n"
+            assert (worktree / "README.md").read_text() == "# Project\n"
+
+        assert not worktree.exists()
+        assert run_git(git_repo, "rev-parse", "--abbrev-ref", "HEAD") == "master"
+        assert (git_repo / "README.md").read_text() == "uncommitted change\n"
+        assert not (git_repo / "feature.txt").exists()
+        assert len(run_git(git_repo, "worktree", "list").splitlines()) == 1
+
+
+class TestResolveBranchRef:
+    def test_local_branch_without_remote(self, git_repo):
+        assert resolve_branch_ref("master") == "master"
+
+    def test_prefers_remote_tracking_ref(self, git_repo):
+        run_git(git_repo, "update-ref", "refs/remotes/origin/master", "HEAD")
+        assert resolve_branch_ref("master") == "origin/master"
+        assert resolve_branch_ref("origin/develop") == "origin/develop"
+
+
+class TestLazyWorktree:
+    def test_not_created_until_used(self, git_repo):
+        with LazyWorktree("master", git_repo.name) as worktree:
+            assert not worktree.created
+        assert len(run_git(git_repo, "worktree", "list").splitlines()) == 1
+
+    def test_created_on_first_use(self, git_repo):
+        with LazyWorktree("master", git_repo.name) as worktree:
+            folder = worktree.folder
+            assert worktree.created
+            assert worktree.folder == folder
+            assert (folder / "README.md").read_text() == "# Project\n"
+        assert not folder.exists()
+        assert len(run_git(git_repo, "worktree", "list").splitlines()) == 1
+
+
+class TestObjectHashes:
+    def test_hashes_change_only_for_modified_paths(self, git_repo):
+        commit_file(git_repo, "CHANGELOG.md", "# Changelog\n")
+        hashes = get_object_hashes("master", ["", "CHANGELOG.md", "README.md", "Makefile"])
+
+        assert hashes[""] == get_tree_hash("master")
+        assert hashes["Makefile"] is None
+
+        commit_file(git_repo, "CHANGELOG.md", "# Changelog\n## 1.0.0\n")
+        new_hashes = get_object_hashes("master", ["", "CHANGELOG.md", "README.md"])
+
+        assert new_hashes["README.md"] == hashes["README.md"]
+        assert new_hashes["CHANGELOG.md"] != hashes["CHANGELOG.md"]
+        assert new_hashes[""] != hashes[""]
+
+    def test_list_files_by_name(self, git_repo):
+        (git_repo / "compose").mkdir()
+        commit_file(git_repo, "compose/Dockerfile", "FROM python:3.12\n")
+        commit_file(git_repo, "Dockerfile.bak", "FROM python:3.11\n")
+
+        files = list_files_by_name("master", "Dockerfile")
+
+        assert list(files) == ["compose/Dockerfile"]
+        assert files["compose/Dockerfile"] == get_object_hashes("master", ["compose/Dockerfile"])["compose/Dockerfile"]
+
+
+class TestListBranches:
+    def test_lists_remote_branches_in_one_call(self, git_repo):
+        run_git(git_repo, "update-ref", "refs/remotes/origin/master", "HEAD")
+        run_git(git_repo, "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/master")
+        run_git(git_repo, "checkout", "-q", "-b", "feature/ABC-1")
+        author = "Bob Smith <bob@example.com>"
+        # Authored long before it was committed, like a rebased or cherry-picked commit.
+        run_git(git_repo, "commit", "-q", "--allow-empty", "-m", "Feature", "--author", author, "--date", "2020-01-01")
+        run_git(git_repo, "update-ref", "refs/remotes/origin/feature/ABC-1", "HEAD")
+
+        with (
+            patch("code_review.plugins.git.handlers.subprocess.run", wraps=subprocess.run) as mock_run,
+            patch("code_review.plugins.git.handlers.REACHABILITY_INDEX.get_merged", side_effect=AssertionError),
+        ):
+            branches = list_branches(no_merged="origin/master")
+
+        assert mock_run.call_count == 1
+        assert "--no-merged=origin/master" in mock_run.call_args.args[0]
+        assert [branch.name for branch in branches] == ["feature/ABC-1"]
+        assert branches[0].author == "Bob Smith"
+        assert branches[0].hash == run_git(git_repo, "rev-parse", "--short", "HEAD")
+        assert branches[0].date.timestamp() == int(run_git(git_repo, "log", "-1", "--format=%ct"))
+        assert [branch.name for branch in list_branches()] == ["feature/ABC-1", "master"]
+
+    def test_ahead_behind_and_rebase_status(self, git_repo):
+        run_git(git_repo, "checkout", "-q", "-b", "develop")
+        commit_file(git_repo, "develop.txt", "develop\n")
+        run_git(git_repo, "checkout", "-q", "-b", "feature/rebased")
+        commit_file(git_repo, "a.txt", "a\n")
+        run_git(git_repo, "checkout", "-q", "-b", "feature/stale", "master")
+        commit_file(git_repo, "b.txt", "b\n")
+        commit_file(git_repo, "c.txt", "c\n")
+        run_git(git_repo, "checkout", "-q", "master")
+        for name in ["master", "develop", "feature/rebased", "feature/stale"]:
+            run_git(git_repo, "update-ref", f"refs/remotes/origin/{name}", name)
+
+        branches = {branch.name: branch for branch in list_branches(no_merged="origin/master", base="origin/master")}
+
+        assert (branches["feature/rebased"].ahead, branches["feature/rebased"].behind) == (2, 0)
+        assert (branches["feature/stale"].ahead, branches["feature/stale"].behind) == (2, 0)
+        assert branches["feature/rebased"].rebased is True
+        assert branches["feature/stale"].rebased is False
+        assert branches["develop"].rebased is None
+
+    def test_author_filter(self, git_repo):
+        run_git(git_repo, "update-ref", "refs/remotes/origin/master", "HEAD")
+        assert list_branches(author_pattern="nobody") == []
+        assert len(list_branches(author_pattern=list_branches()[0].author.upper())) == 1
+
+
+class TestSyncBranches:
+    def test_fast_forwards_without_checkout(self, git_repo, cloned_repo):
+        run_git(git_repo, "checkout", "-q", "develop")
+        develop_commit = commit_file(git_repo, "develop.txt", "develop\n")
+        run_git(git_repo, "checkout", "-q", "master")
+        master_commit = commit_file(git_repo, "master.txt", "master\n")
+
+        statuses = sync_branches(["master", "develop"], force_fetch=True)
+
+        assert statuses == {"master": BranchSyncStatus.UPDATED, "develop": BranchSyncStatus.CREATED}
+        assert run_git(cloned_repo, "rev-parse", "master") == master_commit
+        assert run_git(cloned_repo, "rev-parse", "develop") == develop_commit
+        assert (cloned_repo / "master.txt").exists()
+        assert not (cloned_repo / "develop.txt").exists()
+        assert sync_branches(["master", "develop"]) == {
+            "master": BranchSyncStatus.UP_TO_DATE,
+            "develop": BranchSyncStatus.UP_TO_DATE,
+        }
+
+    def test_reports_local_commits_and_missing_branches(self, git_repo, cloned_repo):
+        run_git(cloned_repo, "branch", "develop", "origin/develop")
+        run_git(cloned_repo, "checkout", "-q", "develop")
+        local_commit = commit_file(cloned_repo, "local.txt", "local\n")
+        run_git(cloned_repo, "checkout", "-q", "master")
+        commit_file(cloned_repo, "ahead.txt", "ahead\n")
+        run_git(git_repo, "checkout", "-q", "develop")
+        commit_file(git_repo, "remote.txt", "remote\n")
+
+        statuses = sync_branches(["master", "develop", "release"], force_fetch=True)
+
+        assert statuses == {
+            "master": BranchSyncStatus.AHEAD,
+            "develop": BranchSyncStatus.DIVERGED,
+            "release": BranchSyncStatus.MISSING,
+        }
+        assert run_git(cloned_repo, "rev-parse", "develop") == local_commit
+
+
+class TestGetSyncStatus:
+    def test_compares_trees(self, git_repo):
+        run_git(git_repo, "branch", "develop")
+        tree_hash = get_tree_hash("master")
+
+        assert get_sync_status("master", "develop") == (True, tree_hash, tree_hash)
+
+        run_git(git_repo, "checkout", "-q", "develop")
+        commit_file(git_repo, "develop.txt", "develop\n")
+
+        assert get_sync_status("master", "develop") == (False, tree_hash, get_tree_hash("develop"))
+
+
+class TestDeleteRemoteBranches:
+    def test_deletes_in_chunks_and_reports_missing_branches(self, git_repo, cloned_repo):
+        for name in ["feature/a", "feature/b", "feature/c"]:
+            run_git(git_repo, "branch", name)
+        run_git(cloned_repo, "fetch", "-q", "origin")
+
+        with patch("code_review.plugins.git.handlers.subprocess.run", wraps=subprocess.run) as mock_run:
+            results = delete_remote_branches(["feature/a", "missing", "feature/b", "feature/c"], chunk_size=3)
+
+        assert results == {
+            "feature/a": None,
+            "missing": "remote ref does not exist",
+            "feature/b": None,
+            "feature/c": None,
+        }
+        # The first chunk is pushed again without the missing branch.
+        assert mock_run.call_count == 3
+        assert run_git(git_repo, "branch", "--list", "feature/*") == ""
+        assert "feature" not in run_git(cloned_repo, "branch", "-r")
+
+
+class TestGetChangedFiles:
+    def test_lists_python_files_changed_since_the_fork(self, git_repo):
+        run_git(git_repo, "checkout", "-q", "-b", "feature/x")
+        commit_file(git_repo, "app/views.py", "views = 1\n")
+        commit_file(git_repo, "notes.md", "notes\n")
+        run_git(git_repo, "checkout", "-q", "master")
+        commit_file(git_repo, "app/models.py", "models = 1\n")
+
+        assert get_changed_files("feature/x", "master") == ["app/views.py"]
+
+    def test_lists_changed_lines(self, git_repo):
+        commit_file(git_repo, "app/views.py", "a = 1\nb = 2\nc = 3\nd = 4\n")
+        commit_file(git_repo, "app/old.py", "old = 1\n")
+        run_git(git_repo, "checkout", "-q", "-b", "feature/x")
+        commit_file(git_repo, "app/views.py", "a = 1\nb = 20\nnew = 0\nd = 4\ne = 5\n")
+        commit_file(git_repo, "app/café.py", "x = 1\n")
+        run_git(git_repo, "rm", "-q", "app/old.py")
+        run_git(git_repo, "commit", "-q", "-m", "Remove old")
+
+        assert get_changed_lines("feature/x", "master") == {"app/café.py": {1}, "app/views.py": {2, 3, 5}}
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+import pytest
+
+from code_review.plugins.git.history import count_ahead_behind
+from code_review.plugins.git.runner import GIT_RUNNER
+from tests.utils import commit_file, run_git
+
+
+class TestCountAheadBehind:
+    @pytest.fixture
+    def diverged_repo(self, git_repo):
+        for i in range(3):
+            commit_file(git_repo, f"master{i}.txt", f"{i}\n")
+        run_git(git_repo, "checkout", "-q", "-b", "feature", "HEAD~2")
+        commit_file(git_repo, "feature.txt", "feature\n")
+        run_git(git_repo, "merge", "-q", "--no-edit", "master~1")
+        commit_file(git_repo, "feature2.txt", "feature\n")
+        run_git(git_repo, "checkout", "-q", "master")
+        return git_repo
+
+    def _expected(self, folder, base, ref):
+        behind, ahead = run_git(folder, "rev-list", "--left-right", "--count", f"{base}...{ref}").split()
+        return int(ahead), int(behind)
+
+    def test_matches_rev_list(self, diverged_repo):
+        tips = {ref: run_git(diverged_repo, "rev-parse", ref) for ref in ["feature", "master~1", "master"]}
+
+        with patch("code_review.plugins.git.history.GIT_RUNNER.run", side_effect=AssertionError):
+            status = count_ahead_behind(tips, {"master": tips["master"]})
+
+        assert status["master"] == {ref: self._expected(diverged_repo, "master", ref) for ref in tips}
+
+    def test_without_object_store(self, diverged_repo):
+        tips = {ref: run_git(diverged_repo, "rev-parse", ref) for ref in ["feature", "master"]}
+
+        with patch("code_review.plugins.git.history.get_object_store", return_value=None):
+            status = count_ahead_behind(tips, {"master": tips["master"], "feature": tips["feature"]})
+
+        assert status["master"]["feature"] == self._expected(diverged_repo, "master", "feature")
+        assert status["feature"]["master"] == self._expected(diverged_repo, "feature", "master")
+
+    def test_without_object_store_reads_history_from_the_merge_base(self, git_repo):
+        # A side commit merged into master before the merge base, and merged again by the feature branch, is
+        # reached by the feature branch through a commit that is not below the merge base.
+        run_git(git_repo, "checkout", "-q", "-b", "side")
+        side_commit = commit_file(git_repo, "side.txt", "side\n")
+        run_git(git_repo, "checkout", "-q", "master")
+        run_git(git_repo, "merge", "-q", "--no-ff", "--no-edit", "side")
+        for i in range(3):
+            commit_file(git_repo, f"master{i}.txt", f"{i}\n")
+        run_git(git_repo, "checkout", "-q", "-b", "feature", "HEAD~2")
+        merge = run_git(git_repo, "commit-tree", "HEAD^{tree}", "-p", "HEAD", "-p", side_commit, "-m", "Merge side")
+        run_git(git_repo, "reset", "-q", "--hard", merge)
+        commit_file(git_repo, "feature.txt", "feature\n")
+        tips = {ref: run_git(git_repo, "rev-parse", ref) for ref in ["feature", "master"]}
+
+        with (
+            patch("code_review.plugins.git.history.get_object_store", return_value=None),
+            patch("code_review.plugins.git.history.GIT_RUNNER.run", wraps=GIT_RUNNER.run) as mock_run,
+        ):
+            status = count_ahead_behind(tips, {"master": tips["master"]})
+
+        assert status["master"]["feature"] == self._expected(git_repo, "master", "feature")
+        rev_list = next(call.args[0] for call in mock_run.call_args_list if call.args[0][0] == "rev-list")
+        assert "--not" in rev_list
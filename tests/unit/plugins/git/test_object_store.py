@@ -0,0 +1,89 @@
+import pytest
+
+from code_review.plugins.git.object_store import GitObjectStore, apply_delta, find_git_dirs, get_object_store
+from tests.utils import commit_file, run_git
+
+
+@pytest.fixture
+def packed_repo(git_repo):
+    """Repository with packed objects and refs, a branch and an annotated tag, plus one loose commit."""
+    for version in range(5):
+        commit_file(git_repo, "app.py", "".join(f"line = {i}\n" for i in range(200 + version)))
+    run_git(git_repo, "tag", "-a", "v1", "-m", "Version 1")
+    run_git(git_repo, "checkout", "-q", "-b", "feature")
+    commit_file(git_repo, "feature.py", "feature = True\n")
+    run_git(git_repo, "checkout", "-q", "master")
+    run_git(git_repo, "gc", "-q")
+    commit_file(git_repo, "loose.txt", "loose\n")
+    return git_repo
+
+
+class TestGitObjectStore:
+    def test_resolve_matches_git(self, packed_repo):
+        store = get_object_store()
+        for rev in ["master", "feature", "v1", "v1^{commit}", "feature^{tree}", "HEAD", "refs/heads/feature"]:
+            assert store.resolve(rev) == run_git(packed_repo, "rev-parse", "--verify", rev)
+        assert store.resolve("missing") is None
+        assert store.resolve("master~1") is None
+
+    def test_read_packed_and_loose_objects(self, packed_repo):
+        store = get_object_store()
+        for path in ["app.py", "loose.txt"]:
+            sha = run_git(packed_repo, "rev-parse", f"master:{path}")
+            object_type, content = store.read_object(sha)
+            assert object_type == "blob"
+            assert content.decode() == (packed_repo / path).read_text()
+
+    def test_read_delta_chains(self, git_repo):
+        # Each version changes one line in the middle, so git stores the versions as chains of deltas.
+        lines = [f"line = {i}\n" for i in range(300)]
+        versions = {}
+        for version in range(6):
+            lines[version * 50] = f"changed = {version}\n"
+            lines.append(f"tail = {version}\n")
+            commit_file(git_repo, "app.py", "".join(lines))
+            versions[run_git(git_repo, "rev-parse", "HEAD:app.py")] = "".join(lines).encode()
+        run_git(git_repo, "gc", "-q")
+        # Without a cache every chain is followed down to its whole object.
+        store = GitObjectStore(*find_git_dirs(git_repo), max_cache_size=0)
+        for sha, content in versions.items():
+            assert store.read_object(sha) == ("blob", content)
+
+    def test_lookup_path_and_walk_tree(self, packed_repo):
+        store = get_object_store()
+        mode, sha = store.lookup_path("feature", "feature.py")
+        assert (mode, sha) == (b"100644", run_git(packed_repo, "rev-parse", "feature:feature.py"))
+        assert store.lookup_path("master", "feature.py") is None
+        files = {path for path, _, _ in store.walk_tree(store.resolve("master^{tree}"))}
+        assert files == {"README.md", "app.py", "loose.txt"}
+
+    def test_merge_base(self, packed_repo):
+        store = get_object_store()
+        expected = run_git(packed_repo, "merge-base", "master", "feature")
+        assert store.merge_base(store.resolve("master"), store.resolve("feature")) == expected
+
+    def test_packed_refs(self, packed_repo):
+        assert not (packed_repo / ".git" / "refs" / "heads" / "feature").exists()
+        assert get_object_store().read_ref("refs/heads/feature") == run_git(packed_repo, "rev-parse", "feature")
+
+    def test_worktree(self, packed_repo, tmp_path):
+        worktree = tmp_path / "worktree"
+        run_git(packed_repo, "worktree", "add", "-q", "--detach", str(worktree), "feature")
+        git_dir, common_dir = find_git_dirs(worktree)
+        assert common_dir == (packed_repo / ".git").resolve()
+        store = GitObjectStore(git_dir, common_dir)
+        assert store.resolve("HEAD") == run_git(packed_repo, "rev-parse", "feature")
+        assert store.resolve("master") == run_git(packed_repo, "rev-parse", "master")
+
+
+class TestApplyDelta:
+    def test_copy_and_insert(self):
+        base = b"hello world"
+        # Source and target sizes, copy 6 bytes from offset 0, insert 'there'.
+        delta = bytes([11, 11, 0x90, 6, 5]) + b"there"
+        assert apply_delta(base, delta) == b"hello there"
+
+
+def test_unsupported_repository(git_repo):
+    run_git(git_repo, "config", "extensions.partialclone", "origin")
+    assert get_object_store(git_repo) is None
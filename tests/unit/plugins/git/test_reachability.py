@@ -0,0 +1,75 @@
+import json
+from unittest.mock import patch
+
+from code_review.plugins.git.handlers import _get_merged_branches, _get_unmerged_branches
+from code_review.plugins.git.history import count_ahead_behind
+from code_review.plugins.git.reachability import REACHABILITY_FILE, ReachabilityIndex
+from tests.utils import commit_file, run_git
+
+
+def _publish(git_repo, *names: str) -> None:
+    for name in names:
+        run_git(git_repo, "update-ref", f"refs/remotes/origin/{name}", name)
+
+
+class TestReachabilityIndex:
+    def test_merged_status_is_stored(self, git_repo):
+        merged = run_git(git_repo, "rev-parse", "HEAD")
+        run_git(git_repo, "checkout", "-q", "-b", "feature")
+        unmerged = commit_file(git_repo, "feature.txt", "feature\n")
+        master = run_git(git_repo, "rev-parse", "master")
+
+        result = ReachabilityIndex().get_merged({"old": merged, "feature": unmerged}, {"master": master})
+
+        assert result == {"master": {"old": True, "feature": False}}
+        index = json.loads((git_repo / ".git" / REACHABILITY_FILE).read_text())
+        assert index["master"] == {"tip": master, "merged": [merged], "unmerged": [unmerged]}
+
+    def test_merged_tips_are_kept_after_fast_forward(self, git_repo):
+        old = run_git(git_repo, "rev-parse", "HEAD")
+        run_git(git_repo, "checkout", "-q", "-b", "feature")
+        feature = commit_file(git_repo, "feature.txt", "feature\n")
+        index = ReachabilityIndex()
+        index.get_merged({"old": old, "feature": feature}, {"master": old})
+
+        run_git(git_repo, "checkout", "-q", "master")
+        run_git(git_repo, "merge", "-q", "--ff-only", "feature")
+        with patch("code_review.plugins.git.reachability.count_ahead_behind", wraps=count_ahead_behind) as mock_count:
+            result = index.get_merged({"old": old, "feature": feature}, {"master": feature})
+
+        # The merged tip is not walked again, only the fast-forward of the base and the unmerged tip are checked.
+        assert [list(call.args[0]) for call in mock_count.call_args_list] == [["previous:master"], [feature]]
+        assert result == {"master": {"old": True, "feature": True}}
+
+    def test_rewritten_base_is_checked_again(self, git_repo):
+        first = run_git(git_repo, "rev-parse", "HEAD")
+        second = commit_file(git_repo, "second.txt", "second\n")
+        index = ReachabilityIndex()
+        assert index.get_merged({"second": second}, {"master": second}) == {"master": {"second": True}}
+
+        run_git(git_repo, "reset", "-q", "--hard", first)
+        rewritten = commit_file(git_repo, "rewritten.txt", "rewritten\n")
+
+        assert index.get_merged({"second": second}, {"master": rewritten}) == {"master": {"second": False}}
+
+
+class TestMergedBranches:
+    def test_multiple_bases(self, git_repo):
+        run_git(git_repo, "checkout", "-q", "-b", "develop")
+        run_git(git_repo, "checkout", "-q", "-b", "feature/done")
+        commit_file(git_repo, "done.txt", "done\n")
+        run_git(git_repo, "checkout", "-q", "develop")
+        run_git(git_repo, "merge", "-q", "--ff-only", "feature/done")
+        run_git(git_repo, "checkout", "-q", "-b", "feature/open")
+        commit_file(git_repo, "open.txt", "open\n")
+        run_git(git_repo, "checkout", "-q", "master")
+        _publish(git_repo, "master", "develop", "feature/done", "feature/open")
+
+        assert _get_merged_branches(["origin/develop"]) == ["feature/done", "master"]
+        assert _get_merged_branches(["origin/master", "origin/develop"]) == []
+        with patch("code_review.plugins.git.handlers.refresh_from_remote") as mock_refresh:
+            unmerged = _get_unmerged_branches(["origin/master", "origin/develop"])
+            mock_refresh.assert_called_once_with("origin")
+            assert _get_unmerged_branches(["origin/master", "origin/develop"], fetch=False) == unmerged
+            mock_refresh.assert_called_once()
+        assert sorted(branch.name for branch in unmerged) == ["develop", "feature/done", "feature/open"]
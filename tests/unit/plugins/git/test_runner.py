@@ -0,0 +1,72 @@
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from code_review.plugins.git.runner import GitRunner
+from tests.utils import commit_file
+
+
+class TestGitRunner:
+    def test_no_memoization_outside_a_session(self, git_repo):
+        runner = GitRunner()
+        runner.run(["rev-parse", "HEAD"])
+        runner.run(["rev-parse", "HEAD"])
+        assert runner.executed == 2
+        assert runner.saved == 0
+
+    def test_read_only_commands_are_memoized(self, git_repo):
+        runner = GitRunner()
+        with runner.memoize():
+            with patch("code_review.plugins.git.runner.subprocess.run", wraps=subprocess.run) as mock_run:
+                first = runner.run(["rev-parse", "HEAD"])
+                second = runner.run(["rev-parse", "HEAD"])
+                runner.run(["rev-parse", "HEAD^{tree}"])
+
+            assert first is second
+            assert mock_run.call_count == 2
+            assert runner.saved == 1
+
+    def test_ref_changes_invalidate(self, git_repo):
+        runner = GitRunner()
+        with runner.memoize():
+            head = runner.run(["rev-parse", "master"]).stdout.strip()
+            new_head = commit_file(git_repo, "new.txt", "new")
+            # The commit was not made through the runner, so the memoized result is still used.
+            assert runner.run(["rev-parse", "master"]).stdout.strip() == head
+
+            runner.run(["update-ref", "refs/heads/other", new_head])
+
+            assert runner.run(["rev-parse", "master"]).stdout.strip() == new_head
+
+    def test_diff_is_only_memoized_between_two_revisions(self, git_repo):
+        commit_file(git_repo, "file.txt", "one\n")
+        runner = GitRunner()
+        with runner.memoize():
+            runner.run(["diff", "--name-only", "HEAD~1", "HEAD"])
+            runner.run(["diff", "--name-only", "HEAD~1", "HEAD"])
+            runner.run(["diff", "--name-only", "HEAD~1...HEAD"])
+            runner.run(["diff", "--name-only", "HEAD~1...HEAD"])
+            assert runner.saved == 2
+
+            (git_repo / "file.txt").write_text("two\n")
+            # Against the working tree, so the edit is seen.
+            assert runner.run(["diff", "--name-only", "HEAD", "--", "file.txt"]).stdout.strip() == "file.txt"
+            (git_repo / "file.txt").write_text("one\n")
+            assert runner.run(["diff", "--name-only", "HEAD", "--", "file.txt"]).stdout.strip() == ""
+            assert runner.saved == 2
+
+    def test_results_are_discarded_when_the_session_ends(self, git_repo):
+        runner = GitRunner()
+        with runner.memoize():
+            runner.run(["rev-parse", "HEAD"])
+        with runner.memoize():
+            runner.run(["rev-parse", "HEAD"])
+            assert runner.saved == 0
+
+    def test_check(self, git_repo):
+        runner = GitRunner()
+        with runner.memoize():
+            assert runner.run(["rev-parse", "--verify", "--quiet", "missing"]).returncode != 0
+            with pytest.raises(subprocess.CalledProcessError):
+                runner.run(["rev-parse", "--verify", "--quiet", "missing"], check=True)
@@ -0,0 +1,32 @@
+from code_review.enums import BranchSyncStatus
+from code_review.plugins.git.sync_all import RepositorySyncResult, sync_all_repositories, sync_repository
+from tests.utils import commit_file, run_git
+
+
+class TestSyncRepository:
+    def test_syncs_and_checks_trees(self, git_repo, cloned_repo):
+        commit_file(git_repo, "master.txt", "master\n")
+
+        result = sync_repository(cloned_repo, ["master", "develop"])
+
+        assert result.statuses == {"master": BranchSyncStatus.UPDATED, "develop": BranchSyncStatus.CREATED}
+        assert result.in_sync is False
+        assert result.error is None
+
+    def test_error_is_recorded(self, tmp_path):
+        result = sync_repository(tmp_path / "missing", ["master", "develop"])
+        assert result.error is not None
+
+
+class TestSyncAllRepositories:
+    def test_syncs_every_project(self, git_repo, tmp_path):
+        base_folder = tmp_path / "projects"
+        for name in ["alpha", "beta", "excluded"]:
+            run_git(tmp_path, "clone", "-q", str(git_repo), str(base_folder / name))
+
+        results = sync_all_repositories(base_folder, ["master"], max_workers=2, exclusion_list=["excluded"])
+
+        assert results == [
+            RepositorySyncResult(project="alpha", statuses={"master": BranchSyncStatus.UP_TO_DATE}),
+            RepositorySyncResult(project="beta", statuses={"master": BranchSyncStatus.UP_TO_DATE}),
+        ]
@@ -0,0 +1,64 @@
+import ast
+
+import pytest
+
+from code_review.handlers.cache_handlers import DiskCache
+from code_review.plugins.git.handlers import LazyWorktree
+from code_review.plugins.linting.ast import cache
+from code_review.plugins.linting.ast.cache import get_branch_findings
+from code_review.plugins.linting.ast.engine import AstRule, AstRuleEngine, FileContext
+from tests.utils import commit_file, run_git
+
+
+class GlobalRule(AstRule):
+    name = "global-statement"
+
+    def visit_Global(self, node: ast.Global, context: FileContext) -> None:  # noqa: N802
+        context.report(self, node, "global statement")
+
+
+@pytest.fixture
+def ast_repo(git_repo, tmp_path, monkeypatch):
+    """Repository with a feature branch that changes one file and copies another."""
+    monkeypatch.setattr(cache, "AST_CACHE", DiskCache(tmp_path / "ast"))
+    commit_file(git_repo, "app/models.py", "def f():\n    global x\n")
+    commit_file(git_repo, "app/views.py", "views = 1\n")
+    run_git(git_repo, "checkout", "-q", "-b", "feature/x")
+    commit_file(git_repo, "app/views.py", "def g():\n    global y\n")
+    commit_file(git_repo, "app/copy.py", "def f():\n    global x\n")
+    run_git(git_repo, "checkout", "-q", "master")
+    return git_repo
+
+
+class TestGetBranchFindings:
+    def test_only_changed_files_are_analyzed(self, ast_repo, monkeypatch):
+        analyzed = []
+        analyze_files = AstRuleEngine.analyze_files
+
+        def spy(engine, root, files, max_workers=None):
+            analyzed.append(files)
+            return analyze_files(engine, root, files, max_workers)
+
+        monkeypatch.setattr(AstRuleEngine, "analyze_files", spy)
+        with LazyWorktree("master", ast_repo.name) as worktree:
+            master = get_branch_findings("master", worktree, [GlobalRule])
+        with LazyWorktree("feature/x", ast_repo.name) as worktree:
+            feature = get_branch_findings("feature/x", worktree, [GlobalRule])
+        with LazyWorktree("feature/x", ast_repo.name) as worktree:
+            cached = get_branch_findings("feature/x", worktree, [GlobalRule])
+            assert worktree.created is False
+
+        assert [result.location for result in master] == ["app/models.py:2"]
+        assert [result.location for result in feature] == ["app/copy.py:2", "app/models.py:2", "app/views.py:2"]
+        assert cached == feature
+        # The copy has the same content as a file linted on master, so only the changed views are parsed.
+        assert analyzed == [["app/models.py", "app/views.py"], ["app/views.py"]]
+
+    def test_rule_version_is_part_of_the_key(self, ast_repo, monkeypatch):
+        with LazyWorktree("master", ast_repo.name) as worktree:
+            get_branch_findings("master", worktree, [GlobalRule], files=["app/models.py"])
+        monkeypatch.setattr(GlobalRule, "version", "2")
+
+        with LazyWorktree("master", ast_repo.name) as worktree:
+            assert len(get_branch_findings("master", worktree, [GlobalRule], files=["app/models.py"])) == 1
+            assert worktree.created is True
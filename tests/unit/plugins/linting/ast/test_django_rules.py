@@ -0,0 +1,109 @@
+import textwrap
+
+from code_review.plugins.linting.ast.django_rules import DJANGO_RULES
+from code_review.plugins.linting.ast.engine import AstRuleEngine
+
+
+def _analyze(source: str) -> list[tuple[str, int]]:
+    results = AstRuleEngine(DJANGO_RULES).analyze_source("app/views.py", textwrap.dedent(source))
+    return [(result.name, result.line) for result in results]
+
+
+class TestRelatedFieldInLoopRule:
+    def test_relations_read_in_loops_over_querysets(self):
+        source = """\
+        def report():
+            for book in Book.objects.filter(published=True):
+                print(book.author.name, book.title.upper(), book.created.year, book.author_id)
+            books = Book.objects.select_related("author")
+            for book in books.order_by("title"):
+                print(book.author.name, book.publisher.name)
+            names = [book.publisher.name for book in Book.objects.prefetch_related(Prefetch("publisher"))]
+            return [review.book.title for review in Review.objects.all()]
+        """
+
+        assert _analyze(source) == [
+            ("N+1 Related Field In Loop", 3),
+            ("N+1 Related Field In Loop", 6),
+            ("N+1 Related Field In Loop", 8),
+        ]
+
+    def test_loops_over_other_iterables_are_ignored(self):
+        source = """\
+        for book in books:
+            print(book.author.name)
+        for book in Book.objects.select_related():
+            print(book.author.name)
+        """
+
+        assert _analyze(source) == []
+
+    def test_loop_and_queryset_lines_are_related(self):
+        source = """\
+        def report():
+            books = Book.objects.filter(
+                published=True,
+            )
+            for book in books:
+                print(book.author.name)
+        """
+
+        results = AstRuleEngine(DJANGO_RULES).analyze_source("app/views.py", textwrap.dedent(source))
+
+        assert [(result.line, result.related_lines) for result in results] == [(6, [2, 3, 4, 5])]
+
+
+class TestQueryInLoopRule:
+    def test_count_and_exists_in_loops(self):
+        source = """\
+        for author in Author.objects.all():
+            total = author.book_set.count()
+            if author.books.filter(published=True).exists() or Path(author.name).exists():
+                pass
+        items.count("x")
+        """
+
+        assert _analyze(source) == [("N+1 Query In Loop", 2), ("N+1 Query In Loop", 3)]
+
+    def test_count_of_other_objects_is_ignored(self):
+        source = """\
+        for row in rows:
+            seen = counter.count()
+            ids = itertools.count()
+        """
+
+        assert _analyze(source) == []
+
+
+class TestNestedSerializerPrefetchRule:
+    def test_nested_serializers_without_prefetch(self):
+        source = """\
+        class BookSerializer(serializers.ModelSerializer):
+            author = AuthorSerializer(read_only=True)
+            reviews = ReviewSerializer(many=True, source="review_set")
+            title = serializers.CharField()
+
+
+        class BookViewSet(viewsets.ModelViewSet):
+            serializer_class = BookSerializer
+
+            def get_queryset(self):
+                return Book.objects.prefetch_related("review_set__user")
+
+
+        class BookListView(generics.ListAPIView):
+            serializer_class = BookSerializer
+            queryset = Book.objects.select_related("author").prefetch_related("review_set")
+        """
+
+        results = AstRuleEngine(DJANGO_RULES).analyze_source("app/api.py", textwrap.dedent(source))
+
+        assert [(result.name, result.line, result.message) for result in results] == [
+            (
+                "N+1 Nested Serializer",
+                2,
+                "BookSerializer nests 'author', which BookViewSet does not load with its queryset.",
+            )
+        ]
+        # The serializer_class line and the lines of get_queryset.
+        assert results[0].related_lines == [8, 10, 11]
@@ -0,0 +1,75 @@
+import ast
+from unittest.mock import patch
+
+import pytest
+
+from code_review.plugins.linting.ast.engine import AstRule, AstRuleEngine, FileContext
+
+SOURCE = """\
+def view(items):
+    for item in items:
+        print(item)
+    print("done")
+"""
+
+
+class PrintInLoopRule(AstRule):
+    name = "print-in-loop"
+
+    def visit_Call(self, node: ast.Call, context: FileContext) -> None:  # noqa: N802
+        in_loop = any(isinstance(parent, ast.For) for parent in context.parents)
+        if in_loop and isinstance(node.func, ast.Name) and node.func.id == "print":
+            context.report(self, node, "print called in a loop")
+
+
+class LoopCountRule(AstRule):
+    name = "loop-count"
+    level = "INFO"
+
+    def __init__(self) -> None:
+        self.depth = 0
+
+    def visit_For(self, node: ast.For, context: FileContext) -> None:  # noqa: N802
+        self.depth += 1
+
+    def leave_For(self, node: ast.For, context: FileContext) -> None:  # noqa: N802
+        context.report(self, node, f"loop closed at depth {self.depth}")
+        self.depth -= 1
+
+
+class TestAstRuleEngine:
+    def test_rules_share_one_parse_and_walk(self):
+        engine = AstRuleEngine([PrintInLoopRule, LoopCountRule])
+
+        with patch("code_review.plugins.linting.ast.engine.ast.parse", wraps=ast.parse) as mock_parse:
+            results = engine.analyze_source("app/views.py", SOURCE)
+
+        mock_parse.assert_called_once()
+        assert [(result.name, result.location, result.level, result.message) for result in results] == [
+            ("loop-count", "app/views.py:2", "INFO", "loop closed at depth 1"),
+            ("print-in-loop", "app/views.py:3", "WARNING", "print called in a loop"),
+        ]
+
+    def test_files_that_can_not_be_parsed_have_no_results(self):
+        assert AstRuleEngine([PrintInLoopRule]).analyze_source("broken.py", "for x in (:\n") == []
+
+    def test_handlers_must_be_named_after_node_types(self):
+        class TypoRule(AstRule):
+            # Misspelled on purpose, the engine must reject a handler that names no node type.
+            def visit_Cal(self, node: ast.AST, context: FileContext) -> None:  # noqa: N802
+                pass
+
+        with pytest.raises(ValueError, match="visit_Cal"):
+            AstRuleEngine([TypoRule])
+
+    def test_files_are_analyzed_in_worker_processes(self, tmp_path):
+        files = [f"app/module_{index}.py" for index in range(10)]
+        (tmp_path / "app").mkdir()
+        for file in files:
+            (tmp_path / file).write_text(SOURCE)
+        engine = AstRuleEngine([PrintInLoopRule])
+
+        results = engine.analyze_files(tmp_path, [*files, "app/deleted.py"], max_workers=2)
+
+        assert results["app/deleted.py"] == []
+        assert [result.location for file in files for result in results[file]] == [f"{file}:3" for file in files]
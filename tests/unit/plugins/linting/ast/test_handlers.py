@@ -0,0 +1,58 @@
+import pytest
+
+from code_review.handlers.cache_handlers import DiskCache
+from code_review.plugins.git.handlers import LazyWorktree
+from code_review.plugins.linting.ast import cache
+from code_review.plugins.linting.ast.django_rules import DJANGO_RULES
+from code_review.plugins.linting.ast.handlers import find_issues_on_changed_lines
+from tests.utils import commit_file, run_git
+
+VIEWS = """\
+class BookSerializer(serializers.ModelSerializer):
+    author = AuthorSerializer()
+
+
+class BookListView(generics.ListAPIView):
+    serializer_class = BookSerializer
+    queryset = Book.objects.select_related("{related}")
+
+
+def report():
+    books = Book.objects.select_related("{related}")
+    for book in books:
+        print(book.author.name)
+"""
+
+
+@pytest.fixture
+def views_repo(git_repo, tmp_path, monkeypatch):
+    """Repository with a feature branch that only changes the relations the querysets load."""
+    monkeypatch.setattr(cache, "AST_CACHE", DiskCache(tmp_path / "ast"))
+    commit_file(git_repo, "app/views.py", VIEWS.format(related="author"))
+    run_git(git_repo, "checkout", "-q", "-b", "feature/x")
+    commit_file(git_repo, "app/views.py", VIEWS.format(related="publisher"))
+    models = "def books():\n    return [book.author.name for book in Book.objects.all()]\n"
+    commit_file(git_repo, "app/models.py", models)
+    run_git(git_repo, "checkout", "-q", "master")
+    return git_repo
+
+
+def test_problems_that_depend_on_changed_lines_are_kept(views_repo):
+    with LazyWorktree("feature/x", views_repo.name) as worktree:
+        results = find_issues_on_changed_lines("feature/x", "master", worktree, DJANGO_RULES)
+
+    assert [(result.file, result.line, result.name) for result in results] == [
+        ("app/models.py", 2, "N+1 Related Field In Loop"),
+        ("app/views.py", 2, "N+1 Nested Serializer"),
+        ("app/views.py", 13, "N+1 Related Field In Loop"),
+    ]
+
+
+def test_problems_on_unchanged_lines_are_left_out(views_repo):
+    run_git(views_repo, "checkout", "-q", "feature/x")
+    commit_file(views_repo, "app/views.py", VIEWS.format(related="publisher") + "\nVERSION = 2\n")
+
+    with LazyWorktree("feature/x", views_repo.name) as worktree:
+        results = find_issues_on_changed_lines("feature/x", "feature/x~1", worktree, DJANGO_RULES)
+
+    assert results == []
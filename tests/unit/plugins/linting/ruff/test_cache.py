@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+import pytest
+
+from code_review.handlers.cache_handlers import DiskCache
+from code_review.plugins.git.handlers import LazyWorktree
+from code_review.plugins.linting.ruff import cache
+from code_review.plugins.linting.ruff.cache import get_branch_violations, get_ruff_config_hashes, lint_branch
+from code_review.plugins.linting.ruff.handlers import get_ruff_violations
+from code_review.plugins.linting.ruff.server import ruff_server_session
+from tests.utils import commit_file, run_git
+
+
+@pytest.fixture
+def lint_repo(git_repo, tmp_path, monkeypatch):
+    """Repository with a feature branch that changes one of two Python files."""
+    monkeypatch.setattr(cache, "RUFF_CACHE", DiskCache(tmp_path / "ruff"))
+    commit_file(git_repo, "ruff.toml", '[lint]\nselect = ["F"]\n')
+    commit_file(git_repo, "app/models.py", "import os\n")
+    commit_file(git_repo, "app/views.py", "views = 1\n")
+    run_git(git_repo, "checkout", "-q", "-b", "feature/x")
+    commit_file(git_repo, "app/views.py", "import sys\n")
+    run_git(git_repo, "checkout", "-q", "master")
+    return git_repo
+
+
+class TestGetBranchViolations:
+    def test_only_files_missing_from_the_cache_are_linted(self, lint_repo):
+        with patch.object(cache, "get_ruff_violations", wraps=get_ruff_violations) as mock_lint:
+            with LazyWorktree("master", lint_repo.name) as worktree:
+                master = get_branch_violations("master", worktree, ruff_version="0.1.0")
+            with LazyWorktree("feature/x", lint_repo.name) as worktree:
+                feature = get_branch_violations("feature/x", worktree, ruff_version="0.1.0")
+            with LazyWorktree("master", lint_repo.name) as worktree:
+                cached = get_branch_violations("master", worktree, ruff_version="0.1.0")
+                assert worktree.created is False
+
+        assert [violation.file for violation in master] == ["app/models.py"]
+        assert [violation.file for violation in feature] == ["app/models.py", "app/views.py"]
+        assert cached == master
+        assert [call.kwargs["files"] for call in mock_lint.call_args_list] == [
+            ["app/models.py", "app/views.py"],
+            ["app/views.py"],
+        ]
+
+    def test_ruff_settings_are_part_of_the_key(self, lint_repo):
+        with LazyWorktree("master", lint_repo.name) as worktree:
+            get_branch_violations("master", worktree, ruff_version="0.1.0")
+        commit_file(lint_repo, "ruff.toml", '[lint]\nselect = ["E"]\n')
+
+        with LazyWorktree("master", lint_repo.name) as worktree:
+            assert get_branch_violations("master", worktree, ruff_version="0.1.0") == []
+
+    def test_nested_settings_are_part_of_the_key(self, lint_repo):
+        commit_file(lint_repo, "app/ruff.toml", '[lint]\nselect = ["F"]\n')
+        commit_file(lint_repo, "lib/utils.py", "import json\n")
+        with LazyWorktree("master", lint_repo.name) as worktree:
+            before = get_branch_violations("master", worktree, ruff_version="0.1.0")
+        commit_file(lint_repo, "app/ruff.toml", '[lint]\nselect = ["E"]\n')
+
+        with (
+            patch.object(cache, "get_ruff_violations", wraps=get_ruff_violations) as mock_lint,
+            LazyWorktree("master", lint_repo.name) as worktree,
+        ):
+            after = get_branch_violations("master", worktree, ruff_version="0.1.0")
+
+        assert [violation.file for violation in before] == ["app/models.py", "lib/utils.py"]
+        assert [violation.file for violation in after] == ["lib/utils.py"]
+        assert mock_lint.call_args.kwargs["files"] == ["app/models.py", "app/views.py"]
+
+    def test_extended_settings_are_part_of_the_key(self, lint_repo):
+        commit_file(lint_repo, "shared/ruff.toml", '[lint]\nselect = ["F"]\n')
+        commit_file(lint_repo, "app/ruff.toml", 'extend = "../shared/ruff.toml"\n')
+        with LazyWorktree("master", lint_repo.name) as worktree:
+            assert get_branch_violations("master", worktree, ruff_version="0.1.0") != []
+        commit_file(lint_repo, "shared/ruff.toml", '[lint]\nselect = ["E"]\n')
+
+        with LazyWorktree("master", lint_repo.name) as worktree:
+            assert get_branch_violations("master", worktree, ruff_version="0.1.0") == []
+
+    def test_server_session_lints_instead_of_ruff_check(self, lint_repo):
+        with LazyWorktree("feature/x", lint_repo.name) as worktree:
+            expected = get_ruff_violations(worktree.folder)
+            with ruff_server_session(), patch.object(cache, "get_ruff_violations") as mock_lint:
+                violations = get_branch_violations("feature/x", worktree, ruff_version="0.1.0")
+
+        assert violations == expected
+        mock_lint.assert_not_called()
+
+
+class TestLintBranch:
+    def test_server_lints_every_python_file(self, lint_repo):
+        with LazyWorktree("feature/x", lint_repo.name) as worktree:
+            expected = get_ruff_violations(worktree.folder)
+            with ruff_server_session(), patch.object(cache, "get_ruff_violations") as mock_lint:
+                violations = lint_branch("feature/x", worktree)
+
+        assert violations == expected
+        mock_lint.assert_not_called()
+
+
+class TestGetRuffConfigHashes:
+    def test_closest_settings_apply(self, lint_repo):
+        commit_file(lint_repo, "lib/pyproject.toml", '[project]\nname = "lib"\n')
+        commit_file(lint_repo, "tools/pyproject.toml", '[tool.ruff.lint]\nselect = ["E"]\n')
+        files = ["setup.py", "app/models.py", "lib/utils.py", "tools/run.py", "tools/sub/job.py"]
+
+        hashes = get_ruff_config_hashes("master", files)
+
+        # A pyproject.toml without ruff settings does not hide the settings above it.
+        assert hashes["setup.py"] == hashes["app/models.py"] == hashes["lib/utils.py"]
+        assert hashes["tools/run.py"] == hashes["tools/sub/job.py"] != hashes["setup.py"]
@@ -1,9 +1,56 @@
 from pathlib import Path
 
-from code_review.plugins.linting.ruff.handlers import count_ruff_issues
+from code_review.plugins.linting.ruff.handlers import (
+    compare_violations,
+    count_ruff_issues,
+    get_ruff_violations,
+    get_unformatted_files,
+)
 
 
 def test_count():
     folder = Path.home() / "adelantos" / "clave-adelantos"
     c = count_ruff_issues(folder)
     assert c > 0, "Issue count should be non-negative"
+
+
+def test_count_only_given_files(tmp_path):
+    (tmp_path / "ruff.toml").write_text('[lint]\nselect = ["F"]\n')
+    (tmp_path / "changed.py").write_text("import os\n")
+    (tmp_path / "unchanged.py").write_text("import os\nimport sys\n")
+
+    assert count_ruff_issues(tmp_path, files=["changed.py", "deleted.py"]) == 1
+    assert count_ruff_issues(tmp_path, files=["deleted.py"]) == 0
+    assert count_ruff_issues(tmp_path) == 3
+
+
+def test_violation_fingerprints_survive_moved_lines(tmp_path):
+    base = tmp_path / "base"
+    target = tmp_path / "target"
+    (base / "app").mkdir(parents=True)
+    (target / "app").mkdir(parents=True)
+    (tmp_path / "ruff.toml").write_text('[lint]\nselect = ["F"]\n')
+    (base / "app" / "views.py").write_text("import os\nimport sys\n")
+    (target / "app" / "views.py").write_text('"""Views."""\n\nimport sys\nimport json\n')
+
+    base_violations = get_ruff_violations(base)
+    target_violations = get_ruff_violations(target)
+    delta = compare_violations(base_violations, target_violations)
+
+    assert [(violation.file, violation.code, violation.line) for violation in target_violations] == [
+        ("app/views.py", "F401", 3),
+        ("app/views.py", "F401", 4),
+    ]
+    assert [violation.line for violation in delta.introduced] == [4]
+    assert [violation.line for violation in delta.fixed] == [1]
+    assert delta.unchanged == 1
+    assert delta.count_by_rule() == {"F401": (1, 1)}
+
+
+def test_unformatted_files(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "models.py").write_text("x=1\n")
+    (tmp_path / "app" / "views.py").write_text("y = 2\n")
+
+    assert get_unformatted_files(tmp_path) == ["app/models.py"]
+    assert get_unformatted_files(tmp_path, files=["app/views.py"]) == []
@@ -0,0 +1,49 @@
+from code_review.plugins.linting.ruff.handlers import get_ruff_violations
+from code_review.plugins.linting.ruff.server import (
+    RuffServer,
+    _parse_diagnostics,
+    get_ruff_server,
+    ruff_server_session,
+)
+
+
+def _write_project(folder, select: str) -> None:
+    (folder / "app").mkdir(parents=True)
+    (folder / "ruff.toml").write_text(f'[lint]\nselect = ["{select}"]\n')
+    (folder / "app" / "views.py").write_text("import os\ndef view():\n    import os\n    unused = 1\n")
+    (folder / "app" / "broken.py").write_text("x = (\n")
+
+
+def test_server_matches_ruff_check(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    _write_project(first, "F")
+    _write_project(second, "E")
+    files = ["app/views.py", "app/broken.py", "app/deleted.py"]
+
+    with RuffServer() as server:
+        first_violations = server.lint(first, files)
+        # Each project is linted with its own settings.
+        second_violations = server.lint(second, files)
+
+    assert first_violations == get_ruff_violations(first, files=files)
+    assert second_violations == get_ruff_violations(second, files=files)
+    assert [violation.code for violation in first_violations] != [violation.code for violation in second_violations]
+
+
+def test_session_sets_the_active_server():
+    with ruff_server_session() as server:
+        assert get_ruff_server() is server
+        assert server.running
+    assert get_ruff_server() is None
+    assert not server.running
+    assert server.lint(".", ["app.py"]) is None
+
+
+def test_diagnostics_without_code_are_sorted():
+    start = {"line": 0, "character": 0}
+    diagnostics = [{"range": {"start": start}, "code": "F401"}, {"range": {"start": start}}]
+
+    violations = list(_parse_diagnostics("app.py", "import os\n", diagnostics))
+
+    assert [violation.code for violation in violations] == ["syntax-error", "F401"]
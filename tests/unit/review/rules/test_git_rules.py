@@ -0,0 +1,31 @@
+from code_review.plugins.git.schemas import MergeConflictSchema
+from code_review.review.rules.git_rules import merge_conflict_rule
+from tests.unit.review.factories import CodeReviewSchemaFactory
+
+
+class TestMergeConflictRule:
+    def make_prediction(self, **kwargs):
+        return MergeConflictSchema(
+            branch="origin/feature/x", base="origin/develop", branch_hash="a", base_hash="b", **kwargs
+        )
+
+    def test_conflicts(self):
+        review = CodeReviewSchemaFactory(
+            merge_conflicts=self.make_prediction(has_conflicts=True, conflicted_files=["settings.py"])
+        )
+        result = merge_conflict_rule(review)[0]
+        assert result.passed is False
+        assert result.level == "ERROR"
+        assert "settings.py" in result.details
+
+    def test_clean(self):
+        result = merge_conflict_rule(
+            CodeReviewSchemaFactory(merge_conflicts=self.make_prediction(has_conflicts=False))
+        )[0]
+        assert result.passed is True
+        assert result.level == "INFO"
+
+    def test_not_predicted(self):
+        result = merge_conflict_rule(CodeReviewSchemaFactory(merge_conflicts=None))[0]
+        assert result.passed is True
+        assert result.level == "WARNING"
@@ -0,0 +1,41 @@
+from code_review.plugins.linting.ruff.schemas import RuffViolation
+from code_review.review.rules.linting_rules import compare_linting_error_rules, compare_linting_violations
+from tests.unit.review.factories import BranchSchemaFactory
+
+
+def _violation(file: str, code: str, fingerprint: str) -> RuffViolation:
+    return RuffViolation(file=file, code=code, line=1, fingerprint=fingerprint)
+
+
+class TestCompareLintingViolations:
+    def test_fix_does_not_hide_new_violation(self):
+        base = [_violation("a.py", "F401", "1"), _violation("b.py", "E501", "2")]
+        target = [_violation("a.py", "F401", "1"), _violation("c.py", "F841", "3")]
+
+        result = compare_linting_violations(base, target)
+
+        assert result.passed is False
+        assert result.level == "ERROR"
+        assert result.message == "Target branch introduces 1 linting errors and fixes 1."
+        assert result.details == "By rule: E501 +0/-1, F841 +1/-0; By file: b.py +0/-1, c.py +1/-0"
+
+    def test_only_fixes(self):
+        result = compare_linting_violations([_violation("a.py", "F401", "1")], [])
+        assert result.passed is True
+        assert result.level == "INFO"
+
+    def test_unchanged(self):
+        violations = [_violation("a.py", "F401", "1")]
+        result = compare_linting_violations(violations, violations)
+        assert (result.passed, result.level) == (False, "WARNING")
+
+
+class TestFormattingRule:
+    def test_unformatted_files_in_details(self):
+        base = BranchSchemaFactory(formatting_errors=0)
+        target = BranchSchemaFactory(formatting_errors=2, unformatted_files=["a.py", "b.py"])
+
+        result = compare_linting_error_rules(base, target, "formatting_errors")[0]
+
+        assert result.passed is False
+        assert result.details == "Files to format: a.py, b.py"
@@ -0,0 +1,20 @@
+from code_review.review.rules import query_rules
+from code_review.schemas import RulesResult
+from tests.unit.review.factories import CodeReviewSchemaFactory
+
+
+class TestQueryRules:
+    def test_reports_each_finding(self):
+        finding = RulesResult(
+            name="N+1 Query In Loop", level="WARNING", message="'.count()' runs a query", file="app/views.py", line=8
+        )
+        code_review = CodeReviewSchemaFactory(query_findings=[finding])
+
+        assert query_rules.check(code_review) == [finding]
+
+    def test_passes_without_findings(self):
+        code_review = CodeReviewSchemaFactory(query_findings=[])
+
+        [result] = query_rules.check(code_review)
+
+        assert result.passed is True
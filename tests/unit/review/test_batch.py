@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+
+from code_review.review.batch import BatchReviewResult, get_batch_ticket, write_batch_index
+
+
+class TestGetBatchTicket:
+    def test_ticket_from_branch(self):
+        assert get_batch_ticket("feature/ABC-123-new-form") == "ABC-123"
+
+    def test_branch_without_ticket(self):
+        assert get_batch_ticket("hotfix/fix-login") == "hotfix-fix-login"
+
+
+class TestWriteBatchIndex:
+    def test_index_files(self, tmp_path):
+        results = [
+            BatchReviewResult(
+                project="alpha",
+                branch="feature/ABC-1",
+                author="Jane",
+                ticket="ABC-1",
+                failed_rules=2,
+                markdown_file=Path("ABC-1-alpha_code_review.md"),
+            ),
+            BatchReviewResult(project="beta", branch="", error="not a git repository"),
+        ]
+
+        json_file, markdown_file = write_batch_index(results, tmp_path)
+
+        assert [BatchReviewResult.model_validate(item) for item in json.loads(json_file.read_text())] == results
+        content = markdown_file.read_text()
+        assert "| alpha | feature/ABC-1 | Jane | 2 | 0 | ABC-1-alpha_code_review.md |" in content
+        assert "Error: not a git repository" in content
@@ -0,0 +1,94 @@
+from datetime import date
+from unittest.mock import patch
+
+from code_review.enums import LintScope
+from code_review.handlers.cache_handlers import DiskCache
+from code_review.review.cache import (
+    get_configuration_hash,
+    get_provider_cache_key,
+    get_review_cache_key,
+    load_review,
+    save_review,
+)
+from code_review.review.providers import DataProvider
+from tests.unit.review.factories import CodeReviewSchemaFactory
+from tests.utils import commit_file
+
+
+class TestReviewCache:
+    def test_save_and_load(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        review = CodeReviewSchemaFactory(docker_files=[], rule_timings={"linting": 0.5})
+
+        save_review("key", review, ["linting"], "config-hash", cache=cache)
+        cached = load_review("key", cache=cache)
+
+        assert cached.configuration_hash == "config-hash"
+        assert cached.rules == ["linting"]
+        assert cached.review == review
+
+    def test_invalid_entry(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        cache.set("key", {"review": "not a review"})
+        assert load_review("key", cache=cache) is None
+        assert cache.get("key") is None
+
+    def test_configuration_hash(self):
+        assert get_configuration_hash({"a": 1}) == get_configuration_hash({"a": 1})
+        assert get_configuration_hash({"a": 1}) != get_configuration_hash({"a": 2})
+
+    def test_key_changes_when_branch_moves(self, git_repo):
+        key = get_review_cache_key(["master"], "/project")
+        assert get_review_cache_key(["master"], "/project") == key
+
+        commit_file(git_repo, "new.txt", "new")
+
+        assert get_review_cache_key(["master"], "/project") != key
+
+    def test_lint_scope_is_part_of_the_key(self, git_repo):
+        versions = {"ruff": "0.1.0", "pur": "7.0.0"}
+        key = get_review_cache_key(["master"], "/project", versions)
+
+        assert get_review_cache_key(["master"], "/project", versions, LintScope.PROJECT) == key
+        assert get_review_cache_key(["master"], "/project", versions, LintScope.CHANGED) != key
+
+    def test_project_is_part_of_the_key(self, git_repo):
+        versions = {"ruff": "0.1.0", "pur": "7.0.0"}
+        assert get_review_cache_key(["master"], "/project", versions) != get_review_cache_key(
+            ["master"], "/other", versions
+        )
+
+    def test_key_of_network_providers_changes_daily(self, git_repo):
+        versions = {"ruff": "0.1.0", "pur": "7.0.0"}
+        providers = {DataProvider.LINTING, DataProvider.REQUIREMENTS_TO_UPDATE}
+        with patch("code_review.review.cache.date") as mock_date:
+            mock_date.today.return_value = date(2024, 1, 1)
+            key = get_review_cache_key(["master"], "/project", versions, providers=providers)
+            offline_key = get_review_cache_key(["master"], "/project", versions, providers={DataProvider.LINTING})
+            mock_date.today.return_value = date(2024, 1, 2)
+
+            assert get_review_cache_key(["master"], "/project", versions, providers=providers) != key
+            assert (
+                get_review_cache_key(["master"], "/project", versions, providers={DataProvider.LINTING}) == offline_key
+            )
+
+
+class TestProviderCacheKey:
+    versions = {"ruff": "0.1.0", "pur": "7.0.0"}
+
+    def test_only_provider_inputs_are_used(self):
+        hashes = {"": "tree-1", "CHANGELOG.md": "blob-1"}
+        key = get_provider_cache_key(DataProvider.CHANGELOG, "/project", hashes, self.versions)
+
+        new_tree = {**hashes, "": "tree-2"}
+        new_blob = {"CHANGELOG.md": "blob-2"}
+        assert get_provider_cache_key(DataProvider.CHANGELOG, "/project", new_tree, self.versions) == key
+        assert get_provider_cache_key(DataProvider.CHANGELOG, "/project", new_blob, self.versions) != key
+        assert get_provider_cache_key(DataProvider.CHANGELOG, "/other", hashes, self.versions) != key
+
+    def test_tool_version_is_part_of_the_key(self):
+        hashes = {"": "tree-1"}
+        key = get_provider_cache_key(DataProvider.LINTING, "/project", hashes, self.versions)
+
+        assert get_provider_cache_key(DataProvider.LINTING, "/project", hashes, {**self.versions, "pur": "8"}) == key
+        assert get_provider_cache_key(DataProvider.LINTING, "/project", hashes, {**self.versions, "ruff": "9"}) != key
@@ -0,0 +1,53 @@
+import pytest
+
+from code_review.review.providers import PROVIDER_FIELDS, DataProvider, get_required_providers
+from code_review.review.rules.registry import RULES, select_rules
+
+
+class TestSelectRules:
+    def test_no_filters_selects_all(self):
+        assert select_rules() == RULES
+
+    def test_only_keeps_registry_order(self):
+        rules = select_rules(only=["versioning", "gitlab-ci"])
+        assert [rule.name for rule in rules] == ["gitlab-ci", "versioning"]
+
+    def test_skip(self):
+        rules = select_rules(skip=["linting"])
+        assert "linting" not in [rule.name for rule in rules]
+        assert len(rules) == len(RULES) - 1
+
+    def test_unknown_rule(self):
+        with pytest.raises(KeyError):
+            select_rules(only=["does-not-exist"])
+
+
+class TestGetRequiredProviders:
+    def test_full_review_runs_every_provider(self):
+        assert get_required_providers(None) == set(PROVIDER_FIELDS)
+
+    def test_only_selected_rules_providers(self):
+        rules = select_rules(only=["gitlab-ci", "versioning"])
+        assert get_required_providers(rules) == {DataProvider.CHANGELOG}
+
+    def test_expensive_providers_skipped(self):
+        rules = select_rules(skip=["requirements", "linting"])
+        providers = get_required_providers(rules)
+        assert DataProvider.REQUIREMENTS_TO_UPDATE not in providers
+        assert DataProvider.LINTING not in providers
+        assert DataProvider.FORMATTING not in providers
+        assert DataProvider.REQUIREMENTS in providers
+
+    def test_providers_by_branch(self):
+        rules = select_rules(only=["linting"])
+        assert get_required_providers(rules, branch="base_branch") == {DataProvider.LINTING}
+        assert get_required_providers(rules, branch="target_branch") == {
+            DataProvider.LINTING,
+            DataProvider.FORMATTING,
+        }
+        assert get_required_providers(None, branch="base_branch") == {
+            DataProvider.LINTING,
+            DataProvider.MIN_COVERAGE,
+            DataProvider.VERSION,
+            DataProvider.CHANGELOG,
+        }
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from code_review.enums import RuleResource
+from code_review.review.rules.registry import RULES, get_rule
+from code_review.review.scheduler import run_rules
+from code_review.review.schemas import RuleDefinition
+from code_review.schemas import RulesResult
+from tests.unit.review.factories import CodeReviewSchemaFactory
+
+
+def make_rule(name, delay=0.0, resources=None, fields=None):
+    def check(code_review):
+        time.sleep(delay)
+        return [RulesResult(name=name, passed=True, message=f"{name} ok")]
+
+    return RuleDefinition(name=name, check=check, fields=fields or [], resources=resources or [])
+
+
+class TestRunRules:
+    def test_results_follow_rule_order(self):
+        code_review = CodeReviewSchemaFactory()
+        rules = [make_rule("slow", delay=0.05), make_rule("fast"), make_rule("medium", delay=0.02)]
+
+        results = run_rules(code_review, rules)
+
+        assert [result.name for result in results] == ["slow", "fast", "medium"]
+        assert set(code_review.rule_timings) == {"slow", "fast", "medium"}
+        assert code_review.rule_timings["slow"] >= 0.05
+
+    def test_independent_rules_run_concurrently(self):
+        code_review = CodeReviewSchemaFactory()
+        rules = [make_rule(f"rule-{i}", delay=0.2) for i in range(4)]
+
+        start = time.perf_counter()
+        run_rules(code_review, rules)
+
+        assert time.perf_counter() - start < 0.6
+
+    def test_limited_resource_is_not_shared(self):
+        code_review = CodeReviewSchemaFactory()
+        running = []
+        max_running = []
+        lock = threading.Lock()
+
+        def check(code_review):
+            with lock:
+                running.append(1)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+            return []
+
+        rules = [RuleDefinition(name=f"git-{i}", check=check, resources=[RuleResource.GIT]) for i in range(3)]
+        run_rules(code_review, rules)
+
+        assert max(max_running) == 1
+
+    def test_failing_rule_is_reported(self):
+        code_review = CodeReviewSchemaFactory()
+
+        def check(code_review):
+            raise RuntimeError("boom")
+
+        results = run_rules(code_review, [RuleDefinition(name="broken", check=check), make_rule("ok")])
+
+        assert [result.name for result in results] == ["broken", "ok"]
+        assert results[0].passed is False
+        assert results[0].level == "CRITICAL"
+        assert "boom" in results[0].message
+
+
+class TestRuleDefinition:
+    def test_unknown_field_is_rejected(self):
+        with pytest.raises(ValidationError):
+            make_rule("bad", fields=["target_branch.not_a_field"])
+
+    def test_registry_names_are_unique(self):
+        names = [rule.name for rule in RULES]
+        assert len(names) == len(set(names))
+        assert get_rule("gitlab-ci").resources == [RuleResource.FILESYSTEM]
@@ -1,8 +1,10 @@
-def load_environment_variables(environment_filename: str, source_folder_name: str = ".envs"):
-    from pathlib import Path
+import subprocess
+from pathlib import Path
+
+from dotenv import load_dotenv
 
-    from dotenv import load_dotenv
 
+def load_environment_variables(environment_filename: str, source_folder_name: str = ".envs"):
     def find_envs_folder(current_dir: Path):
         env_folder = current_dir / source_folder_name
         if env_folder.exists():
@@ -12,3 +14,17 @@ def load_environment_variables(environment_filename: str, source_folder_name: st
     environment_folder = find_envs_folder(Path(__file__).parent)
     environment_file = environment_folder / environment_filename
     load_dotenv(dotenv_path=environment_file)
+
+
+def run_git(folder, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=folder, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def commit_file(folder, file_name: str, content: str, message: str | None = None) -> str:
+    file = folder / file_name
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(content)
+    run_git(folder, "add", file_name)
+    run_git(folder, "commit", "-q", "-m", message or f"Update {file_name}")
+    return run_git(folder, "rev-parse", "HEAD")